@@ -0,0 +1,107 @@
+"""
+Session-scoped transcription of voice recordings uploaded in segments
+The recorder uploads a self-contained audio segment every few seconds while it
+records; each is transcribed as it arrives and stored on the session, so after
+"stop" only the last segment is left to transcribe before extraction
+"""
+
+import io
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+SESSIONS_COLLECTION = 'audio_sessions'
+SESSION_TTL = timedelta(hours=1)      # expires_at drives the Firestore TTL policy
+MAX_SEGMENT_BYTES = 4 * 1024 * 1024   # under Vercel's 4.5 MB request body limit
+MAX_SEGMENTS = 32                     # a 2 minute recording uploads 8 segments of 15 s
+
+_SESSION_ID = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+
+class MissingSegments(Exception):
+    """Raised when a session is finished before all of its earlier segments were stored"""
+
+    def __init__(self, session_id, missing):
+        super().__init__(f"Session {session_id} is missing segments {missing}")
+        self.missing = missing
+
+
+def validate_segment(session_id, seq, audio, final=False):
+    """Reject malformed session ids, sequence numbers and bodies before any OpenAI call"""
+    if not session_id or not _SESSION_ID.match(session_id):
+        raise ValueError('session must be 8-64 letters, digits, - or _')
+    if not 0 <= seq < MAX_SEGMENTS:
+        raise ValueError(f'seq must be between 0 and {MAX_SEGMENTS - 1}')
+    if len(audio) > MAX_SEGMENT_BYTES:
+        raise ValueError(f'segment is larger than {MAX_SEGMENT_BYTES // (1024 * 1024)} MB')
+    if not audio and not final:
+        raise ValueError('segment is empty')
+
+
+class AudioSessions:
+    """Transcribes uploaded segments and assembles them in order when a session finishes"""
+
+    def __init__(self, db=None, client=None):
+        self._db = db
+        self._client = client
+
+    @property
+    def db(self):
+        if self._db is None:
+            from firebase_config import get_firestore_client
+            self._db = get_firestore_client()
+        return self._db
+
+    @property
+    def client(self):
+        if self._client is None:
+            # Rate-limited, and retried uploads of the same segment share one Whisper call
+            from single_flight import SingleFlightOpenAIClient
+            self._client = SingleFlightOpenAIClient()
+        return self._client
+
+    def _ref(self, session_id):
+        return self.db.collection(SESSIONS_COLLECTION).document(session_id)
+
+    def transcribe(self, seq, audio):
+        audio_file = io.BytesIO(audio)
+        audio_file.name = f'segment-{seq}.webm'  # Whisper detects the format from the name
+        return (self.client.transcribe_audio(audio_file) or '').strip()
+
+    def add_segment(self, session_id, seq, audio):
+        """Transcribe one segment and store it on the session; returns the transcription"""
+        transcription = self.transcribe(seq, audio) if audio else ''
+        now = datetime.now(timezone.utc)
+        self._ref(session_id).set({
+            'segments': {str(seq): transcription},
+            'updated_at': now,
+            'expires_at': now + SESSION_TTL,
+        }, merge=True)
+        return transcription
+
+    def finish(self, session_id, seq, audio=b''):
+        """
+        Store the tail segment seq and return the whole transcript in segment
+        order. The tail is kept, so a retried finish does not transcribe it again.
+        """
+        snapshot = self._ref(session_id).get()
+        segments = dict(((snapshot.to_dict() or {}) if snapshot.exists else {}).get('segments') or {})
+        if str(seq) not in segments:
+            segments[str(seq)] = self.add_segment(session_id, seq, audio)
+        missing = [index for index in range(seq + 1) if str(index) not in segments]
+        if missing:
+            raise MissingSegments(session_id, missing)
+        return ' '.join(segments[str(index)] for index in range(seq + 1) if segments[str(index)])
+
+
+_sessions = None
+_sessions_lock = threading.Lock()
+
+
+def get_audio_sessions():
+    """Return the process-wide session store, shared across warm invocations"""
+    global _sessions
+    with _sessions_lock:
+        if _sessions is None:
+            _sessions = AudioSessions()
+        return _sessions
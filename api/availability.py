@@ -0,0 +1,63 @@
+"""
+Availability endpoint for Vercel
+GET /api/availability?start=YYYY-MM-DD&end=YYYY-MM-DD[&sku_id=...]
+"""
+
+import os
+import sys
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(__file__))
+
+from availability_index import get_availability_index
+from dates import to_datetime
+from responses import send_json
+
+
+class handler(BaseHTTPRequestHandler):
+    def _send_json(self, status, payload):
+        send_json(self, status, payload)
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        start, end, sku_id = params.get('start'), params.get('end'), params.get('sku_id')
+
+        if not start or not end:
+            self._send_json(400, {'success': False, 'error': 'start and end are required'})
+            return
+        try:
+            if to_datetime(end, end=True) <= to_datetime(start):
+                raise ValueError('end must not be before start')
+        except ValueError as e:
+            self._send_json(400, {'success': False, 'error': f'Invalid date range: {e}'})
+            return
+
+        try:
+            index = get_availability_index()
+            if sku_id:
+                units = index.free_units(sku_id, start, end)
+                self._send_json(200, {
+                    'success': True,
+                    'sku_id': sku_id,
+                    'start': start,
+                    'end': end,
+                    'available_units': units,
+                    'count': len(units),
+                })
+            else:
+                self._send_json(200, {
+                    'success': True,
+                    'start': start,
+                    'end': end,
+                    'availability': index.free_counts(start, end),
+                })
+        except Exception as e:
+            self._send_json(500, {'success': False, 'error': str(e)})
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
@@ -0,0 +1,159 @@
+"""
+Date-range availability over the bookings collection
+Keeps a per-SKU, per-unit interval index of bookings in memory, loaded once per
+warm instance and refreshed incrementally from updated_at watermarks
+"""
+
+from bisect import bisect_left, insort
+
+from dates import to_datetime
+from warm_cache import WarmInstance, WatermarkCache
+
+# Booking statuses that hold a unit; anything else (cancelled, returned...) frees it
+ACTIVE_BOOKING_STATUSES = {'pending', 'confirmed', 'active', 'booked'}
+
+# Units in these states are never offered, whatever their bookings say
+UNAVAILABLE_UNIT_STATUSES = {'maintenance', 'retired'}
+
+
+class UnitSchedule:
+    """Bookings of one unit as sorted half-open intervals with a running max end"""
+
+    __slots__ = ('starts', 'ends', 'ids', 'max_ends')
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        self.max_ends = []
+
+    def _rebuild_max_ends(self, start_index):
+        running = self.max_ends[start_index - 1] if start_index > 0 else None
+        for i in range(start_index, len(self.ends)):
+            running = self.ends[i] if running is None else max(running, self.ends[i])
+            self.max_ends[i] = running
+
+    def add(self, booking_id, start, end):
+        position = bisect_left(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.ids.insert(position, booking_id)
+        self.max_ends.insert(position, end)
+        self._rebuild_max_ends(position)
+
+    def remove(self, booking_id):
+        position = self.ids.index(booking_id)
+        for values in (self.starts, self.ends, self.ids, self.max_ends):
+            del values[position]
+        self._rebuild_max_ends(position)
+
+    def is_free(self, start, end):
+        """True if no booking overlaps [start, end)"""
+        # Bookings starting before `end` conflict if any of them ends after `start`
+        position = bisect_left(self.starts, end)
+        return position == 0 or self.max_ends[position - 1] <= start
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class AvailabilityIndex(WatermarkCache):
+    """
+    Per-SKU interval index answering unit availability for date ranges.
+    Bookings are cancelled and units retired through their status fields, which
+    refresh picks up; hard deletes are only seen on the next full load.
+    """
+
+    COLLECTIONS = ('inventory', 'bookings')
+
+    def _reset(self):
+        super()._reset()
+        self.units = {}           # sku_id -> sorted list of bookable inventory ids
+        self.unit_sku = {}        # inventory_id -> sku_id
+        self.unit_status = {}     # inventory_id -> status
+        self.schedules = {}       # inventory_id -> UnitSchedule
+        self.booking_units = {}   # booking_id -> inventory_id
+
+    # Incremental updates
+
+    def upsert_unit(self, inventory_id, sku_id, status=None):
+        with self._lock:
+            previous_sku = self.unit_sku.get(inventory_id)
+            if previous_sku is not None and previous_sku != sku_id:
+                self.units[previous_sku].remove(inventory_id)
+            if previous_sku != sku_id:
+                insort(self.units.setdefault(sku_id, []), inventory_id)
+            self.unit_sku[inventory_id] = sku_id
+            self.unit_status[inventory_id] = status or 'available'
+
+    def remove_unit(self, inventory_id):
+        with self._lock:
+            sku_id = self.unit_sku.pop(inventory_id, None)
+            if sku_id is not None:
+                self.units[sku_id].remove(inventory_id)
+            self.unit_status.pop(inventory_id, None)
+
+    def upsert_booking(self, booking_id, booking):
+        """Add, move or drop a booking according to its current state"""
+        with self._lock:
+            self.remove_booking(booking_id)
+            inventory_id = booking.get('inventory_id')
+            status = (booking.get('status') or 'confirmed').lower()
+            if not inventory_id or status not in ACTIVE_BOOKING_STATUSES:
+                return
+
+            start = to_datetime(booking.get('start_date'))
+            end = to_datetime(booking.get('end_date'), end=True)
+            if start is None or end is None or end <= start:
+                return
+
+            self.schedules.setdefault(inventory_id, UnitSchedule()).add(booking_id, start, end)
+            self.booking_units[booking_id] = inventory_id
+            if booking.get('sku_id') and inventory_id not in self.unit_sku:
+                self.upsert_unit(inventory_id, booking['sku_id'])
+
+    def remove_booking(self, booking_id):
+        with self._lock:
+            inventory_id = self.booking_units.pop(booking_id, None)
+            if inventory_id is not None:
+                self.schedules[inventory_id].remove(booking_id)
+
+    # Queries
+
+    def free_units(self, sku_id, start, end):
+        """Inventory ids of a SKU with no booking overlapping the date range"""
+        start, end = to_datetime(start), to_datetime(end, end=True)
+        with self._lock:
+            return [
+                inventory_id for inventory_id in self.units.get(sku_id, [])
+                if self.unit_status.get(inventory_id) not in UNAVAILABLE_UNIT_STATUSES
+                and (inventory_id not in self.schedules or self.schedules[inventory_id].is_free(start, end))
+            ]
+
+    def free_counts(self, start, end, sku_ids=None):
+        """Number of free units per SKU for the date range"""
+        with self._lock:
+            sku_ids = list(self.units) if sku_ids is None else sku_ids
+            return {sku_id: len(self.free_units(sku_id, start, end)) for sku_id in sku_ids}
+
+    # Loading from Firestore
+
+    def _query(self, db, collection):
+        if collection == 'inventory':
+            return db.collection(collection).select(['sku_id', 'status', 'updated_at', 'created_at'])
+        return db.collection(collection)
+
+    def _apply(self, collection, doc_id, data):
+        if collection == 'inventory':
+            if data.get('sku_id'):
+                self.upsert_unit(doc_id, data['sku_id'], data.get('status'))
+        else:
+            self.upsert_booking(doc_id, data)
+
+
+_index = WarmInstance(AvailabilityIndex)
+
+
+def get_availability_index(db=None):
+    """Return the warm-instance index, refreshing it at most every REFRESH_INTERVAL seconds"""
+    return _index.get(db)
@@ -0,0 +1,29 @@
+"""
+Date parsing shared by the API handlers and CLI scripts
+Query parameters, CLI arguments and stored values all normalize to aware UTC
+datetimes, with date-only end bounds covering their whole day
+"""
+
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+
+def to_datetime(value, end=False):
+    """
+    Normalize a date/datetime or ISO string bound to an aware UTC datetime.
+    Date-only values are whole days, so an end date covers that entire day.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if len(value) == 10:
+            value = date.fromisoformat(value)
+        else:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, dt_time.min)
+        if end:
+            value += timedelta(days=1)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,101 @@
+"""
+Fleet depreciation curves
+Declining-balance depreciation per category with a residual floor, computed over
+whole NumPy arrays of inventory at once: recorded values are carried forward
+from the date they were recorded, and units without one are estimated from
+purchase price, age and condition
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+# category -> (annual declining-balance rate, residual value floor as a fraction of purchase)
+CATEGORY_CURVES = {
+    'cameras': (0.20, 0.15),
+    'lenses': (0.10, 0.30),
+    'lighting': (0.15, 0.15),
+    'audio': (0.18, 0.10),
+    'grip': (0.08, 0.25),
+}
+DEFAULT_CURVE = (0.15, 0.10)
+
+# Matches the condition values of the inventory form
+CONDITION_FACTORS = {'new': 1.0, 'good': 0.9, 'fair': 0.75, 'damaged': 0.4}
+DEFAULT_CONDITION_FACTOR = CONDITION_FACTORS['good']
+
+
+def _lookup(labels, table, default):
+    """Map an array of labels to values through a small table without a per-item Python loop"""
+    names, codes = np.unique(np.asarray(labels, dtype=object).astype(str), return_inverse=True)
+    values = np.array([table.get(name, default) for name in names], dtype=np.float64)
+    return values[codes.reshape(-1)]
+
+
+def to_epoch_seconds(timestamps):
+    """Datetimes (or None) to float epoch seconds, NaN where missing"""
+    return np.array(
+        [value.timestamp() if isinstance(value, datetime) else np.nan for value in timestamps],
+        dtype=np.float64
+    )
+
+
+def _curves(categories):
+    """Annual rate and floor arrays for an array of categories"""
+    names = list(CATEGORY_CURVES)
+    curves = np.array([CATEGORY_CURVES[name] for name in names] + [DEFAULT_CURVE])
+    codes = _lookup(categories, {name: i for i, name in enumerate(names)}, len(names)).astype(np.intp)
+    return curves[codes, 0], curves[codes, 1]
+
+
+def _years_since(timestamps, now):
+    return np.clip(np.nan_to_num((now - np.asarray(timestamps, dtype=np.float64)) / SECONDS_PER_YEAR, nan=0.0),
+                   0.0, None)
+
+
+def depreciate(purchase_price, created_at, categories, conditions, now=None):
+    """
+    Estimated values for units with no recorded value, from arrays of purchase
+    prices (rupees), creation times (epoch seconds), categories and conditions.
+    Values are whole rupees; units without a purchase price come back as NaN.
+    """
+    now = (now or datetime.now(timezone.utc)).timestamp()
+    purchase_price = np.asarray(purchase_price, dtype=np.float64)
+
+    rates, floors = _curves(categories)
+    remaining = np.maximum((1.0 - rates) ** _years_since(created_at, now), floors)
+    condition = _lookup(conditions, CONDITION_FACTORS, DEFAULT_CONDITION_FACTOR)
+
+    values = np.round(purchase_price * remaining * condition)
+    values[~(purchase_price > 0)] = np.nan
+    return values
+
+
+def depreciate_from(values, valued_at, categories, purchase_price, now=None):
+    """
+    Carry recorded values (rupees) forward along each category's curve from the
+    time they were recorded (epoch seconds). The recorded value already reflects
+    condition. Values stop at the category floor of the purchase price, and a
+    value entered below that floor is left as it is. Missing values stay NaN.
+    """
+    now = (now or datetime.now(timezone.utc)).timestamp()
+    values = np.asarray(values, dtype=np.float64)
+    purchase_price = np.asarray(purchase_price, dtype=np.float64)
+
+    rates, floors = _curves(categories)
+    carried = values * (1.0 - rates) ** _years_since(valued_at, now)
+    floor_values = np.where(purchase_price > 0, purchase_price * floors, 0.0)
+    return np.round(np.maximum(carried, np.minimum(values, floor_values)))
+
+
+def changed_mask(current_values, new_values, min_change):
+    """True where the new value is known and differs from the stored one by more than min_change"""
+    current_values = np.asarray(current_values, dtype=np.float64)
+    new_values = np.asarray(new_values, dtype=np.float64)
+    known = ~np.isnan(new_values)
+    missing = np.isnan(current_values)
+    with np.errstate(invalid='ignore'):
+        moved = np.abs(new_values - current_values) > min_change
+    return known & (missing | moved)
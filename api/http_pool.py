@@ -0,0 +1,86 @@
+"""
+Shared pooled HTTP clients for outbound scraping and downloads
+One httpx client per warm instance keeps TCP/TLS connections (HTTP/2 where h2
+is installed) open across calls, instead of a fresh handshake per request
+"""
+
+import asyncio
+import threading
+
+import httpx
+
+USER_AGENT = 'Mozilla/5.0 (compatible; CamorentInventory/1.0)'
+LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0)
+TIMEOUT = httpx.Timeout(10.0, connect=5.0, pool=5.0)
+
+try:
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when h2 is installed)
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+
+def new_client(**kwargs):
+    """A client with the shared limits, timeouts and headers (pooled unless used once)"""
+    options = dict(http2=HTTP2, limits=LIMITS, timeout=TIMEOUT, follow_redirects=True,
+                   headers={'User-Agent': USER_AGENT})
+    options.update(kwargs)
+    return httpx.Client(**options)
+
+
+def new_async_client(**kwargs):
+    options = dict(http2=HTTP2, limits=LIMITS, timeout=TIMEOUT, follow_redirects=True,
+                   headers={'User-Agent': USER_AGENT})
+    options.update(kwargs)
+    return httpx.AsyncClient(**options)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide pooled client, shared across warm invocations"""
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = new_client()
+        return _client
+
+
+class _AsyncPool:
+    """
+    An event loop on a daemon thread that owns one AsyncClient. Connections in an
+    AsyncClient belong to the loop that opened them, so callers from sync handlers
+    submit coroutines here rather than starting a new loop (and pool) per call.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.client = None
+        self._thread = threading.Thread(target=self.loop.run_forever, name='http-pool', daemon=True)
+        self._thread.start()
+
+    def run(self, coro_func, timeout=None):
+        async def call():
+            if self.client is None:
+                self.client = new_async_client()
+            return await coro_func(self.client)
+        return asyncio.run_coroutine_threadsafe(call(), self.loop).result(timeout)
+
+
+_async_pool = None
+_async_pool_lock = threading.Lock()
+
+
+def run_async(coro_func, timeout=None):
+    """
+    Run coro_func(client) on the shared event loop with the pooled AsyncClient
+    and return its result
+    """
+    global _async_pool
+    with _async_pool_lock:
+        if _async_pool is None:
+            _async_pool = _AsyncPool()
+        pool = _async_pool
+    return pool.run(coro_func, timeout)
@@ -0,0 +1,240 @@
+"""
+Barcode label sheets for inventory units
+Renders Code128 or QR labels onto A4 sheets and writes them as a PDF one page
+at a time, so large batches never sit in memory as a whole document
+"""
+
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+MM = 72 / 25.4
+PAGE_WIDTH, PAGE_HEIGHT = 210 * MM, 297 * MM
+
+# 3 x 8 labels of 70 x 37 mm filling an A4 sheet edge to edge (e.g. Avery 3474)
+COLUMNS, ROWS = 3, 8
+LABEL_WIDTH, LABEL_HEIGHT = PAGE_WIDTH / COLUMNS, PAGE_HEIGHT / ROWS
+LABELS_PER_PAGE = COLUMNS * ROWS
+PADDING = 3 * MM
+
+SYMBOLOGIES = ('code128', 'qr')
+
+UNIT_FIELDS = ['sku_id', 'barcode', 'serial_number', 'created_at']
+
+
+def label_code(unit):
+    """Value printed on a unit's label: barcode, else serial number, else id"""
+    return unit.get('barcode') or unit.get('serial_number') or unit['id']
+
+
+def label_symbology(code, symbology):
+    """
+    Symbology a code is actually printed in: Code128 only encodes printable
+    ASCII, so anything else (e.g. accented serials) falls back to QR
+    """
+    if symbology == 'code128' and not (code.isascii() and code.isprintable()):
+        return 'qr'
+    return symbology
+
+
+def code128_modules(text):
+    """Bar pattern as a string of 1 (bar) and 0 (space) modules"""
+    import barcode
+    return barcode.get('code128', text).build()[0]
+
+
+def qr_matrix(text):
+    import qrcode
+    qr = qrcode.QRCode(border=0, error_correction=qrcode.constants.ERROR_CORRECT_M)
+    qr.add_data(text)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def _pdf_text(text, limit):
+    """Escape for a PDF string in the standard Helvetica (WinAnsi) encoding"""
+    text = text if len(text) <= limit else text[:limit - 1] + '…'
+    text = text.encode('cp1252', 'replace').decode('cp1252')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _draw_code128(ops, text, x, y, width, height):
+    modules = code128_modules(text)
+    # Leave the 10-module quiet zone scanners need on each side
+    module_width = min(width / (len(modules) + 20), 1.0 * MM)
+    x += (width - module_width * len(modules)) / 2  # centre the symbol
+    run_start = None
+    for i, bit in enumerate(modules + '0'):
+        if bit == '1' and run_start is None:
+            run_start = i
+        elif bit == '0' and run_start is not None:
+            ops.append(f"{x + run_start * module_width:.2f} {y:.2f} {(i - run_start) * module_width:.2f} {height:.2f} re")
+            run_start = None
+
+
+def _draw_qr(ops, text, x, y, size):
+    matrix = qr_matrix(text)
+    cell = size / len(matrix)
+    for row, cells in enumerate(matrix):
+        top = y + size - (row + 1) * cell
+        run_start = None
+        for column, dark in enumerate(cells + [False]):
+            if dark and run_start is None:
+                run_start = column
+            elif not dark and run_start is not None:
+                ops.append(f"{x + run_start * cell:.2f} {top:.2f} {(column - run_start) * cell:.2f} {cell:.2f} re")
+                run_start = None
+
+
+def render_page(labels, symbology='code128'):
+    """
+    PDF content stream (zlib-compressed) for one sheet.
+    labels are (code, title) pairs, or (code, title, symbology) to override the
+    sheet's symbology; runs in worker processes, so it only takes plain data.
+    """
+    ops = []
+    text_ops = []
+    for index, (code, title, *override) in enumerate(labels):
+        label_symbol = label_symbology(code, override[0] if override else symbology)
+        column, row = index % COLUMNS, index // COLUMNS
+        left = column * LABEL_WIDTH + PADDING
+        bottom = PAGE_HEIGHT - (row + 1) * LABEL_HEIGHT + PADDING
+        width, height = LABEL_WIDTH - 2 * PADDING, LABEL_HEIGHT - 2 * PADDING
+
+        if label_symbol == 'qr':
+            size = height
+            _draw_qr(ops, code, left, bottom, size)
+            text_left = left + size + 2 * MM
+            text_ops.append(f"BT /F2 7 Tf {text_left:.2f} {bottom + height - 7:.2f} Td ({_pdf_text(title, 28)}) Tj ET")
+            text_ops.append(f"BT /F1 9 Tf {text_left:.2f} {bottom + 2:.2f} Td ({_pdf_text(code, 22)}) Tj ET")
+        else:
+            _draw_code128(ops, code, left, bottom + 10, width, height - 20)
+            text_ops.append(f"BT /F2 7 Tf {left:.2f} {bottom + height - 7:.2f} Td ({_pdf_text(title, 44)}) Tj ET")
+            text_ops.append(f"BT /F1 8 Tf {left:.2f} {bottom + 1:.2f} Td ({_pdf_text(code, 40)}) Tj ET")
+
+    content = '0 g\n' + '\n'.join(ops) + ('\nf\n' if ops else '\n') + '\n'.join(text_ops)
+    return zlib.compress(content.encode('cp1252'))
+
+
+class PDFStreamWriter:
+    """
+    Minimal PDF writer that emits each page as soon as it is added.
+    Only byte offsets and page object numbers are kept until close().
+    """
+
+    CATALOG, PAGES, FONT_REGULAR, FONT_BOLD = 1, 2, 3, 4
+
+    def __init__(self, out):
+        self.out = out
+        self.position = 0
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 5
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._object(self.FONT_REGULAR, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+        self._object(self.FONT_BOLD, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>')
+
+    def _write(self, data):
+        self.out.write(data)
+        self.position += len(data)
+
+    def _object(self, object_id, body):
+        self.offsets[object_id] = self.position
+        self._write(f'{object_id} 0 obj\n'.encode() + body + b'\nendobj\n')
+
+    def add_page(self, compressed_content):
+        content_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self._object(
+            content_id,
+            f'<< /Length {len(compressed_content)} /Filter /FlateDecode >>\nstream\n'.encode()
+            + compressed_content + b'\nendstream'
+        )
+        self._object(page_id, (
+            f'<< /Type /Page /Parent {self.PAGES} 0 R /MediaBox [0 0 {PAGE_WIDTH:.2f} {PAGE_HEIGHT:.2f}] '
+            f'/Resources << /Font << /F1 {self.FONT_REGULAR} 0 R /F2 {self.FONT_BOLD} 0 R >> >> '
+            f'/Contents {content_id} 0 R >>'
+        ).encode())
+        self.page_ids.append(page_id)
+        if hasattr(self.out, 'flush'):
+            self.out.flush()
+
+    def close(self):
+        kids = ' '.join(f'{page_id} 0 R' for page_id in self.page_ids)
+        self._object(self.PAGES, f'<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>'.encode())
+        self._object(self.CATALOG, f'<< /Type /Catalog /Pages {self.PAGES} 0 R >>'.encode())
+
+        xref_position = self.position
+        lines = [f'xref\n0 {self.next_id}\n', '0000000000 65535 f \n']
+        for object_id in range(1, self.next_id):
+            lines.append(f'{self.offsets[object_id]:010d} 00000 n \n')
+        self._write(''.join(lines).encode())
+        self._write(f'trailer\n<< /Size {self.next_id} /Root {self.CATALOG} 0 R >>\nstartxref\n{xref_position}\n%%EOF\n'.encode())
+        if hasattr(self.out, 'flush'):
+            self.out.flush()
+
+
+def _pages(labels):
+    page = []
+    for label in labels:
+        page.append(label)
+        if len(page) == LABELS_PER_PAGE:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def write_label_sheets(labels, out, symbology='code128', workers=None):
+    """
+    Stream label sheets for an iterable of (code, title[, symbology]) labels to a binary file.
+    Pages render in a process pool with at most 2 * workers pages in flight, and
+    are written in order as they finish; workers=0 renders in this process
+    (serverless runtimes without /dev/shm cannot start process pools).
+    Returns the number of pages written.
+    """
+    if symbology not in SYMBOLOGIES:
+        raise ValueError(f"Unknown symbology '{symbology}' (expected {' or '.join(SYMBOLOGIES)})")
+
+    writer = PDFStreamWriter(out)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 0:
+        for page in _pages(labels):
+            writer.add_page(render_page(page, symbology))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for page in _pages(labels):
+                pending.append(pool.submit(render_page, page, symbology))
+                if len(pending) >= 2 * workers:
+                    writer.add_page(pending.popleft().result())
+            while pending:
+                writer.add_page(pending.popleft().result())
+    writer.close()
+    return len(writer.page_ids)
+
+
+def select_units(storage, ids=None, created_from=None, created_to=None, symbology='code128'):
+    """
+    (code, title, symbology) labels for the given inventory ids, or for units
+    created in [created_from, created_to); titles are the SKU names. Each code's
+    symbology is settled here, before any output, so a code Code128 cannot
+    encode is printed as QR instead of failing part way through a sheet.
+    """
+    if ids:
+        units = storage.inventory.get_all(ids, fields=UNIT_FIELDS)
+    else:
+        units = storage.inventory.list_created_between(created_from, created_to, fields=UNIT_FIELDS)
+
+    sku_ids = list(dict.fromkeys(unit['sku_id'] for unit in units if unit.get('sku_id')))
+    names = {
+        sku['id']: sku.get('name') or f"{sku.get('brand', '')} {sku.get('model', '')}".strip()
+        for sku in storage.skus.get_all(sku_ids, fields=['name', 'brand', 'model'])
+    }
+    labels = []
+    for unit in units:
+        code = label_code(unit)
+        labels.append((code, names.get(unit.get('sku_id')) or '', label_symbology(code, symbology)))
+    return labels
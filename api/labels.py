@@ -0,0 +1,83 @@
+"""
+Label sheet endpoint for Vercel
+GET /api/labels?ids=a,b,c or ?from=YYYY-MM-DD&to=YYYY-MM-DD[&symbology=qr]
+POST /api/labels with {"ids": [...]} for long selections
+Responds with a PDF streamed page by page
+"""
+
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(__file__))
+
+from dates import to_datetime
+from label_sheets import SYMBOLOGIES, select_units, write_label_sheets
+from responses import send_json
+from storage import get_storage
+
+
+class handler(BaseHTTPRequestHandler):
+    def _send_labels(self, params):
+        ids = params.get('ids') or []
+        if isinstance(ids, str):
+            ids = [doc_id.strip() for doc_id in ids.split(',') if doc_id.strip()]
+        symbology = params.get('symbology') or 'code128'
+        if symbology not in SYMBOLOGIES:
+            send_json(self, 400, {'success': False, 'error': f"symbology must be one of {', '.join(SYMBOLOGIES)}"})
+            return
+        if not ids and not (params.get('from') or params.get('to')):
+            send_json(self, 400, {'success': False, 'error': 'ids or a from/to date range is required'})
+            return
+
+        try:
+            labels = select_units(
+                get_storage(),
+                ids=ids or None,
+                created_from=to_datetime(params.get('from')),
+                created_to=to_datetime(params.get('to'), end=True),
+                symbology=symbology,
+            )
+        except ValueError as e:
+            send_json(self, 400, {'success': False, 'error': f'Invalid request: {e}'})
+            return
+        except Exception as e:
+            send_json(self, 500, {'success': False, 'error': str(e)})
+            return
+        if not labels:
+            send_json(self, 404, {'success': False, 'error': 'No matching inventory units'})
+            return
+
+        # Codes Code128 cannot encode were switched to QR by select_units; report how many
+        fallbacks = sum(1 for label in labels if label[2] != symbology)
+        self.send_response(200)
+        self.send_header('Content-type', 'application/pdf')
+        self.send_header('Content-Disposition', 'inline; filename="labels.pdf"')
+        self.send_header('X-Label-QR-Fallbacks', str(fallbacks))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'X-Label-QR-Fallbacks')
+        self.end_headers()
+        # Rendered in-process: serverless instances have no /dev/shm for a process pool
+        write_label_sheets(labels, self.wfile, symbology=symbology, workers=0)
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self._send_labels(params)
+
+    def do_POST(self):
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(content_length) or b'{}')
+        except ValueError:
+            send_json(self, 400, {'success': False, 'error': 'Invalid JSON body'})
+            return
+        self._send_labels(params)
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
@@ -0,0 +1,59 @@
+"""
+Manufacturer registry lookups
+Static manufacturer metadata, brand aliases and spec-site patterns loaded once
+from manufacturers.json (regenerated offline by build_manufacturer_registry.py)
+"""
+
+import copy
+import json
+import os
+from functools import lru_cache
+
+REGISTRY_PATH = os.path.join(os.path.dirname(__file__), 'manufacturers.json')
+
+
+def normalize_brand(brand):
+    """Lowercase and collapse whitespace for alias matching"""
+    return ' '.join((brand or '').lower().replace('-', ' ').split())
+
+
+@lru_cache(maxsize=1)
+def load_registry(path=REGISTRY_PATH):
+    """Load the registry file and build the alias lookup (memoized per process)"""
+    with open(path, encoding='utf-8') as f:
+        registry = json.load(f)
+
+    aliases = {}
+    for key, info in registry['manufacturers'].items():
+        aliases[normalize_brand(key)] = key
+        aliases[normalize_brand(info['name'])] = key
+        for alias in info.get('aliases', []):
+            aliases[normalize_brand(alias)] = key
+    return registry, aliases
+
+
+def registry_version():
+    """Version of the loaded registry file"""
+    return load_registry()[0]['version']
+
+
+def resolve_brand(brand):
+    """Return the canonical registry key for a brand name or alias, or None"""
+    _, aliases = load_registry()
+    return aliases.get(normalize_brand(brand))
+
+
+def get_manufacturer_info(brand):
+    """Return manufacturer metadata for a brand, or None if it is not registered"""
+    key = resolve_brand(brand)
+    if key is None:
+        return None
+    info = copy.deepcopy(load_registry()[0]['manufacturers'][key])
+    info['registry_version'] = registry_version()
+    return info
+
+
+def spec_site_patterns(brand):
+    """Domains worth searching for a brand's specifications (empty if unknown)"""
+    info = get_manufacturer_info(brand)
+    return list(info['spec_sites']) if info else []
@@ -0,0 +1,287 @@
+"""
+Rate-limit governor for OpenAI calls
+Queues transcription and extraction calls behind requests-per-minute and
+tokens-per-minute budgets, adapts concurrency and backs off on HTTP 429
+"""
+
+import os
+import random
+import threading
+import time
+
+
+class GovernorTimeout(Exception):
+    """Raised when a call cannot be admitted before its deadline"""
+
+
+class RateBudget:
+    """Token buckets for one OpenAI model family (requests and tokens per minute)"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute=None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.request_tokens = float(requests_per_minute)
+        self.token_tokens = float(tokens_per_minute or 0)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.request_tokens = min(
+            self.requests_per_minute,
+            self.request_tokens + elapsed * self.requests_per_minute / 60.0
+        )
+        if self.tokens_per_minute:
+            self.token_tokens = min(
+                self.tokens_per_minute,
+                self.token_tokens + elapsed * self.tokens_per_minute / 60.0
+            )
+
+    def wait_time(self, requests, tokens, now):
+        """Seconds until the budget can admit the call (0 if it can run now)"""
+        self._refill(now)
+        waits = [0.0]
+        if self.request_tokens < requests:
+            waits.append((requests - self.request_tokens) * 60.0 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            # A single call larger than the whole bucket is admitted once it is full
+            tokens = min(tokens, self.tokens_per_minute)
+            if self.token_tokens < tokens:
+                waits.append((tokens - self.token_tokens) * 60.0 / self.tokens_per_minute)
+        return max(waits)
+
+    def consume(self, requests, tokens):
+        self.request_tokens -= requests
+        if self.tokens_per_minute:
+            self.token_tokens -= min(tokens, self.tokens_per_minute)
+
+
+def _status_code(error):
+    """Extract an HTTP status code from openai/httpx style exceptions"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+    return status
+
+
+def _retry_after(error):
+    """Read Retry-After (seconds) or retry-after-ms from a 429 response, if present"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000.0
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class OpenAIGovernor:
+    """Admission control shared by every OpenAI call in the process"""
+
+    def __init__(self, budgets, max_concurrency=8, min_concurrency=1,
+                 max_retries=4, base_backoff=1.0, max_backoff=30.0):
+        self.budgets = budgets
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency_limit = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._condition = threading.Condition()
+        self._active = 0
+        self._paused_until = 0.0
+        self._successes_since_throttle = 0
+
+        self._stats = {
+            'calls': 0,
+            'completed': 0,
+            'rate_limited': 0,
+            'retries': 0,
+            'timeouts': 0,
+            'queue_wait_total': 0.0,
+            'queue_wait_max': 0.0,
+        }
+
+    def _acquire(self, charges, deadline):
+        budgets = [(self.budgets[name], requests, tokens) for name, requests, tokens in charges]
+        started = time.monotonic()
+
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = max(0.0, self._paused_until - now)
+                if not wait and self._active >= self.concurrency_limit:
+                    wait = None
+                if wait == 0.0:
+                    # Admit only when every budget the call spans has room
+                    wait = max(budget.wait_time(requests, tokens, now) for budget, requests, tokens in budgets)
+                if wait == 0.0:
+                    for budget, requests, tokens in budgets:
+                        budget.consume(requests, tokens)
+                    self._active += 1
+                    break
+
+                remaining = deadline - now
+                if remaining <= 0 or (wait is not None and wait > remaining):
+                    self._stats['timeouts'] += 1
+                    raise GovernorTimeout(
+                        f"OpenAI {charges[0][0]} call could not be scheduled before its deadline"
+                    )
+                self._condition.wait(remaining if wait is None else wait)
+
+            queue_wait = time.monotonic() - started
+            self._stats['queue_wait_total'] += queue_wait
+            self._stats['queue_wait_max'] = max(self._stats['queue_wait_max'], queue_wait)
+            return queue_wait
+
+    def _release(self, throttled, retry_after=None):
+        with self._condition:
+            self._active -= 1
+            if throttled:
+                # Multiplicative decrease and a shared pause so every caller backs off together
+                self._successes_since_throttle = 0
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit // 2)
+                if retry_after:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            else:
+                # Additive increase once a full window of calls succeeds
+                self._successes_since_throttle += 1
+                if (self.concurrency_limit < self.max_concurrency and
+                        self._successes_since_throttle >= self.concurrency_limit):
+                    self.concurrency_limit += 1
+                    self._successes_since_throttle = 0
+            self._condition.notify_all()
+
+    def _backoff(self, attempt, retry_after):
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, budget_name, func, *args, requests=1, tokens=0, also=(), timeout=60.0, **kwargs):
+        """
+        Run func under the named budget, retrying 429s until the deadline.
+        also lists extra (budget_name, requests, tokens) charges for calls that span model families.
+        """
+        charges = [(budget_name, requests, tokens)] + list(also)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._stats['calls'] += 1
+
+        attempt = 0
+        while True:
+            self._acquire(charges, deadline)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if _status_code(e) != 429:
+                    self._release(throttled=False)
+                    raise
+
+                retry_after = _retry_after(e)
+                self._release(throttled=True, retry_after=retry_after)
+                with self._condition:
+                    self._stats['rate_limited'] += 1
+
+                delay = self._backoff(attempt, retry_after)
+                if attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                    raise
+                attempt += 1
+                with self._condition:
+                    self._stats['retries'] += 1
+                time.sleep(delay)
+                continue
+
+            self._release(throttled=False)
+            with self._condition:
+                self._stats['completed'] += 1
+            return result
+
+    def stats(self):
+        """Snapshot of admission metrics, including average queue wait time"""
+        with self._condition:
+            snapshot = dict(self._stats)
+            snapshot['active'] = self._active
+            snapshot['concurrency_limit'] = self.concurrency_limit
+        admitted = snapshot['calls'] - snapshot['timeouts']
+        snapshot['queue_wait_avg'] = snapshot['queue_wait_total'] / admitted if admitted else 0.0
+        return snapshot
+
+
+# Chat tokens charged for extraction inside process_audio_to_form_data, where the
+# transcript is not known up front: the prompt, a few minutes of speech and the completion
+AUDIO_EXTRACTION_TOKENS = 1500
+
+
+def _estimate_tokens(text, completion_tokens=500):
+    """Rough prompt + completion token estimate (~4 characters per token)"""
+    return len(text or '') // 4 + completion_tokens
+
+
+class GovernedOpenAIClient:
+    """OpenAIClient wrapper that routes every call through an OpenAIGovernor"""
+
+    def __init__(self, client=None, governor=None, timeout=None):
+        self.client = client or get_openai_client()
+        self.governor = governor or get_governor()
+        self.timeout = timeout or float(os.getenv('OPENAI_QUEUE_TIMEOUT', '60'))
+
+    def transcribe_audio(self, *args, **kwargs):
+        return self.governor.call('transcription', self.client.transcribe_audio, *args,
+                                  timeout=self.timeout, **kwargs)
+
+    def extract_equipment_data(self, transcription, *args, **kwargs):
+        return self.governor.call('chat', self.client.extract_equipment_data, transcription, *args,
+                                  tokens=_estimate_tokens(transcription), timeout=self.timeout, **kwargs)
+
+    def process_audio_to_form_data(self, *args, **kwargs):
+        # Transcribes and then extracts internally, so it is charged against both
+        # the Whisper budget and the chat RPM/TPM budgets
+        return self.governor.call('transcription', self.client.process_audio_to_form_data, *args,
+                                  also=[('chat', 1, AUDIO_EXTRACTION_TOKENS)], timeout=self.timeout, **kwargs)
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor():
+    """Return the process-wide governor, shared across warm invocations"""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = OpenAIGovernor(
+                budgets={
+                    'transcription': RateBudget(int(os.getenv('OPENAI_WHISPER_RPM', '50'))),
+                    'chat': RateBudget(
+                        int(os.getenv('OPENAI_CHAT_RPM', '500')),
+                        int(os.getenv('OPENAI_CHAT_TPM', '200000'))
+                    ),
+                },
+                max_concurrency=int(os.getenv('OPENAI_MAX_CONCURRENCY', '8')),
+            )
+        return _governor
+
+
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """
+    Return the process-wide OpenAIClient, so its HTTP connection pool to
+    api.openai.com survives across warm invocations
+    """
+    global _openai_client
+    with _openai_client_lock:
+        if _openai_client is None:
+            from openai_client import OpenAIClient
+            _openai_client = OpenAIClient()
+        return _openai_client
@@ -0,0 +1,193 @@
+"""
+Filter query planner for listing endpoints
+Maps equality filters + sort order onto the composite indexes declared in
+firestore.indexes.json, runs indexed plans server-side and rewrites the rest
+"""
+
+import json
+import os
+from functools import lru_cache
+from itertools import combinations
+
+INDEXES_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'firestore.indexes.json'))
+
+DEFAULT_ORDER = (('created_at', 'DESCENDING'),)
+
+
+class UnindexedQueryError(Exception):
+    """Raised in strict mode when no declared index can serve a query"""
+
+
+@lru_cache(maxsize=4)
+def load_indexes(path=INDEXES_PATH):
+    """Composite indexes by collection as (field, order) tuples"""
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+
+    indexes = {}
+    for index in config.get('indexes', []):
+        fields = tuple((field['fieldPath'], field.get('order', 'ASCENDING')) for field in index['fields'])
+        indexes.setdefault(index['collectionGroup'], []).append(fields)
+    return indexes
+
+
+def _reverse(order_by):
+    flip = {'ASCENDING': 'DESCENDING', 'DESCENDING': 'ASCENDING'}
+    return tuple((field, flip[direction]) for field, direction in order_by)
+
+
+def _prefix_for(index, order_by):
+    """Equality prefix of an index whose suffix matches order_by, or None"""
+    if not order_by:
+        return None
+    size = len(order_by)
+    if len(index) <= size:
+        return None
+    suffix = index[-size:]
+    if suffix != tuple(order_by) and suffix != _reverse(order_by):
+        return None
+    return frozenset(field for field, _ in index[:-size])
+
+
+def find_indexes(indexes, equality_fields, order_by):
+    """
+    Return the composite indexes that serve the query, or None.
+    Firestore can merge several indexes with the same sort suffix when each
+    one's equality prefix is a subset of the query's equality filters.
+    """
+    equality_fields = frozenset(equality_fields)
+    order_by = tuple(order_by or ())
+    order_fields = {field for field, _ in order_by}
+
+    # Single-field indexes serve pure equality queries and a lone sort
+    if not order_by:
+        return []
+    if not equality_fields and len(order_by) == 1:
+        return []
+    if equality_fields and order_fields <= equality_fields:
+        return []
+
+    if not equality_fields:
+        matches = [index for index in indexes if index in (order_by, _reverse(order_by))]
+        return matches[:1] or None
+
+    usable = []
+    for index in indexes:
+        prefix = _prefix_for(index, order_by)
+        if prefix is None or not prefix or not prefix <= equality_fields:
+            continue
+        if prefix == equality_fields:
+            return [index]
+        usable.append((prefix, index))
+
+    covered = set()
+    chosen = []
+    for prefix, index in sorted(usable, key=lambda item: -len(item[0])):
+        if not prefix <= covered:
+            chosen.append(index)
+            covered |= prefix
+    return chosen if covered == equality_fields else None
+
+
+class QueryPlan:
+    """How a listing query runs: server-side filters/order and client-side residuals"""
+
+    def __init__(self, collection, server_filters, order_by, client_filters, client_order, indexes, status):
+        self.collection = collection
+        self.server_filters = server_filters
+        self.order_by = order_by
+        self.client_filters = client_filters
+        self.client_order = client_order
+        self.indexes = indexes
+        self.status = status
+
+    def apply(self, query):
+        """Add the server-side part of the plan to a Firestore query"""
+        for field, value in sorted(self.server_filters.items()):
+            query = query.where(field, '==', value)
+        for field, direction in self.order_by:
+            query = query.order_by(field, direction=direction)
+        return query
+
+    def filter_results(self, items):
+        """Apply residual filters and ordering to fetched documents (dicts)"""
+        if self.client_filters:
+            items = [
+                item for item in items
+                if all(item.get(field) == value for field, value in self.client_filters.items())
+            ]
+        for field, direction in reversed(self.client_order):
+            items = sorted(items, key=lambda item: (item.get(field) is None, item.get(field)),
+                           reverse=direction == 'DESCENDING')
+        return items
+
+
+def plan_query(collection, filters, order_by=DEFAULT_ORDER, strict=False, indexes_path=INDEXES_PATH):
+    """
+    Plan a listing query against the declared indexes.
+    Unindexed plans raise UnindexedQueryError in strict mode; otherwise they are
+    rewritten to the largest indexed subset of filters (or to unordered equality
+    filters) with the remainder applied client-side.
+    """
+    filters = {field: value for field, value in (filters or {}).items() if value not in (None, '')}
+    order_by = tuple(tuple(item) for item in (order_by or ()))
+    indexes = load_indexes(indexes_path).get(collection, [])
+
+    used = find_indexes(indexes, filters.keys(), order_by)
+    if used is not None:
+        return QueryPlan(collection, filters, order_by, {}, (), used, 'indexed')
+
+    # Logged so generate_firestore_indexes.py can build the missing definitions
+    shape = {'collection': collection, 'filters': sorted(filters), 'order_by': [list(item) for item in order_by]}
+    print(f"QUERY_SHAPE {json.dumps(shape)}")
+
+    if strict:
+        raise UnindexedQueryError(
+            f"No index in firestore.indexes.json serves {collection} "
+            f"filtered by {sorted(filters)} ordered by {list(order_by)}"
+        )
+
+    # Keep the sort server-side with the largest subset of filters an index can serve
+    fields = sorted(filters)
+    for size in range(len(fields) - 1, 0, -1):
+        for subset in combinations(fields, size):
+            used = find_indexes(indexes, subset, order_by)
+            if used is not None:
+                server = {field: filters[field] for field in subset}
+                residual = {field: value for field, value in filters.items() if field not in server}
+                return QueryPlan(collection, server, order_by, residual, (), used, 'rewritten')
+
+    # Equality filters alone never need a composite index, so sort in memory instead
+    return QueryPlan(collection, filters, (), {}, order_by, [], 'rewritten')
+
+
+def missing_index_definitions(shapes, indexes_path=INDEXES_PATH):
+    """Composite index definitions needed to serve the given query shapes"""
+    indexes = {collection: list(declared) for collection, declared in load_indexes(indexes_path).items()}
+    definitions = []
+
+    for shape in shapes:
+        collection = shape['collection']
+        filters = sorted(shape.get('filters', []))
+        order_by = tuple(tuple(item) for item in shape.get('order_by', DEFAULT_ORDER))
+        declared = indexes.setdefault(collection, [])
+        if find_indexes(declared, filters, order_by) is not None:
+            continue
+
+        if not filters:
+            candidates = [order_by]
+        else:
+            # One index per equality field lets Firestore merge them for every combination
+            candidates = [
+                ((field, 'ASCENDING'),) + order_by for field in filters
+                if find_indexes(declared, [field], order_by) is None
+            ]
+
+        for fields in candidates:
+            declared.append(fields)
+            definitions.append({
+                'collectionGroup': collection,
+                'queryScope': 'COLLECTION',
+                'fields': [{'fieldPath': name, 'order': direction} for name, direction in fields],
+            })
+    return definitions
@@ -0,0 +1,102 @@
+"""
+JSON responses for the Vercel handlers
+Encodes payloads (including Firestore types) with orjson when available,
+compresses bodies with brotli or gzip per Accept-Encoding and parses the fields=
+projection parameter of list endpoints
+"""
+
+import base64
+import gzip
+import json
+from datetime import date, datetime
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the json module is the fallback encoder
+    orjson = None
+
+MIN_COMPRESS_BYTES = 1024  # smaller bodies are not worth the CPU or the header
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # fast enough to run per request, still well ahead of gzip
+
+
+def _json_default(value):
+    """Firestore and other non-JSON types: timestamps, GeoPoints, references, sentinels"""
+    if isinstance(value, (datetime, date)):
+        # Includes Firestore's DatetimeWithNanoseconds, which orjson does not take natively
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    if hasattr(value, 'latitude') and hasattr(value, 'longitude'):
+        return {'latitude': value.latitude, 'longitude': value.longitude}
+    if hasattr(value, 'path') and hasattr(value, 'id'):
+        return value.path  # DocumentReference
+    return str(value)
+
+
+def to_json_bytes(payload, default=None):
+    """
+    Compact JSON bytes; orjson when installed, with the same output for Firestore types.
+    A custom default also receives every datetime, for encoders that must keep their type.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if default is not None:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        return orjson.dumps(payload, default=default or _json_default, option=option)
+    return json.dumps(payload, default=default or _json_default, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def parse_accept_encoding(header):
+    """Encodings the client accepts, ignoring those with q=0"""
+    accepted = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if name and params.replace(' ', '') not in ('q=0', 'q=0.0'):
+            accepted.add(name.lower())
+    return accepted
+
+
+def encode_body(body, accept_encoding):
+    """Return (body, content_encoding or None) for the best encoding the client accepts"""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    accepted = parse_accept_encoding(accept_encoding)
+    if brotli is not None and 'br' in accepted:
+        return brotli.compress(body, quality=BROTLI_QUALITY), 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return gzip.compress(body, compresslevel=GZIP_LEVEL), 'gzip'
+    return body, None
+
+
+def send_json(handler, status, payload):
+    """Write a JSON response on a BaseHTTPRequestHandler, compressed when accepted"""
+    body, encoding = encode_body(to_json_bytes(payload), handler.headers.get('Accept-Encoding'))
+    handler.send_response(status)
+    handler.send_header('Content-type', 'application/json')
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.send_header('Vary', 'Accept-Encoding')
+    if encoding:
+        handler.send_header('Content-Encoding', encoding)
+    handler.send_header('Content-Length', str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def parse_fields(value, default):
+    """
+    fields= query parameter to a projection list.
+    Missing means the slim default; "*" or "all" means whole documents (None).
+    """
+    if value is None or value == '':
+        return list(default)
+    if value.strip() in ('*', 'all'):
+        return None
+    return [field.strip() for field in value.split(',') if field.strip()]
@@ -0,0 +1,179 @@
+"""
+Typed payload models for SKUs and inventory units
+Accepts camelCase and snake_case keys in one pass, coerces numbers and validates
+enums and prices; field specs are compiled into lookup tables once per class
+"""
+
+import re
+
+INVENTORY_CONDITIONS = ('new', 'good', 'fair', 'damaged')
+INVENTORY_STATUSES = ('available', 'booked', 'maintenance', 'retired')
+
+MAX_PRICE = 100_000_000  # rupees; anything above is a transcription error
+
+
+class ValidationError(ValueError):
+    """Payload failed validation; errors maps field names to messages"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__('; '.join(f"{field}: {message}" for field, message in errors.items()))
+
+
+def to_camel(name):
+    head, *rest = name.split('_')
+    return head + ''.join(part.title() for part in rest)
+
+
+def _text(value):
+    if not isinstance(value, str):
+        value = str(value)
+    return value.strip()
+
+
+def _price(value):
+    if isinstance(value, str):
+        # Spoken/typed amounts arrive as "2,000", "₹2000" or "2000.50"
+        value = re.sub(r'[^\d.\-]', '', value)
+        if not value:
+            raise ValueError("expected a number")
+    if isinstance(value, bool):
+        raise ValueError("expected a number")
+    value = float(value)
+    if value != value or value < 0 or value > MAX_PRICE:
+        raise ValueError(f"must be between 0 and {MAX_PRICE}")
+    return int(value) if value.is_integer() else value
+
+
+def _boolean(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+def _mapping(value):
+    if not isinstance(value, dict):
+        raise ValueError("expected an object")
+    return value
+
+
+def _choice(options):
+    def convert(value):
+        value = _text(value).lower()
+        if value not in options:
+            raise ValueError(f"must be one of {', '.join(options)}")
+        return value
+    return convert
+
+
+class Schema:
+    """
+    Base for payload models. Subclasses declare FIELDS as
+    (name, converter, required, default) tuples; __slots__ and the alias
+    table are derived from them when the subclass is created.
+    """
+
+    FIELDS = ()
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._names = tuple(name for name, *_ in cls.FIELDS)
+        cls._specs = {name: (convert, required, default) for name, convert, required, default in cls.FIELDS}
+        cls._aliases = {}
+        for name in cls._names:
+            cls._aliases[name] = name
+            cls._aliases[to_camel(name)] = name
+
+    @classmethod
+    def parse(cls, data, partial=False, optional=()):
+        """
+        Build a model from a loosely shaped dict. Unknown keys are ignored;
+        with partial=True, missing required fields and defaults are skipped
+        (for updates), and fields in optional are not required.
+        """
+        values, errors = {}, {}
+        for key, value in (data or {}).items():
+            name = cls._aliases.get(key)
+            if name is None or value is None or value == '':
+                continue
+            try:
+                values[name] = cls._specs[name][0](value)
+            except (TypeError, ValueError) as e:
+                errors[name] = str(e)
+
+        instance = cls.__new__(cls)
+        for name in cls._names:
+            if name in values:
+                value = values[name]
+            else:
+                _, required, default = cls._specs[name]
+                if required and not partial and name not in optional and name not in errors:
+                    errors[name] = "is required"
+                value = None if partial else default
+            setattr(instance, name, value)
+
+        if errors:
+            raise ValidationError(errors)
+        return instance
+
+    def to_dict(self):
+        """Fields that have a value, ready to store"""
+        data = {}
+        for name in self._names:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
+
+
+class SkuPayload(Schema):
+    FIELDS = (
+        ('name', _text, True, None),
+        ('brand', _text, True, None),
+        ('model', _text, True, None),
+        ('category', lambda value: _text(value).lower(), False, 'cameras'),
+        ('description', _text, False, None),
+        ('specifications', _mapping, False, None),
+        ('price_per_day', _price, False, 0),
+        ('security_deposit', _price, False, 0),
+        ('image_url', _text, False, None),
+        ('is_active', _boolean, False, True),
+    )
+    __slots__ = tuple(name for name, *_ in FIELDS)
+
+
+class InventoryPayload(Schema):
+    FIELDS = (
+        ('sku_id', _text, True, None),
+        ('serial_number', _text, False, None),
+        ('barcode', _text, False, None),
+        ('condition', _choice(INVENTORY_CONDITIONS), False, 'good'),
+        ('status', _choice(INVENTORY_STATUSES), False, 'available'),
+        ('location', _text, False, None),
+        ('purchase_price', _price, False, None),
+        ('current_value', _price, False, None),
+        ('notes', _text, False, None),
+        ('created_by', _text, False, None),
+    )
+    __slots__ = tuple(name for name, *_ in FIELDS)
+
+
+def parse_equipment_form(data):
+    """
+    Split a combined EquipmentForm payload into its SKU and inventory parts.
+    The inventory part may lack sku_id, which is only known once the SKU is saved.
+    """
+    errors = {}
+    sku = inventory = None
+    try:
+        sku = SkuPayload.parse(data)
+    except ValidationError as e:
+        errors.update(e.errors)
+    try:
+        inventory = InventoryPayload.parse(data, optional=('sku_id',))
+    except ValidationError as e:
+        errors.update(e.errors)
+    if errors:
+        raise ValidationError(errors)
+    return sku, inventory
@@ -0,0 +1,119 @@
+"""
+Single-flight coalescing for AI processing calls
+Identical transcription/extraction requests that arrive while one is already
+running on this warm instance (other tabs, devices, client retries) wait for
+that call and share its result instead of running Whisper/GPT again
+"""
+
+import hashlib
+import threading
+
+
+def _update(digest, value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        digest.update(value)
+    elif isinstance(value, str):
+        digest.update(value.encode())
+    elif hasattr(value, 'getvalue'):
+        digest.update(value.getvalue())  # BytesIO uploads
+    else:
+        digest.update(repr(value).encode())
+
+
+def request_key(name, *args, **kwargs):
+    """Stable key for a call: method name plus a SHA-256 of its inputs"""
+    digest = hashlib.sha256(name.encode())
+    for value in args:
+        digest.update(b'\0')
+        _update(digest, value)
+    for keyword, value in sorted(kwargs.items()):
+        digest.update(f'\0{keyword}='.encode())
+        _update(digest, value)
+    return digest.hexdigest()
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share it"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {'calls': 0, 'coalesced': 0}
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            self._stats['calls'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the key first so a later, non-overlapping request runs fresh
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
+
+
+class SingleFlightOpenAIClient:
+    """OpenAIClient wrapper that coalesces identical in-flight calls by input hash"""
+
+    def __init__(self, client=None, flight=None):
+        if client is None:
+            from openai_governor import GovernedOpenAIClient
+            client = GovernedOpenAIClient()
+        self.client = client
+        self.flight = flight or get_single_flight()
+
+    def _do(self, name, *args, **kwargs):
+        key = request_key(name, *args, **kwargs)
+        return self.flight.do(key, getattr(self.client, name), *args, **kwargs)
+
+    def transcribe_audio(self, *args, **kwargs):
+        return self._do('transcribe_audio', *args, **kwargs)
+
+    def extract_equipment_data(self, *args, **kwargs):
+        return self._do('extract_equipment_data', *args, **kwargs)
+
+    def process_audio_to_form_data(self, *args, **kwargs):
+        return self._do('process_audio_to_form_data', *args, **kwargs)
+
+
+_flight = None
+_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    """Return the process-wide single-flight group, shared across warm invocations"""
+    global _flight
+    with _flight_lock:
+        if _flight is None:
+            _flight = SingleFlight()
+        return _flight
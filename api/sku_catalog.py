@@ -0,0 +1,136 @@
+"""
+Warm-instance SKU catalog
+Holds every SKU in compact slotted records with prebuilt lookups by id, category
+and normalized brand+model, refreshed incrementally from updated_at watermarks
+"""
+
+from datetime import datetime, timezone
+
+from manufacturer_registry import resolve_brand
+from spec_cache import normalize_key
+from warm_cache import WarmInstance, WatermarkCache
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def model_key(brand, model):
+    """Lookup key for a SKU; registry aliases ("BMD", "Blackmagic Design") share a key"""
+    brand_key, model_part = normalize_key(brand, model)
+    return resolve_brand(brand) or brand_key, model_part
+
+
+class SkuRecord:
+    """One SKU; known fields as slots, anything else in extra"""
+
+    __slots__ = ('id', 'name', 'brand', 'model', 'category', 'description', 'price_per_day',
+                 'security_deposit', 'image_url', 'thumbnails', 'is_active', 'specifications',
+                 'created_at', 'updated_at', 'extra')
+
+    FIELDS = __slots__[1:-1]
+
+    def __init__(self, sku_id, data):
+        self.id = sku_id
+        for field in self.FIELDS:
+            setattr(self, field, data.get(field))
+        extra = {key: value for key, value in data.items() if key not in self.FIELDS and key != 'id'}
+        self.extra = extra or None
+
+    def to_dict(self, fields=None):
+        """Document dict (with "id"), optionally projected to the given fields"""
+        data = dict(self.extra) if self.extra else {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if fields is not None:
+            data = {field: data[field] for field in fields if field in data}
+        data['id'] = self.id
+        return data
+
+
+class SkuCatalog(WatermarkCache):
+    """
+    In-memory SKU catalog with id, category and brand+model lookups.
+    SKUs are retired with is_active, which refresh picks up; hard deletes are
+    only seen on the next full load.
+    """
+
+    COLLECTIONS = ('skus',)
+
+    def _reset(self):
+        super()._reset()
+        self.records = {}       # sku_id -> SkuRecord
+        self.by_category = {}   # category -> set of sku ids
+        self.by_model = {}      # (brand_key, model_key) -> sku_id
+        self._ordered = None    # records newest first, rebuilt after changes
+
+    # Incremental updates
+
+    def upsert(self, sku_id, data):
+        with self._lock:
+            self.remove(sku_id)
+            record = SkuRecord(sku_id, data)
+            self.records[sku_id] = record
+            if record.category:
+                self.by_category.setdefault(record.category, set()).add(sku_id)
+            if record.brand or record.model:
+                self.by_model[model_key(record.brand, record.model)] = sku_id
+            self._ordered = None
+
+    def remove(self, sku_id):
+        with self._lock:
+            record = self.records.pop(sku_id, None)
+            if record is None:
+                return
+            if record.category in self.by_category:
+                self.by_category[record.category].discard(sku_id)
+                if not self.by_category[record.category]:
+                    del self.by_category[record.category]
+            key = model_key(record.brand, record.model)
+            if self.by_model.get(key) == sku_id:
+                del self.by_model[key]
+            self._ordered = None
+
+    # Queries
+
+    def get(self, sku_id, fields=None):
+        record = self.records.get(sku_id)
+        return record.to_dict(fields) if record else None
+
+    def find(self, brand, model):
+        """SKU dict for a brand/model pair, or None"""
+        sku_id = self.by_model.get(model_key(brand, model))
+        return self.get(sku_id) if sku_id else None
+
+    def list(self, category=None, fields=None, limit=None):
+        """SKU dicts newest first, like the created_at DESC listing query"""
+        with self._lock:
+            if self._ordered is None:
+                self._ordered = sorted(self.records.values(),
+                                       key=lambda record: record.created_at or _EPOCH, reverse=True)
+            records = self._ordered
+            if category:
+                ids = self.by_category.get(category, set())
+                records = [record for record in records if record.id in ids]
+            if limit:
+                records = records[:limit]
+            return [record.to_dict(fields) for record in records]
+
+    def categories(self):
+        return sorted(self.by_category)
+
+    def __len__(self):
+        return len(self.records)
+
+    # Loading from Firestore
+
+    def _apply(self, collection, doc_id, data):
+        self.upsert(doc_id, data)
+
+
+_catalog = WarmInstance(SkuCatalog)
+
+
+def get_sku_catalog(db=None):
+    """Return the warm-instance catalog, refreshing it at most every REFRESH_INTERVAL seconds"""
+    return _catalog.get(db)
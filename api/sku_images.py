@@ -0,0 +1,93 @@
+"""
+SKU product images and pre-sized thumbnails for list views
+Thumbnails are WebP files named by the hash of the source image, so an image is
+only resized once no matter how many SKUs or re-runs point at it
+"""
+
+import hashlib
+import io
+import os
+
+THUMBNAIL_SIZES = (96, 240, 480)  # longest edge in px: list row, card, detail
+WEBP_QUALITY = 80
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def thumbnail_key(digest, size):
+    """Storage key of one thumbnail, sharded by hash prefix"""
+    return f"{digest[:2]}/{digest}-{size}.webp"
+
+
+def make_thumbnails(image_bytes, sizes=THUMBNAIL_SIZES, quality=WEBP_QUALITY):
+    """Resize one image to every size and encode as WebP (runs in a worker process)"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image_bytes)) as source:
+        source.load()
+        image = source.convert('RGBA' if 'A' in source.getbands() else 'RGB')
+
+    thumbnails = {}
+    for size in sizes:
+        thumbnail = image.copy()
+        thumbnail.thumbnail((size, size), Image.LANCZOS)
+        output = io.BytesIO()
+        thumbnail.save(output, format='WEBP', quality=quality, method=4)
+        thumbnails[size] = output.getvalue()
+    return thumbnails
+
+
+class LocalImageStore:
+    """
+    Thumbnail store on the local filesystem, served as static files.
+    Stands in for a bucket: anything with exists/put/url can replace it.
+    """
+
+    def __init__(self, root, base_url):
+        self.root = root
+        self.base_url = base_url.rstrip('/')
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return self.url(key)
+
+    def url(self, key):
+        return f"{self.base_url}/{key}"
+
+
+def get_image_store():
+    """Image store configured by THUMBNAIL_DIR / THUMBNAIL_BASE_URL"""
+    root = os.getenv('THUMBNAIL_DIR') or os.path.join(os.path.dirname(__file__), '..', 'public', 'thumbnails')
+    return LocalImageStore(os.path.normpath(root), os.getenv('THUMBNAIL_BASE_URL', '/thumbnails'))
+
+
+def thumbnail_urls(store, digest, sizes=THUMBNAIL_SIZES):
+    """{size: url} for a hash, or None if any size is missing from the store"""
+    keys = {str(size): thumbnail_key(digest, size) for size in sizes}
+    if not all(store.exists(key) for key in keys.values()):
+        return None
+    return {size: store.url(key) for size, key in keys.items()}
+
+
+def needs_thumbnails(sku, sizes=THUMBNAIL_SIZES):
+    """True if the SKU has an image whose thumbnails are missing or stale"""
+    if not sku.get('image_url'):
+        return False
+    thumbnails = sku.get('thumbnails') or {}
+    return (
+        sku.get('thumbnail_source') != sku['image_url']
+        or not all(str(size) in thumbnails for size in sizes)
+    )
@@ -0,0 +1,193 @@
+"""
+Snapshot and restore of Firestore collections as gzip NDJSON shards
+Each collection is paged by document id into shards of bounded size, described
+by a manifest; restores stream shards back with batched writes. Firestore types
+(timestamps, GeoPoints, references, bytes) are tagged so they round-trip.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import date, datetime, timezone
+
+from responses import to_json_bytes
+
+DEFAULT_COLLECTIONS = ['inventory', 'skus', 'categories', 'brands', 'bookings', 'orders', 'transactions']
+PAGE_SIZE = 500        # documents per read page and per write batch (Firestore's batch limit)
+SHARD_SIZE = 10_000    # documents per shard file
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def _tag(value):
+    """orjson/json default: tag Firestore types so restore can rebuild them"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return {'__timestamp__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__timestamp__': datetime.combine(value, datetime.min.time(), timezone.utc).isoformat()}
+    if isinstance(value, bytes):
+        return {'__bytes__': base64.b64encode(value).decode()}
+    if hasattr(value, 'latitude') and hasattr(value, 'longitude'):
+        return {'__geopoint__': [value.latitude, value.longitude]}
+    if hasattr(value, 'path') and hasattr(value, 'id'):
+        return {'__ref__': value.path}
+    raise TypeError(f"Cannot snapshot value of type {type(value).__name__}")
+
+
+def encode_document(doc_id, data):
+    return to_json_bytes({'id': doc_id, 'data': data}, default=_tag) + b'\n'
+
+
+def document_decoder(db):
+    """json object_hook that rebuilds tagged Firestore values"""
+    def hook(obj):
+        if len(obj) == 1:
+            if '__timestamp__' in obj:
+                return datetime.fromisoformat(obj['__timestamp__'])
+            if '__bytes__' in obj:
+                return base64.b64decode(obj['__bytes__'])
+            if '__geopoint__' in obj:
+                from google.cloud.firestore import GeoPoint
+                return GeoPoint(*obj['__geopoint__'])
+            if '__ref__' in obj:
+                return db.document(obj['__ref__'])
+        return obj
+    return hook
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_collection(db, name, page_size=PAGE_SIZE):
+    """Stream every document of a collection, one page in memory at a time"""
+    query = db.collection(name).order_by('__name__').limit(page_size)
+    last = None
+    while True:
+        page = list((query.start_after(last) if last is not None else query).stream())
+        yield from page
+        if len(page) < page_size:
+            return
+        last = page[-1]
+
+
+def snapshot_collection(db, name, directory, shard_size=SHARD_SIZE, page_size=PAGE_SIZE):
+    """Write one collection to gzip NDJSON shards and return its manifest entry"""
+    started = time.perf_counter()
+    shards = []
+    out = None
+    count = 0
+
+    def close_shard():
+        out.close()
+        shard = shards[-1]
+        shard['bytes'] = os.path.getsize(os.path.join(directory, shard['file']))
+        shard['sha256'] = _file_digest(os.path.join(directory, shard['file']))
+
+    for doc in iter_collection(db, name, page_size):
+        if out is None or shards[-1]['documents'] >= shard_size:
+            if out is not None:
+                close_shard()
+            shards.append({'file': f"{name}-{len(shards):05d}.ndjson.gz", 'documents': 0})
+            out = gzip.open(os.path.join(directory, shards[-1]['file']), 'wb', compresslevel=6)
+        out.write(encode_document(doc.id, doc.to_dict() or {}))
+        shards[-1]['documents'] += 1
+        count += 1
+    if out is not None:
+        close_shard()
+
+    return {
+        'documents': count,
+        'bytes': sum(shard['bytes'] for shard in shards),
+        'seconds': round(time.perf_counter() - started, 3),
+        'shards': shards,
+    }
+
+
+def write_manifest(directory, collections):
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'collections': collections,
+    }
+    temp_path = os.path.join(directory, MANIFEST_NAME + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, os.path.join(directory, MANIFEST_NAME))
+    return manifest
+
+
+def load_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported snapshot manifest version {manifest.get('version')}")
+    return manifest
+
+
+def verify_shard(directory, shard):
+    """
+    Check a shard against its manifest entry without writing anything: the sha256
+    must match and the file must decode to the recorded number of documents.
+    Raises ValueError; returns the document count.
+    """
+    path = os.path.join(directory, shard['file'])
+    if not os.path.exists(path):
+        raise ValueError(f"{shard['file']} is missing")
+    if shard.get('sha256') and _file_digest(path) != shard['sha256']:
+        raise ValueError(f"{shard['file']} does not match its manifest checksum")
+
+    count = 0
+    try:
+        with gzip.open(path, 'rb') as f:
+            for line in f:
+                record = json.loads(line)
+                if 'id' not in record or 'data' not in record:
+                    raise ValueError("record without id/data")
+                count += 1
+    except (OSError, EOFError, ValueError) as e:
+        raise ValueError(f"{shard['file']} cannot be read: {e}")
+    if count != shard['documents']:
+        raise ValueError(f"{shard['file']} has {count} documents, manifest says {shard['documents']}")
+    return count
+
+
+def restore_shard(db, name, directory, shard, batch_size=PAGE_SIZE):
+    """
+    Write one shard back with batched sets; returns the number of documents written.
+    Run verify_shard over every shard first: a shard that fails part way here has
+    already committed its earlier batches.
+    """
+    path = os.path.join(directory, shard['file'])
+    if shard.get('sha256') and _file_digest(path) != shard['sha256']:
+        raise ValueError(f"{shard['file']} does not match its manifest checksum")
+
+    hook = document_decoder(db)
+    collection = db.collection(name)
+    written = 0
+    batch, pending = db.batch(), 0
+    with gzip.open(path, 'rb') as f:
+        for line in f:
+            record = json.loads(line, object_hook=hook)
+            batch.set(collection.document(record['id']), record['data'])
+            pending += 1
+            if pending == batch_size:
+                batch.commit()
+                written += pending
+                batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+        written += pending
+
+    if written != shard['documents']:
+        raise ValueError(f"{shard['file']} has {written} documents, manifest says {shard['documents']}")
+    return written
@@ -0,0 +1,209 @@
+"""
+Two-tier equipment specification cache
+In-process LRU in front of a Firestore spec_cache collection, keyed by
+normalized (brand, model) so repeat models skip web scraping entirely
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+SPEC_CACHE_COLLECTION = 'spec_cache'
+
+# How long specs from each source stay fresh
+SOURCE_TTLS = {
+    'skus': timedelta(days=365),     # Seeded from reviewed SKU documents
+    'manual': timedelta(days=365),
+    'web': timedelta(days=30),       # Scraped manufacturer/retailer pages
+}
+DEFAULT_TTL = timedelta(days=30)
+
+# Lower number wins when two sources disagree on a spec field
+SOURCE_PRIORITY = {'manual': 0, 'skus': 1, 'web': 2}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9.+/]+')
+
+
+def _normalize(value):
+    value = (value or '').lower().replace('-', ' ')
+    return _NON_ALNUM.sub(' ', value).strip()
+
+
+def normalize_key(brand, model):
+    """Normalize brand and model into a cache key tuple"""
+    brand_key = _normalize(brand)
+    model_key = _normalize(model)
+    # "Canon" + "Canon EOS R5" and "Canon" + "EOS R5" are the same model
+    if brand_key and model_key.startswith(brand_key + ' '):
+        model_key = model_key[len(brand_key) + 1:]
+    return brand_key, model_key
+
+
+def cache_document_id(brand, model):
+    """Firestore document id for a (brand, model) pair"""
+    brand_key, model_key = normalize_key(brand, model)
+    return f"{brand_key}__{model_key}".replace('/', '_').replace(' ', '-')
+
+
+def _is_fresh(source, fetched_at, now):
+    if fetched_at is None:
+        return False
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+    return fetched_at + SOURCE_TTLS.get(source, DEFAULT_TTL) > now
+
+
+def merge_sources(sources, now=None):
+    """Merge specifications from every fresh source, higher priority sources winning"""
+    now = now or datetime.now(timezone.utc)
+    fresh = [
+        (name, entry) for name, entry in (sources or {}).items()
+        if _is_fresh(name, entry.get('fetched_at'), now)
+    ]
+    if not fresh:
+        return None
+
+    merged = {}
+    for name, entry in sorted(fresh, key=lambda item: SOURCE_PRIORITY.get(item[0], 99), reverse=True):
+        merged.update(entry.get('specifications') or {})
+    return merged
+
+
+class SpecCache:
+    """LRU + Firestore cache of specifications by normalized brand and model"""
+
+    def __init__(self, db=None, max_entries=512, use_firestore=True):
+        self.max_entries = max_entries
+        self.use_firestore = use_firestore
+        self._db = db
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def db(self):
+        if self._db is None:
+            from firebase_config import get_firestore_client
+            self._db = get_firestore_client()
+        return self._db
+
+    def _remember(self, key, sources):
+        with self._lock:
+            self._entries[key] = sources
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _local_sources(self, key):
+        with self._lock:
+            sources = self._entries.get(key)
+            if sources is not None:
+                self._entries.move_to_end(key)
+            return sources
+
+    def _firestore_sources(self, key, brand, model):
+        try:
+            doc = self.db.collection(SPEC_CACHE_COLLECTION).document(cache_document_id(brand, model)).get()
+        except Exception as e:
+            print(f"Spec cache lookup failed for {brand} {model}: {str(e)}")
+            return None
+        if not doc.exists:
+            return None
+        sources = (doc.to_dict() or {}).get('sources') or {}
+        self._remember(key, sources)
+        return sources
+
+    def _load_sources(self, brand, model):
+        key = normalize_key(brand, model)
+        sources = self._local_sources(key)
+        # A missing or stale local entry may have been refreshed in Firestore by
+        # another instance or the spec worker; check there before scraping again
+        if self.use_firestore and (not sources or merge_sources(sources) is None):
+            sources = self._firestore_sources(key, brand, model) or sources
+        return key, sources
+
+    def get(self, brand, model):
+        """Return cached specifications for a model, or None if missing or stale"""
+        if not normalize_key(brand, model)[1]:
+            return None
+
+        _, sources = self._load_sources(brand, model)
+        specs = merge_sources(sources) if sources else None
+        if specs is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return specs
+
+    def put(self, brand, model, specifications, source='web'):
+        """Store specifications from one source for a model"""
+        if not specifications or not normalize_key(brand, model)[1]:
+            return
+
+        now = datetime.now(timezone.utc)
+        key, sources = self._load_sources(brand, model)
+        sources = dict(sources or {})
+        sources[source] = {'specifications': specifications, 'fetched_at': now}
+        self._remember(key, sources)
+
+        if not self.use_firestore:
+            return
+
+        # expires_at drives the Firestore TTL policy once every source has gone stale
+        expires_at = max(
+            entry['fetched_at'] + SOURCE_TTLS.get(name, DEFAULT_TTL)
+            for name, entry in sources.items()
+            if entry.get('fetched_at') is not None
+        )
+        try:
+            self.db.collection(SPEC_CACHE_COLLECTION).document(cache_document_id(brand, model)).set({
+                'brand': brand,
+                'model': model,
+                'normalized_key': list(key),
+                'sources': sources,
+                'updated_at': now,
+                'expires_at': expires_at,
+            }, merge=True)
+        except Exception as e:
+            print(f"Spec cache write failed for {brand} {model}: {str(e)}")
+
+    def search_equipment_specs(self, scraper, brand, model):
+        """
+        Return specs from the cache, falling back to web research on a miss.
+        scraper is anything with search_equipment_specs(query); None uses the
+        process-wide SpecResearcher.
+        """
+        specs = self.get(brand, model)
+        if specs is not None:
+            return specs
+
+        if scraper is None:
+            from spec_research import get_spec_researcher
+            scraper = get_spec_researcher()
+
+        specs = scraper.search_equipment_specs(f"{brand} {model} specifications")
+        if specs:
+            self.put(brand, model, specs, source='web')
+        return specs
+
+    def seed_from_skus(self, skus):
+        """Seed the cache from SKU dicts that already carry specifications"""
+        seeded = 0
+        for sku in skus:
+            if sku.get('brand') and sku.get('model') and sku.get('specifications'):
+                self.put(sku['brand'], sku['model'], sku['specifications'], source='skus')
+                seeded += 1
+        return seeded
+
+
+_spec_cache = None
+
+
+def get_spec_cache():
+    """Return the process-wide spec cache, shared across warm invocations"""
+    global _spec_cache
+    if _spec_cache is None:
+        _spec_cache = SpecCache()
+    return _spec_cache
@@ -0,0 +1,179 @@
+"""
+Streaming specification extraction from manufacturer and retailer pages
+Feeds response bytes into lxml's incremental HTML parser, keeps only spec
+tables, definition lists and JSON-LD Product data, and discards the rest of
+the tree as it is parsed; reading stops at a byte cap
+"""
+
+import json
+import re
+
+from lxml import etree
+
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+MAX_SPECS = 200
+MAX_KEY_LENGTH = 80
+MAX_VALUE_LENGTH = 300
+
+_SPACE = re.compile(r'\s+')
+
+# Top-level JSON-LD Product fields worth keeping as specs
+PRODUCT_FIELDS = {
+    'brand': 'Brand', 'model': 'Model', 'mpn': 'MPN', 'sku': 'SKU', 'gtin13': 'GTIN',
+    'gtin12': 'UPC', 'color': 'Color', 'weight': 'Weight', 'height': 'Height',
+    'width': 'Width', 'depth': 'Depth', 'material': 'Material',
+}
+
+
+def _text(element):
+    return _SPACE.sub(' ', ''.join(element.itertext())).strip()
+
+
+def _value_text(value):
+    """JSON-LD values may be strings, numbers or {"value"/"name", "unitText"} objects"""
+    if isinstance(value, dict):
+        text = value.get('value', value.get('name'))
+        unit = value.get('unitText') or value.get('unitCode')
+        if text is not None and unit:
+            return f"{text} {unit}"
+        return _value_text(text)
+    if isinstance(value, list):
+        return ', '.join(filter(None, (_value_text(item) for item in value)))
+    return None if value is None else str(value).strip()
+
+
+def _is_json_ld(element):
+    return element.tag == 'script' and (element.get('type') or '').strip().lower() == 'application/ld+json'
+
+
+def _product_nodes(data):
+    """Yield every Product node from a JSON-LD document, including inside @graph"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _product_nodes(item)
+    elif isinstance(data, dict):
+        types = data.get('@type')
+        types = types if isinstance(types, list) else [types]
+        if 'Product' in types or 'ProductModel' in types:
+            yield data
+        if '@graph' in data:
+            yield from _product_nodes(data['@graph'])
+
+
+class SpecExtractor:
+    """
+    Incremental extractor: feed() response chunks, then close() for the specs.
+    Tables, definition lists and JSON-LD scripts are read as they end; everything
+    outside an open table or dl is cleared as it ends, so memory stays flat on
+    large pages.
+    """
+
+    CAPTURE_TAGS = ('table', 'dl')
+    # Block-level containers whose end triggers discarding; inline elements go with them
+    DISCARD_TAGS = ('script', 'style', 'div', 'section', 'article', 'aside', 'header', 'footer',
+                    'nav', 'ul', 'ol', 'li', 'p', 'form', 'figure', 'a', 'img', 'svg')
+
+    def __init__(self, max_bytes=MAX_PAGE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.specs = {}
+        self.root = None  # the document root, mostly emptied, once closed
+        self._parser = etree.HTMLPullParser(events=('end',), tag=self.CAPTURE_TAGS + self.DISCARD_TAGS)
+
+    @property
+    def full(self):
+        """True once the byte cap is reached; callers stop reading the response"""
+        return self.bytes_read >= self.max_bytes
+
+    def feed(self, data):
+        if self.full:
+            return
+        data = data[:self.max_bytes - self.bytes_read]
+        self.bytes_read += len(data)
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self):
+        """Finish parsing whatever was fed and return the extracted specs"""
+        try:
+            self.root = self._parser.close()
+        except etree.XMLSyntaxError:
+            pass  # truncated at the byte cap, or not HTML at all
+        self._drain()
+        return self.specs
+
+    def _drain(self):
+        for _, element in self._parser.read_events():
+            tag = element.tag
+            if tag == 'table':
+                self._add_table(element)
+            elif tag == 'dl':
+                self._add_definition_list(element)
+            elif tag == 'script' and _is_json_ld(element):
+                self._add_json_ld(element.text)
+            # Rows of a table or dl that is still open are kept until it ends
+            if next(element.iterancestors(*self.CAPTURE_TAGS), None) is None:
+                self._discard(element)
+
+    @staticmethod
+    def _discard(element):
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+    def _add(self, key, value):
+        key = (key or '').strip().rstrip(':').strip()
+        value = (value or '').strip()
+        if (not key or not value or key in self.specs or len(self.specs) >= MAX_SPECS
+                or len(key) > MAX_KEY_LENGTH or len(value) > MAX_VALUE_LENGTH):
+            return
+        self.specs[key] = value
+
+    def _add_table(self, table):
+        # Key/value rows only; pricing grids and comparison tables have more cells
+        for row in table.iter('tr'):
+            cells = [cell for cell in row if cell.tag in ('th', 'td')]
+            if len(cells) == 2:
+                self._add(_text(cells[0]), _text(cells[1]))
+
+    def _add_definition_list(self, dl):
+        key = None
+        for child in dl.iter('dt', 'dd'):
+            if child.tag == 'dt':
+                key = _text(child)
+            elif key:
+                self._add(key, _text(child))
+
+    def _add_json_ld(self, text):
+        try:
+            data = json.loads(text or '')
+        except ValueError:
+            return
+        for product in _product_nodes(data):
+            for field, label in PRODUCT_FIELDS.items():
+                self._add(label, _value_text(product.get(field)))
+            for prop in product.get('additionalProperty') or []:
+                if isinstance(prop, dict):
+                    self._add(_value_text(prop.get('name')), _value_text(prop))
+
+
+def extract_specs(chunks, max_bytes=MAX_PAGE_BYTES):
+    """Extract specs from an iterable of byte chunks, stopping at max_bytes"""
+    extractor = SpecExtractor(max_bytes)
+    for chunk in chunks:
+        extractor.feed(chunk)
+        if extractor.full:
+            break
+    return extractor.close()
+
+
+def fetch_specs(url, client=None, max_bytes=MAX_PAGE_BYTES):
+    """Stream a page through the extractor with the pooled HTTP client"""
+    if client is None:
+        from http_pool import get_http_client
+        client = get_http_client()
+    with client.stream('GET', url) as response:
+        response.raise_for_status()
+        return extract_specs(response.iter_bytes(), max_bytes)
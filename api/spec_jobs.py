@@ -0,0 +1,281 @@
+"""
+Background spec-research jobs
+Firestore-backed jobs collection so /api/process-audio can return the extracted
+form immediately while a worker researches specifications with leases and retries
+"""
+
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+JOBS_COLLECTION = 'jobs'
+JOB_TYPE = 'spec_research'
+
+LEASE_DURATION = timedelta(minutes=2)
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = timedelta(seconds=30)
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def enqueue_spec_job(db, brand, model, sku_id=None):
+    """Queue spec research for a brand/model and return the job id"""
+    now = _now()
+    job_ref = db.collection(JOBS_COLLECTION).document()
+    job_ref.set({
+        'type': JOB_TYPE,
+        'brand': brand,
+        'model': model,
+        'sku_id': sku_id,
+        'status': 'queued',
+        'attempts': 0,
+        'max_attempts': MAX_ATTEMPTS,
+        'available_at': now,
+        'lease_owner': None,
+        'lease_token': None,
+        'lease_expires_at': None,
+        'result': None,
+        'error': None,
+        'created_at': now,
+        'updated_at': now,
+    })
+    return job_ref.id
+
+
+def get_spec_job(db, job_id):
+    """Return the job status and result for client polling, or None"""
+    doc = db.collection(JOBS_COLLECTION).document(job_id).get()
+    if not doc.exists:
+        return None
+    job = doc.to_dict()
+    return {
+        'id': doc.id,
+        'status': job.get('status'),
+        'specifications': job.get('result'),
+        'error': job.get('error'),
+    }
+
+
+def _transactional(db, func, *args):
+    """Run func(transaction, *args) in a Firestore transaction, retried on contention"""
+    from firebase_admin import firestore
+    return firestore.transactional(func)(db.transaction(), *args)
+
+
+def _merge_into_sku(db, sku_id, specifications):
+    """Merge researched specs into a SKU without overwriting reviewer-entered values"""
+    sku_ref = db.collection('skus').document(sku_id)
+
+    def merge(transaction):
+        # Read and write in one transaction, so a reviewer's concurrent edit is
+        # either seen here or retried against, never overwritten
+        snapshot = sku_ref.get(transaction=transaction)
+        if not snapshot.exists:
+            return None
+        existing = (snapshot.to_dict() or {}).get('specifications') or {}
+        merged = {**specifications, **existing}
+        transaction.update(sku_ref, {'specifications': merged, 'updated_at': _now()})
+        return merged
+
+    return _transactional(db, merge)
+
+
+def attach_sku(db, job_id, sku_id):
+    """
+    Link a saved SKU to its research job.
+    If the job already finished, its specs are merged now and returned so the save
+    response can carry them; otherwise the worker writes them back on completion.
+    """
+    job_ref = db.collection(JOBS_COLLECTION).document(job_id)
+
+    def link(transaction):
+        # Read and link atomically with complete_job, so exactly one side sees the
+        # other's write and merges the specs
+        snapshot = job_ref.get(transaction=transaction)
+        if not snapshot.exists:
+            return None
+        transaction.update(job_ref, {'sku_id': sku_id, 'updated_at': _now()})
+        return snapshot.to_dict()
+
+    job = _transactional(db, link)
+    if job and job.get('status') == 'done' and job.get('result'):
+        return _merge_into_sku(db, sku_id, job['result'])
+    return None
+
+
+def _lease_candidates(db, now):
+    jobs = db.collection(JOBS_COLLECTION)
+    queued = (jobs.where('status', '==', 'queued')
+              .where('available_at', '<=', now)
+              .order_by('available_at')
+              .limit(5))
+    expired = (jobs.where('status', '==', 'running')
+               .where('lease_expires_at', '<=', now)
+               .order_by('lease_expires_at')
+               .limit(5))
+    return list(queued.stream()) + list(expired.stream())
+
+
+def lease_next_job(db, worker_id=None):
+    """
+    Claim the next runnable job (queued or with an expired lease), or None.
+    A job whose lease expired on its last allowed attempt is marked failed instead,
+    so a job that keeps crashing its worker is not retried forever.
+    """
+    worker_id = worker_id or uuid.uuid4().hex
+    now = _now()
+
+    def claim(transaction, job_ref):
+        snapshot = job_ref.get(transaction=transaction)
+        job = snapshot.to_dict() or {}
+        attempts = job.get('attempts', 0)
+        lease_expired = (job.get('status') == 'running' and
+                         job.get('lease_expires_at') is not None and
+                         job['lease_expires_at'] <= now)
+        if job.get('status') != 'queued' and not lease_expired:
+            return None  # Another worker got there first
+
+        if lease_expired and attempts >= job.get('max_attempts', MAX_ATTEMPTS):
+            transaction.update(job_ref, {
+                'status': 'failed',
+                'lease_owner': None,
+                'lease_token': None,
+                'lease_expires_at': None,
+                'error': f"Lease expired on attempt {attempts}; worker did not finish",
+                'updated_at': now,
+            })
+            return None
+
+        # A fresh token per lease: the same worker id (hostname-pid) can hold a
+        # job again after its own earlier lease expired
+        lease_token = uuid.uuid4().hex
+        transaction.update(job_ref, {
+            'status': 'running',
+            'attempts': attempts + 1,
+            'lease_owner': worker_id,
+            'lease_token': lease_token,
+            'lease_expires_at': now + LEASE_DURATION,
+            'updated_at': now,
+        })
+        job['attempts'] = attempts + 1
+        job['id'] = job_ref.id
+        job['lease_owner'] = worker_id
+        job['lease_token'] = lease_token
+        return job
+
+    for candidate in _lease_candidates(db, now):
+        job = _transactional(db, claim, candidate.reference)
+        if job:
+            return job
+    return None
+
+
+def _holds_lease(job, current):
+    return (current.get('status') == 'running' and job.get('lease_token') is not None and
+            current.get('lease_token') == job['lease_token'])
+
+
+def renew_lease(db, job):
+    """Extend a running job's lease; returns False if it was lost to another worker"""
+    job_ref = db.collection(JOBS_COLLECTION).document(job['id'])
+
+    def renew(transaction):
+        current = job_ref.get(transaction=transaction).to_dict() or {}
+        if not _holds_lease(job, current):
+            return False
+        now = _now()
+        transaction.update(job_ref, {'lease_expires_at': now + LEASE_DURATION, 'updated_at': now})
+        return True
+
+    return _transactional(db, renew)
+
+
+class LeaseHeartbeat:
+    """
+    Renews a job's lease on a background thread while the worker runs it, so a
+    scrape that outlasts LEASE_DURATION is not handed to a second worker.
+    Use as a context manager around the job; lost is set if renewal is refused.
+    """
+
+    def __init__(self, db, job, interval=None):
+        self.db = db
+        self.job = job
+        self.interval = interval or LEASE_DURATION.total_seconds() / 3
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not renew_lease(self.db, self.job):
+                    self.lost = True
+                    return
+            except Exception as e:
+                print(f"⚠️  Lease renewal failed for job {self.job['id']}: {str(e)}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def complete_job(db, job, specifications):
+    """
+    Store the research result and write it back to the linked SKU.
+    Returns False without writing if the lease was lost to another worker.
+    """
+    job_ref = db.collection(JOBS_COLLECTION).document(job['id'])
+
+    def complete(transaction):
+        current = job_ref.get(transaction=transaction).to_dict() or {}
+        if not _holds_lease(job, current):
+            return False, None
+        transaction.update(job_ref, {
+            'status': 'done',
+            'result': specifications or {},
+            'lease_owner': None,
+            'lease_token': None,
+            'lease_expires_at': None,
+            'updated_at': _now(),
+        })
+        # The SKU link may have been attached while the job was running
+        return True, current.get('sku_id')
+
+    completed, sku_id = _transactional(db, complete)
+    if completed and sku_id and specifications:
+        _merge_into_sku(db, sku_id, specifications)
+    return completed
+
+
+def fail_job(db, job, error):
+    """
+    Requeue a failed job with backoff, or mark it failed after max attempts.
+    Returns False without writing if the lease was lost to another worker.
+    """
+    job_ref = db.collection(JOBS_COLLECTION).document(job['id'])
+
+    def fail(transaction):
+        current = job_ref.get(transaction=transaction).to_dict() or {}
+        if not _holds_lease(job, current):
+            return False
+        now = _now()
+        attempts = current.get('attempts', 1)
+        exhausted = attempts >= current.get('max_attempts', MAX_ATTEMPTS)
+        transaction.update(job_ref, {
+            'status': 'failed' if exhausted else 'queued',
+            'available_at': now + RETRY_BACKOFF * (2 ** (attempts - 1)),
+            'lease_owner': None,
+            'lease_token': None,
+            'lease_expires_at': None,
+            'error': str(error),
+            'updated_at': now,
+        })
+        return True
+
+    return _transactional(db, fail)
@@ -0,0 +1,158 @@
+"""
+Concurrent web research for equipment specifications
+Fetches the top search results for "[brand] [model] specifications" at the same
+time, spacing requests per host instead of sleeping globally, and returns the
+specs merged so far when the overall deadline expires
+"""
+
+import asyncio
+import threading
+import time
+from urllib.parse import parse_qs, urljoin, urlparse
+
+from spec_extract import MAX_PAGE_BYTES, SpecExtractor
+
+SEARCH_URL = 'https://html.duckduckgo.com/html/'
+RESULT_COUNT = 3      # prd.yaml: scrape the first three results
+DEADLINE = 20.0       # seconds for the whole research, search included
+HOST_INTERVAL = 1.0   # minimum seconds between requests to the same host
+
+
+class HostLimiter:
+    """Spaces request starts to each host by interval; different hosts run concurrently"""
+
+    def __init__(self, interval=HOST_INTERVAL):
+        self.interval = interval
+        self._next = {}  # host -> earliest monotonic time of its next request
+        self._lock = threading.Lock()
+
+    def reserve(self, host):
+        """Claim the host's next slot and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+            return start - now
+
+    async def wait(self, url):
+        delay = self.reserve(urlparse(url).hostname or '')
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def parse_search_results(html, limit=RESULT_COUNT, base_url=SEARCH_URL):
+    """Result URLs from a DuckDuckGo HTML results page, ads and duplicates skipped"""
+    from lxml import html as lxml_html
+
+    urls = []
+    for href in lxml_html.fromstring(html).xpath('//a[contains(@class, "result__a")]/@href'):
+        url = urljoin(base_url, href)
+        parsed = urlparse(url)
+        if parsed.hostname and parsed.hostname.endswith('duckduckgo.com'):
+            target = parse_qs(parsed.query).get('uddg')  # redirect wrapper around the real URL
+            if not target:
+                continue  # sponsored results go through /y.js
+            url = target[0]
+        if url.startswith(('http://', 'https://')) and url not in urls:
+            urls.append(url)
+        if len(urls) == limit:
+            break
+    return urls
+
+
+async def _fetch_into(client, url, extractor, limiter):
+    await limiter.wait(url)
+    async with client.stream('GET', url) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            extractor.feed(chunk)
+            if extractor.full:
+                break
+    extractor.close()
+
+
+def _merge(extractors):
+    """Specs from every page, earlier (higher ranked) pages winning on conflicts"""
+    merged = {}
+    for extractor in extractors:
+        for key, value in extractor.specs.items():
+            merged.setdefault(key, value)
+    return merged
+
+
+async def research_urls(client, urls, deadline, limiter, max_bytes=MAX_PAGE_BYTES):
+    """
+    Fetch and extract every URL concurrently until the monotonic deadline.
+    Pages still loading at the deadline are cancelled, but the tables they had
+    already streamed past are kept.
+    """
+    extractors = [SpecExtractor(max_bytes) for _ in urls]
+    tasks = [asyncio.ensure_future(_fetch_into(client, url, extractor, limiter))
+             for url, extractor in zip(urls, extractors)]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=max(deadline - time.monotonic(), 0))
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)  # failed pages just add nothing
+    return _merge(extractors)
+
+
+async def research(client, query, deadline, limiter, results=RESULT_COUNT, max_bytes=MAX_PAGE_BYTES,
+                   search_url=SEARCH_URL):
+    """Search for query, then research the top results, all within the deadline"""
+    async def search():
+        await limiter.wait(search_url)
+        response = await client.get(search_url, params={'q': query})
+        response.raise_for_status()
+        return parse_search_results(response.content, results, str(response.url))
+
+    try:
+        urls = await asyncio.wait_for(search(), timeout=max(deadline - time.monotonic(), 0))
+    except Exception:
+        return {}  # search blocked, failed or out of time: nothing to research
+    return await research_urls(client, urls, deadline, limiter, max_bytes)
+
+
+class SpecResearcher:
+    """
+    Drop-in for WebScraper.search_equipment_specs(query), run on the shared
+    HTTP pool's event loop so sync callers (the spec cache, the worker, batch
+    onboarding threads) all reuse one AsyncClient and one per-host limiter
+    """
+
+    def __init__(self, deadline=DEADLINE, results=RESULT_COUNT, host_interval=HOST_INTERVAL,
+                 max_bytes=MAX_PAGE_BYTES, search_url=SEARCH_URL):
+        self.deadline = deadline
+        self.search_url = search_url
+        self.results = results
+        self.max_bytes = max_bytes
+        self.limiter = HostLimiter(host_interval)
+
+    def _run(self, coro_func):
+        from http_pool import run_async
+        deadline = time.monotonic() + self.deadline
+        # The coroutine stops itself at the deadline; the extra second covers scheduling
+        return run_async(lambda client: coro_func(client, deadline), timeout=self.deadline + 1)
+
+    def search_equipment_specs(self, query):
+        """Specs merged from the top search results for query"""
+        return self._run(lambda client, deadline: research(
+            client, query, deadline, self.limiter, self.results, self.max_bytes, self.search_url))
+
+    def research_urls(self, urls):
+        """Specs merged from known candidate pages (e.g. a manufacturer's spec page)"""
+        return self._run(lambda client, deadline: research_urls(
+            client, urls, deadline, self.limiter, self.max_bytes))
+
+
+_researcher = None
+_researcher_lock = threading.Lock()
+
+
+def get_spec_researcher():
+    """Return the process-wide researcher, whose host limits span warm invocations"""
+    global _researcher
+    with _researcher_lock:
+        if _researcher is None:
+            _researcher = SpecResearcher()
+        return _researcher
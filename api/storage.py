@@ -0,0 +1,139 @@
+"""
+Pluggable storage for SKUs, inventory and categories
+The backend is chosen with STORAGE_BACKEND: "firestore" (default) or "sqlite"
+(on-prem / benchmarking, database file at SQLITE_PATH)
+"""
+
+import os
+import threading
+
+DEFAULT_ORDER = (('created_at', 'DESCENDING'),)
+PAGE_SIZE = 500  # documents per page when a whole collection is streamed
+
+
+class Repository:
+    """Document repository interface shared by the SKU and inventory stores"""
+
+    collection = None
+
+    def get(self, doc_id):
+        """Return a document dict (with "id") or None"""
+        raise NotImplementedError
+
+    def get_all(self, doc_ids, fields=None):
+        """Documents for the given ids, in that order and skipping missing ones, in batched reads"""
+        documents = (self.get(doc_id) for doc_id in doc_ids)
+        return [project(document, fields) for document in documents if document]
+
+    def list(self, filters=None, order_by=DEFAULT_ORDER, limit=None, fields=None):
+        """
+        Return documents matching equality filters in the given order.
+        With fields, only those top-level fields (plus "id") are returned.
+        """
+        raise NotImplementedError
+
+    def list_created_between(self, start=None, end=None, fields=None):
+        """Documents with start <= created_at < end (either bound optional), oldest first"""
+        raise NotImplementedError
+
+    def iter_pages(self, page_size=PAGE_SIZE, fields=None):
+        """Yield every document in lists of up to page_size, in id order, paging with an id cursor"""
+        raise NotImplementedError
+
+    def create(self, data, doc_id=None):
+        """Create a document and return its id; an existing doc_id is overwritten"""
+        raise NotImplementedError
+
+    def update(self, doc_id, data):
+        """Update fields of an existing document"""
+        raise NotImplementedError
+
+    def update_many(self, updates):
+        """Apply {doc_id: fields} updates, batched where the backend supports it"""
+        for doc_id, data in updates.items():
+            self.update(doc_id, data)
+        return len(updates)
+
+    def delete(self, doc_id):
+        raise NotImplementedError
+
+    def search(self, text, limit=50):
+        """Full-text search over the collection's searchable fields"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Delete every document and return how many were removed"""
+        raise NotImplementedError
+
+
+class CategoryRepository:
+    """Category names used for dropdowns and SKU grouping"""
+
+    def list(self):
+        raise NotImplementedError
+
+    def add(self, name):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class Storage:
+    """Bundle of repositories for one backend"""
+
+    backend = None
+
+    def __init__(self, skus, inventory, categories):
+        self.skus = skus
+        self.inventory = inventory
+        self.categories = categories
+
+    def clear_collection(self, name):
+        """Delete every document in a collection and return the count"""
+        raise NotImplementedError
+
+
+# Fields matched by substring search when a backend has no full-text index
+SEARCH_FIELDS = {
+    'skus': ['name', 'brand', 'model', 'category', 'description'],
+    'inventory': ['serial_number', 'barcode', 'location', 'notes'],
+}
+
+# Default projections for list views; full documents (with specifications) only on request
+LIST_FIELDS = {
+    'skus': ['name', 'brand', 'model', 'category', 'price_per_day', 'security_deposit',
+             'thumbnails', 'is_active', 'created_at'],
+    'inventory': ['sku_id', 'serial_number', 'condition', 'status', 'location', 'notes', 'created_at'],
+}
+
+
+def project(document, fields):
+    """Keep only the given top-level fields of a document (and its id)"""
+    if fields is None:
+        return document
+    projected = {field: document[field] for field in fields if field in document}
+    if 'id' in document:
+        projected['id'] = document['id']
+    return projected
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Return the process-wide storage for the configured backend"""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            backend = os.getenv('STORAGE_BACKEND', 'firestore').lower()
+            if backend == 'sqlite':
+                from storage_sqlite import SQLiteStorage
+                _storage = SQLiteStorage(os.getenv('SQLITE_PATH', 'camorent_inventory.db'))
+            elif backend == 'firestore':
+                from storage_firestore import FirestoreStorage
+                _storage = FirestoreStorage()
+            else:
+                raise ValueError(f"Unknown STORAGE_BACKEND '{backend}' (expected firestore or sqlite)")
+        return _storage
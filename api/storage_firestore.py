@@ -0,0 +1,177 @@
+"""
+Firestore storage backend
+Listing queries go through the index-aware query planner
+"""
+
+import re
+
+from firebase_admin import firestore
+
+from query_planner import plan_query
+from storage import DEFAULT_ORDER, PAGE_SIZE, SEARCH_FIELDS, CategoryRepository, Repository, Storage, project
+
+BATCH_SIZE = 500
+
+
+def _to_dict(doc):
+    data = doc.to_dict() or {}
+    data['id'] = doc.id
+    return data
+
+
+def _delete_collection(db, collection_name):
+    """Delete all documents in a collection using batched writes"""
+    deleted = 0
+    while True:
+        docs = list(db.collection(collection_name).limit(BATCH_SIZE).stream())
+        if not docs:
+            return deleted
+        batch = db.batch()
+        for doc in docs:
+            batch.delete(doc.reference)
+        batch.commit()
+        deleted += len(docs)
+
+
+class FirestoreRepository(Repository):
+    def __init__(self, db, collection):
+        self.db = db
+        self.collection = collection
+
+    def _ref(self):
+        return self.db.collection(self.collection)
+
+    def get(self, doc_id):
+        doc = self._ref().document(doc_id).get()
+        return _to_dict(doc) if doc.exists else None
+
+    def get_all(self, doc_ids, fields=None):
+        doc_ids = list(doc_ids)
+        field_paths = sorted(set(fields) - {'id'}) if fields is not None else None
+        found = {}
+        for start in range(0, len(doc_ids), BATCH_SIZE):
+            refs = [self._ref().document(doc_id) for doc_id in dict.fromkeys(doc_ids[start:start + BATCH_SIZE])]
+            for doc in self.db.get_all(refs, field_paths=field_paths):
+                if doc.exists:
+                    found[doc.id] = project(_to_dict(doc), fields)
+        return [found[doc_id] for doc_id in doc_ids if doc_id in found]
+
+    def list(self, filters=None, order_by=DEFAULT_ORDER, limit=None, fields=None):
+        plan = plan_query(self.collection, filters, order_by)
+        query = plan.apply(self._ref())
+        residual = plan.client_filters or plan.client_order
+        if limit and not residual:
+            query = query.limit(limit)
+        if fields is not None:
+            # Residual filters and ordering run on the fetched documents, so fetch their fields too
+            needed = set(fields) | set(plan.client_filters) | {field for field, _ in plan.client_order}
+            needed.discard('id')
+            query = query.select(sorted(needed))
+
+        items = plan.filter_results([_to_dict(doc) for doc in query.stream()])
+        items = items[:limit] if limit else items
+        return [project(item, fields) for item in items] if fields is not None else items
+
+    def list_created_between(self, start=None, end=None, fields=None):
+        # A range and order on the same single field needs no composite index
+        query = self._ref()
+        if start is not None:
+            query = query.where('created_at', '>=', start)
+        if end is not None:
+            query = query.where('created_at', '<', end)
+        query = query.order_by('created_at')
+        if fields is not None:
+            query = query.select(sorted(set(fields) - {'id'}))
+        return [project(_to_dict(doc), fields) for doc in query.stream()]
+
+    def iter_pages(self, page_size=PAGE_SIZE, fields=None):
+        query = self._ref().order_by('__name__').limit(page_size)
+        if fields is not None:
+            query = query.select(sorted(set(fields) - {'id'}))
+        last = None
+        while True:
+            docs = list((query.start_after(last) if last is not None else query).stream())
+            if docs:
+                yield [project(_to_dict(doc), fields) for doc in docs]
+            if len(docs) < page_size:
+                return
+            last = docs[-1]
+
+    def create(self, data, doc_id=None):
+        data = dict(data)
+        data.pop('id', None)
+        data.setdefault('created_at', firestore.SERVER_TIMESTAMP)
+        ref = self._ref().document(doc_id) if doc_id else self._ref().document()
+        ref.set(data)
+        return ref.id
+
+    def update(self, doc_id, data):
+        data = dict(data)
+        data.pop('id', None)
+        data['updated_at'] = firestore.SERVER_TIMESTAMP
+        self._ref().document(doc_id).update(data)
+
+    def update_many(self, updates):
+        items = list(updates.items())
+        for start in range(0, len(items), BATCH_SIZE):
+            batch = self.db.batch()
+            for doc_id, data in items[start:start + BATCH_SIZE]:
+                data = dict(data)
+                data.pop('id', None)
+                data['updated_at'] = firestore.SERVER_TIMESTAMP
+                batch.update(self._ref().document(doc_id), data)
+            batch.commit()
+        return len(items)
+
+    def delete(self, doc_id):
+        self._ref().document(doc_id).delete()
+
+    def search(self, text, limit=50):
+        # Firestore has no full-text index; match every term against the searchable fields
+        terms = (text or '').lower().split()
+        fields = SEARCH_FIELDS.get(self.collection, [])
+        results = []
+        for item in self.list(order_by=DEFAULT_ORDER):
+            haystack = ' '.join(str(item.get(field) or '') for field in fields).lower()
+            if all(term in haystack for term in terms):
+                results.append(item)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def clear(self):
+        return _delete_collection(self.db, self.collection)
+
+
+class FirestoreCategoryRepository(CategoryRepository):
+    def __init__(self, db):
+        self.db = db
+
+    def list(self):
+        names = [(doc.to_dict() or {}).get('name') or doc.id for doc in self.db.collection('categories').stream()]
+        return sorted(names)
+
+    def add(self, name):
+        doc_id = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+        self.db.collection('categories').document(doc_id).set({'name': name}, merge=True)
+
+    def clear(self):
+        return _delete_collection(self.db, 'categories')
+
+
+class FirestoreStorage(Storage):
+    backend = 'firestore'
+
+    def __init__(self, db=None):
+        if db is None:
+            from firebase_config import get_firestore_client
+            db = get_firestore_client()
+        self.db = db
+        super().__init__(
+            FirestoreRepository(db, 'skus'),
+            FirestoreRepository(db, 'inventory'),
+            FirestoreCategoryRepository(db),
+        )
+
+    def clear_collection(self, name):
+        return _delete_collection(self.db, name)
@@ -0,0 +1,383 @@
+"""
+SQLite storage backend for on-prem use and benchmarking
+WAL mode for concurrent readers, B-tree indexes generated from the query shapes
+in firestore.indexes.json, and FTS5 tables for search
+"""
+
+import json
+import re
+import secrets
+import sqlite3
+import string
+import threading
+from datetime import datetime, timezone
+
+from query_planner import load_indexes
+from storage import DEFAULT_ORDER, PAGE_SIZE, SEARCH_FIELDS, CategoryRepository, Repository, Storage, project
+
+# Schema fields stored as real columns; anything else lives in the JSON "extra" column
+COLUMNS = {
+    'skus': ['name', 'brand', 'model', 'category', 'description', 'price_per_day',
+             'security_deposit', 'image_url', 'is_active', 'created_at', 'updated_at'],
+    'inventory': ['sku_id', 'serial_number', 'barcode', 'condition', 'status', 'location',
+                  'purchase_price', 'current_value', 'notes', 'created_by', 'created_at', 'updated_at',
+                  'depreciated_value', 'depreciated_at'],
+}
+BOOLEAN_COLUMNS = {'is_active'}
+TIMESTAMP_SUFFIX = '_at'
+
+ID_ALPHABET = string.ascii_letters + string.digits
+DIRECTIONS = {'ASCENDING': 'ASC', 'DESCENDING': 'DESC'}
+
+
+def _auto_id():
+    """20-character id in the same alphabet Firestore uses"""
+    return ''.join(secrets.choice(ID_ALPHABET) for _ in range(20))
+
+
+def _to_column(field, value):
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    if field in BOOLEAN_COLUMNS and value is not None:
+        return int(bool(value))
+    return value
+
+
+def _from_column(field, value):
+    if value is None:
+        return None
+    if field.endswith(TIMESTAMP_SUFFIX) and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if field in BOOLEAN_COLUMNS:
+        return bool(value)
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': _to_column(None, value)}
+    return str(value)
+
+
+def _json_hook(obj):
+    if set(obj) == {'__datetime__'}:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def _fts_query(text):
+    """Turn free text into an FTS5 prefix query that cannot inject syntax"""
+    terms = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class SQLiteDatabase:
+    """Per-thread connections to one WAL-mode database file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=5000')
+            self._local.conn = conn
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn):
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            with conn:
+                for collection, columns in COLUMNS.items():
+                    column_sql = ', '.join(columns)
+                    conn.execute(
+                        f'CREATE TABLE IF NOT EXISTS {collection} '
+                        f'(id TEXT PRIMARY KEY, {column_sql}, extra TEXT)'
+                    )
+                    # Databases created before a column was added get it appended
+                    existing = {row['name'] for row in conn.execute(f'PRAGMA table_info({collection})')}
+                    for column in columns:
+                        if column not in existing:
+                            conn.execute(f'ALTER TABLE {collection} ADD COLUMN {column}')
+
+                    # Full-text index kept in sync with the base table by triggers
+                    fts_columns = ', '.join(SEARCH_FIELDS[collection])
+                    new_values = ', '.join(f'new.{field}' for field in SEARCH_FIELDS[collection])
+                    old_values = ', '.join(f'old.{field}' for field in SEARCH_FIELDS[collection])
+                    conn.execute(
+                        f"CREATE VIRTUAL TABLE IF NOT EXISTS {collection}_fts USING fts5("
+                        f"{fts_columns}, content='{collection}', content_rowid='rowid')"
+                    )
+                    conn.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS {collection}_fts_insert AFTER INSERT ON {collection} BEGIN "
+                        f"INSERT INTO {collection}_fts(rowid, {fts_columns}) VALUES (new.rowid, {new_values}); END"
+                    )
+                    conn.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS {collection}_fts_delete AFTER DELETE ON {collection} BEGIN "
+                        f"INSERT INTO {collection}_fts({collection}_fts, rowid, {fts_columns}) "
+                        f"VALUES ('delete', old.rowid, {old_values}); END"
+                    )
+                    conn.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS {collection}_fts_update AFTER UPDATE ON {collection} BEGIN "
+                        f"INSERT INTO {collection}_fts({collection}_fts, rowid, {fts_columns}) "
+                        f"VALUES ('delete', old.rowid, {old_values}); "
+                        f"INSERT INTO {collection}_fts(rowid, {fts_columns}) VALUES (new.rowid, {new_values}); END"
+                    )
+
+                # B-tree indexes for every declared Firestore query shape
+                for collection, indexes in load_indexes().items():
+                    if collection not in COLUMNS:
+                        continue
+                    for fields in indexes:
+                        if not all(name in COLUMNS[collection] for name, _ in fields):
+                            continue
+                        name = f"idx_{collection}_" + '_'.join(field for field, _ in fields)
+                        column_sql = ', '.join(f'{field} {DIRECTIONS[order]}' for field, order in fields)
+                        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {collection} ({column_sql})')
+
+                conn.execute('CREATE TABLE IF NOT EXISTS categories (name TEXT PRIMARY KEY)')
+            self._schema_ready = True
+
+
+class SQLiteRepository(Repository):
+    def __init__(self, database, collection):
+        self.database = database
+        self.collection = collection
+        self.columns = COLUMNS[collection]
+
+    def _row_to_dict(self, row):
+        keys = row.keys()
+        data = json.loads(row['extra'], object_hook=_json_hook) if 'extra' in keys and row['extra'] else {}
+        for field in self.columns:
+            if field not in keys:
+                continue
+            value = _from_column(field, row[field])
+            if value is not None:
+                data[field] = value
+        data['id'] = row['id']
+        return data
+
+    def _split(self, data):
+        columns = {field: _to_column(field, data[field]) for field in self.columns if field in data}
+        extra = {key: value for key, value in data.items() if key not in self.columns and key != 'id'}
+        return columns, extra
+
+    def _check_field(self, field):
+        if field != 'id' and field not in self.columns:
+            raise ValueError(f"Cannot filter or sort {self.collection} by '{field}'")
+
+    def get(self, doc_id):
+        row = self.database.connection().execute(
+            f'SELECT * FROM {self.collection} WHERE id = ?', (doc_id,)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def get_all(self, doc_ids, fields=None):
+        doc_ids = list(doc_ids)
+        unique = list(dict.fromkeys(doc_ids))
+        found = {}
+        conn = self.database.connection()
+        for start in range(0, len(unique), PAGE_SIZE):
+            chunk = unique[start:start + PAGE_SIZE]
+            rows = conn.execute(
+                f"SELECT {self._select_list(fields)} FROM {self.collection} "
+                f"WHERE id IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            ).fetchall()
+            for row in rows:
+                found[row['id']] = project(self._row_to_dict(row), fields)
+        return [found[doc_id] for doc_id in doc_ids if doc_id in found]
+
+    def _select_list(self, fields):
+        """Columns to read for a projection; the JSON column only when a field lives there"""
+        if fields is None:
+            return '*'
+        names = ['id'] + [field for field in self.columns if field in fields]
+        if any(field not in self.columns and field != 'id' for field in fields):
+            names.append('extra')
+        return ', '.join(names)
+
+    def list(self, filters=None, order_by=DEFAULT_ORDER, limit=None, fields=None):
+        filters = {field: value for field, value in (filters or {}).items() if value not in (None, '')}
+        clauses, params = [], []
+        for field, value in sorted(filters.items()):
+            self._check_field(field)
+            clauses.append(f'{field} = ?')
+            params.append(_to_column(field, value))
+
+        sql = f'SELECT {self._select_list(fields)} FROM {self.collection}'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        if order_by:
+            for field, _ in order_by:
+                self._check_field(field)
+            sql += ' ORDER BY ' + ', '.join(f'{field} {DIRECTIONS[direction]}' for field, direction in order_by)
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+
+        rows = self.database.connection().execute(sql, params).fetchall()
+        return [project(self._row_to_dict(row), fields) for row in rows]
+
+    def list_created_between(self, start=None, end=None, fields=None):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('created_at >= ?')
+            params.append(_to_column('created_at', start))
+        if end is not None:
+            clauses.append('created_at < ?')
+            params.append(_to_column('created_at', end))
+
+        sql = f'SELECT {self._select_list(fields)} FROM {self.collection}'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        rows = self.database.connection().execute(sql + ' ORDER BY created_at', params).fetchall()
+        return [project(self._row_to_dict(row), fields) for row in rows]
+
+    def iter_pages(self, page_size=PAGE_SIZE, fields=None):
+        sql = f'SELECT {self._select_list(fields)} FROM {self.collection} WHERE id > ? ORDER BY id LIMIT ?'
+        last = ''
+        while True:
+            rows = self.database.connection().execute(sql, (last, page_size)).fetchall()
+            if rows:
+                yield [project(self._row_to_dict(row), fields) for row in rows]
+            if len(rows) < page_size:
+                return
+            last = rows[-1]['id']
+
+    def create(self, data, doc_id=None):
+        data = dict(data)
+        doc_id = doc_id or data.pop('id', None) or _auto_id()
+        data.pop('id', None)
+        data.setdefault('created_at', datetime.now(timezone.utc))
+        columns, extra = self._split(data)
+
+        names = ['id'] + list(columns) + ['extra']
+        values = [doc_id] + list(columns.values()) + [json.dumps(extra, default=_json_default)]
+        # An upsert rather than INSERT OR REPLACE: REPLACE deletes the old row without
+        # firing the FTS delete trigger, leaving its terms behind for a reused rowid.
+        # Every column is reset, so an existing doc_id is still fully overwritten.
+        assignments = ', '.join(f'{field} = excluded.{field}' for field in list(self.columns) + ['extra'])
+        conn = self.database.connection()
+        with conn:
+            conn.execute(
+                f"INSERT INTO {self.collection} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)}) "
+                f"ON CONFLICT(id) DO UPDATE SET {assignments}",
+                values
+            )
+        return doc_id
+
+    def update(self, doc_id, data):
+        current = self.get(doc_id)
+        if current is None:
+            raise KeyError(f"{self.collection}/{doc_id} does not exist")
+
+        current.update(data)
+        current.pop('id', None)
+        current['updated_at'] = datetime.now(timezone.utc)
+        columns, extra = self._split(current)
+
+        assignments = ', '.join(f'{field} = ?' for field in columns)
+        conn = self.database.connection()
+        with conn:
+            conn.execute(
+                f'UPDATE {self.collection} SET {assignments}, extra = ? WHERE id = ?',
+                list(columns.values()) + [json.dumps(extra, default=_json_default), doc_id]
+            )
+
+    def update_many(self, updates):
+        # Updates touching only real columns run as one executemany per field set;
+        # anything that also rewrites the JSON column goes through update()
+        groups, others = {}, {}
+        for doc_id, data in updates.items():
+            fields = tuple(sorted(field for field in data if field != 'id'))
+            if all(field in self.columns for field in fields):
+                groups.setdefault(fields, []).append((doc_id, data))
+            else:
+                others[doc_id] = data
+
+        now = _to_column('updated_at', datetime.now(timezone.utc))
+        conn = self.database.connection()
+        with conn:
+            for fields, rows in groups.items():
+                assignments = ', '.join(f'{field} = ?' for field in fields + ('updated_at',))
+                conn.executemany(
+                    f'UPDATE {self.collection} SET {assignments} WHERE id = ?',
+                    [[_to_column(field, data[field]) for field in fields] + [now, doc_id] for doc_id, data in rows]
+                )
+        return sum(len(rows) for rows in groups.values()) + super().update_many(others)
+
+    def delete(self, doc_id):
+        conn = self.database.connection()
+        with conn:
+            conn.execute(f'DELETE FROM {self.collection} WHERE id = ?', (doc_id,))
+
+    def search(self, text, limit=50):
+        query = _fts_query(text)
+        if not query:
+            return self.list(limit=limit)
+        rows = self.database.connection().execute(
+            f'SELECT t.* FROM {self.collection}_fts f JOIN {self.collection} t ON t.rowid = f.rowid '
+            f'WHERE {self.collection}_fts MATCH ? ORDER BY f.rank LIMIT ?',
+            (query, int(limit))
+        ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def clear(self):
+        conn = self.database.connection()
+        with conn:
+            return conn.execute(f'DELETE FROM {self.collection}').rowcount
+
+
+class SQLiteCategoryRepository(CategoryRepository):
+    def __init__(self, database):
+        self.database = database
+
+    def list(self):
+        rows = self.database.connection().execute('SELECT name FROM categories ORDER BY name').fetchall()
+        return [row['name'] for row in rows]
+
+    def add(self, name):
+        conn = self.database.connection()
+        with conn:
+            conn.execute('INSERT OR IGNORE INTO categories (name) VALUES (?)', (name,))
+
+    def clear(self):
+        conn = self.database.connection()
+        with conn:
+            return conn.execute('DELETE FROM categories').rowcount
+
+
+class SQLiteStorage(Storage):
+    backend = 'sqlite'
+
+    def __init__(self, path):
+        self.database = SQLiteDatabase(path)
+        super().__init__(
+            SQLiteRepository(self.database, 'skus'),
+            SQLiteRepository(self.database, 'inventory'),
+            SQLiteCategoryRepository(self.database),
+        )
+
+    def clear_collection(self, name):
+        if name == 'skus':
+            return self.skus.clear()
+        if name == 'inventory':
+            return self.inventory.clear()
+        if name == 'categories':
+            return self.categories.clear()
+        return 0  # Collections without a SQLite table have nothing to delete
@@ -0,0 +1,82 @@
+"""
+Chunked voice upload endpoint for Vercel
+POST /api/upload-chunk?session=...&seq=N with one self-contained audio segment as the body
+POST /api/upload-chunk?session=...&seq=N&final=1 with the tail once recording stops
+The final call responds with the same form data as /api/process-audio
+"""
+
+import os
+import sys
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(__file__))
+
+from audio_sessions import MissingSegments, get_audio_sessions, validate_segment
+from responses import send_json
+
+
+class handler(BaseHTTPRequestHandler):
+    def _research_specs(self, form):
+        """Merge cached or researched specs into the form; returns the web_scraping_status"""
+        if not (form.get('brand') and form.get('model')):
+            return 'skipped'
+        try:
+            from spec_cache import get_spec_cache
+            specs = get_spec_cache().search_equipment_specs(None, form['brand'], form['model'])
+        except Exception as e:
+            print(f"⚠️  Spec research failed for {form['brand']} {form['model']}: {str(e)}")
+            return 'failed'
+        if not specs:
+            return 'no_results'
+        form.setdefault('specifications', {}).update(specs)
+        return 'success'
+
+    def do_POST(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        session_id = params.get('session')
+        final = params.get('final') in ('1', 'true')
+        try:
+            seq = int(params.get('seq', ''))
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length < 0:
+                raise ValueError('invalid Content-Length')
+            audio = self.rfile.read(content_length) if content_length else b''
+            validate_segment(session_id, seq, audio, final=final)
+        except ValueError as e:
+            send_json(self, 400, {'success': False, 'error': f'Invalid segment: {e}'})
+            return
+
+        sessions = get_audio_sessions()
+        try:
+            if not final:
+                transcription = sessions.add_segment(session_id, seq, audio)
+                send_json(self, 200, {'success': True, 'session': session_id, 'seq': seq,
+                                      'characters': len(transcription)})
+                return
+
+            transcription = sessions.finish(session_id, seq, audio)
+            form = sessions.client.extract_equipment_data(transcription) or {}
+        except MissingSegments as e:
+            # The client falls back to uploading the whole recording to /api/process-audio
+            send_json(self, 409, {'success': False, 'error': str(e), 'missing': e.missing})
+            return
+        except Exception as e:
+            send_json(self, 500, {'success': False, 'processing_status': 'error', 'error': str(e)})
+            return
+
+        web_scraping_status = self._research_specs(form)
+        send_json(self, 200, {
+            **form,
+            'success': True,
+            'processing_status': 'success',
+            'transcription': transcription,
+            'web_scraping_status': web_scraping_status,
+        })
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
@@ -0,0 +1,107 @@
+"""
+Warm-instance caches of Firestore collections
+Base for in-memory views that load once per warm instance and then apply only
+documents created or updated since an updated_at/created_at watermark
+"""
+
+import threading
+import time
+from datetime import datetime
+
+REFRESH_INTERVAL = 30  # seconds between incremental refreshes on a warm instance
+
+
+class WatermarkCache:
+    """
+    In-memory view of one or more collections, refreshed from a watermark.
+    Subclasses list COLLECTIONS, extend _reset() and implement _apply().
+    """
+
+    COLLECTIONS = ()
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.watermark = None
+        self.loaded_at = None
+
+    def _query(self, db, collection):
+        """Query used for the full load of a collection (e.g. to select fields)"""
+        return db.collection(collection)
+
+    def _apply(self, collection, doc_id, data):
+        raise NotImplementedError
+
+    @staticmethod
+    def _advance_watermark(watermark, data):
+        updated_at = data.get('updated_at') or data.get('created_at')
+        if isinstance(updated_at, datetime) and (watermark is None or updated_at > watermark):
+            return updated_at
+        return watermark
+
+    def _apply_doc(self, collection, doc, watermark):
+        """Apply one document and return the watermark advanced past it"""
+        data = doc.to_dict() or {}
+        self._apply(collection, doc.id, data)
+        return self._advance_watermark(watermark, data)
+
+    def load(self, db):
+        """Full load of every collection"""
+        with self._lock:
+            self._reset()
+            watermark = None
+            for collection in self.COLLECTIONS:
+                for doc in self._query(db, collection).stream():
+                    watermark = self._apply_doc(collection, doc, watermark)
+            self.watermark = watermark
+            self.loaded_at = time.monotonic()
+
+    def refresh(self, db):
+        """
+        Apply only documents created or updated since the watermark.
+        The watermark moves only once every query has succeeded: if one fails,
+        the next refresh asks again from the old watermark (re-applying is harmless).
+        Hard deletes are not visible here; subclasses document how records are retired.
+        """
+        if self.watermark is None:
+            return self.load(db)
+
+        with self._lock:
+            watermark = self.watermark
+            for collection in self.COLLECTIONS:
+                seen = set()
+                for field in ('updated_at', 'created_at'):
+                    for doc in db.collection(collection).where(field, '>', self.watermark).stream():
+                        if doc.id not in seen:
+                            seen.add(doc.id)
+                            watermark = self._apply_doc(collection, doc, watermark)
+            self.watermark = watermark
+            self.loaded_at = time.monotonic()
+
+
+class WarmInstance:
+    """Process-wide cache, loaded on first use and refreshed at most every refresh_interval seconds"""
+
+    def __init__(self, factory, refresh_interval=REFRESH_INTERVAL):
+        self.factory = factory
+        self.refresh_interval = refresh_interval
+        self.cache = None
+        self._lock = threading.Lock()
+
+    def get(self, db=None):
+        with self._lock:
+            if db is None:
+                from firebase_config import get_firestore_client
+                db = get_firestore_client()
+            if self.cache is None:
+                # Publish only after a successful load, so a failed cold load is retried
+                cache = self.factory()
+                cache.load(db)
+                self.cache = cache
+            elif self.cache.loaded_at is None:
+                self.cache.load(db)  # an earlier reload failed part way
+            elif time.monotonic() - self.cache.loaded_at >= self.refresh_interval:
+                self.cache.refresh(db)
+            return self.cache
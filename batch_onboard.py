@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Batch onboarding for Camorent Inventory
+Runs a folder of recordings (or a transcript file) through transcription,
+extraction, spec research and save with a bounded worker pool, resuming from a
+checkpoint and writing every extracted form to an NDJSON file for review
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+# Add the api directory to the path to import the OpenAI, spec and storage helpers
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from schemas import parse_equipment_form
+from sku_catalog import model_key
+
+AUDIO_EXTENSIONS = {'.webm', '.mp3', '.mp4', '.m4a', '.mpeg', '.mpga', '.wav', '.ogg', '.flac'}
+
+
+def discover_items(source):
+    """
+    Work items with stable ids: one per audio file in a folder, or one per
+    description in a transcript file (.txt lines or a .json list of strings)
+    """
+    if os.path.isdir(source):
+        items = []
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS:
+                    path = os.path.join(root, name)
+                    items.append({'id': os.path.relpath(path, source), 'audio_path': path})
+        return sorted(items, key=lambda item: item['id'])
+
+    with open(source, encoding='utf-8') as f:
+        if source.endswith('.json'):
+            descriptions = json.load(f)
+        else:
+            descriptions = f.read().splitlines()
+    name = os.path.basename(source)
+    return [
+        {'id': f"{name}#{number}", 'transcription': text.strip()}
+        for number, text in enumerate(descriptions, 1) if text and text.strip()
+    ]
+
+
+def load_checkpoint(path):
+    """Ids of items already processed in earlier runs"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+class SkuIndex:
+    """brand+model -> SKU id for the existing catalog, so repeat models link instead of duplicating"""
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._lock = threading.Lock()
+        self._ids = {
+            model_key(sku.get('brand'), sku.get('model')): sku['id']
+            for sku in storage.skus.list(fields=['brand', 'model'])
+        }
+
+    def get_or_create(self, sku):
+        """sku is a validated SkuPayload"""
+        key = model_key(sku.brand, sku.model)
+        with self._lock:
+            if key not in self._ids:
+                self._ids[key] = self.storage.skus.create(sku.to_dict())
+                self.storage.categories.add(sku.category)
+            return self._ids[key]
+
+
+def process_item(item, client, cache, scraper):
+    """Transcribe (for audio), extract the form and merge researched specs"""
+    transcription = item.get('transcription')
+    if transcription is None:
+        with open(item['audio_path'], 'rb') as audio_file:
+            transcription = client.transcribe_audio(audio_file)
+
+    form = client.extract_equipment_data(transcription) or {}
+    if form.get('brand') and form.get('model'):
+        specs = cache.search_equipment_specs(scraper, form['brand'], form['model'])
+        if specs:
+            form.setdefault('specifications', {}).update(specs)
+    return transcription, form
+
+
+def inventory_doc_id(item_id):
+    """Inventory id derived from the work item, so a resumed run overwrites instead of duplicating"""
+    return 'onboard-' + hashlib.sha256(item_id.encode()).hexdigest()[:20]
+
+
+def save_form(storage, sku_index, form, item_id):
+    """Validate, create (or link) the SKU and add the inventory unit; returns (sku_id, inventory_id)"""
+    form = dict(form)
+    if form.get('brand') and form.get('model'):
+        form.setdefault('name', f"{form['brand']} {form['model']}")
+    sku, unit = parse_equipment_form(form)
+
+    unit.sku_id = sku_index.get_or_create(sku)
+    unit.created_by = 'batch_onboard'
+    return unit.sku_id, storage.inventory.create(unit.to_dict(), doc_id=inventory_doc_id(item_id))
+
+
+def run_batch(items, worker, output_path, checkpoint_path, workers=4):
+    """
+    Run worker(item) -> record over items with at most `workers` in flight.
+    Each finished item is appended to the NDJSON output and, if it succeeded,
+    to the checkpoint, so an interrupted run resumes where it stopped.
+    """
+    done = load_checkpoint(checkpoint_path)
+    pending = [item for item in items if item['id'] not in done]
+    print(f"🔍 {len(items)} items, {len(items) - len(pending)} already done, {len(pending)} to process")
+
+    started = time.perf_counter()
+    processed = failed = 0
+    queue = iter(pending)
+    with open(output_path, 'a', encoding='utf-8') as output, \
+            open(checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+        for item in queue:
+            in_flight[pool.submit(worker, item)] = item
+            if len(in_flight) >= workers:
+                break
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                item = in_flight.pop(future)
+                try:
+                    record = {'id': item['id'], 'status': 'ok', **future.result()}
+                except Exception as e:
+                    record = {'id': item['id'], 'status': 'error', 'error': str(e)}
+                record['processed_at'] = datetime.now(timezone.utc).isoformat()
+
+                output.write(json.dumps(record, default=str) + '\n')
+                output.flush()
+                if record['status'] == 'ok':
+                    checkpoint.write(item['id'] + '\n')
+                    checkpoint.flush()
+                    processed += 1
+                else:
+                    failed += 1
+
+                minutes = (time.perf_counter() - started) / 60
+                rate = (processed + failed) / minutes if minutes else 0.0
+                icon = '✅' if record['status'] == 'ok' else '❌'
+                print(f"{icon} [{processed + failed}/{len(pending)}] {item['id']} ({rate:.1f} items/min)")
+
+                next_item = next(queue, None)
+                if next_item is not None:
+                    in_flight[pool.submit(worker, next_item)] = next_item
+
+    minutes = (time.perf_counter() - started) / 60
+    rate = (processed + failed) / minutes if minutes else 0.0
+    print(f"Done: {processed} saved, {failed} failed in {minutes:.1f} min ({rate:.1f} items/min)")
+    return processed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Onboard a folder of recordings or a transcript file")
+    parser.add_argument('source', help="folder of audio files, or a .txt/.json transcript file")
+    parser.add_argument('--output', default='onboarding.ndjson', help="NDJSON file of extracted forms")
+    parser.add_argument('--checkpoint', help="checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument('--workers', type=int, default=4, help="items processed concurrently")
+    parser.add_argument('--dry-run', action='store_true', help="extract and write NDJSON without saving")
+    args = parser.parse_args()
+
+    from openai_governor import GovernedOpenAIClient
+    from spec_cache import get_spec_cache
+    from spec_research import get_spec_researcher
+    from storage import get_storage
+
+    items = discover_items(args.source)
+    client = GovernedOpenAIClient()
+    cache = get_spec_cache()
+    scraper = get_spec_researcher()
+    storage = None if args.dry_run else get_storage()
+    sku_index = None if args.dry_run else SkuIndex(storage)
+
+    def worker(item):
+        transcription, form = process_item(item, client, cache, scraper)
+        record = {'transcription': transcription, 'form': form}
+        if storage is not None:
+            record['sku_id'], record['inventory_id'] = save_form(storage, sku_index, form, item['id'])
+        return record
+
+    checkpoint = args.checkpoint or f"{args.output}.checkpoint"
+    try:
+        run_batch(items, worker, args.output, checkpoint, workers=args.workers)
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Interrupted; rerun the same command to resume from {checkpoint}")
+        sys.exit(1)
+    print(f"OpenAI governor: {client.governor.stats()}")
+    print(f"Spec cache hits: {cache.hits}, misses: {cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark repeated outbound calls: a fresh client per call vs the shared pool
+The fresh client pays DNS, TCP and TLS setup on every call, as constructing
+OpenAIClient()/WebScraper() per request did; the pooled client pays it once
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add the api directory to the path to import http_pool
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+import http_pool
+
+DEFAULT_URL = 'https://api.openai.com/v1/models'  # answers 401 without a key, which is enough here
+
+
+def timed(call, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(label, timings):
+    print(f"{label:<22} first {timings[0]:8.1f} ms   median {statistics.median(timings):8.1f} ms   "
+          f"total {sum(timings):9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call HTTP clients")
+    parser.add_argument('--url', default=DEFAULT_URL, help="HTTPS endpoint to call repeatedly")
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"🔍 {args.rounds} GETs to {args.url} (HTTP/2 {'on' if http_pool.HTTP2 else 'off: h2 not installed'})")
+
+    def fresh():
+        with http_pool.new_client() as client:
+            client.get(args.url)
+
+    def pooled():
+        http_pool.get_http_client().get(args.url)
+
+    fresh_timings = timed(fresh, args.rounds)
+    pooled_timings = timed(pooled, args.rounds)
+    report('fresh client per call', fresh_timings)
+    report('shared pooled client', pooled_timings)
+
+    saved = statistics.median(fresh_timings) - statistics.median(pooled_timings[1:] or pooled_timings)
+    print(f"✅ Connection setup saved per warm call: ~{saved:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
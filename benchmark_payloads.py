@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark list payloads: full documents vs slim projections
+Reports query time, JSON serialization time and raw/gzip/brotli sizes for the
+SKU and inventory listings, against a synthetic SQLite catalog or live storage,
+then compares the JSON encoders and payload validation on the full listings
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add the api directory to the path to import storage and responses
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from responses import encode_body, orjson, to_json_bytes
+from schemas import InventoryPayload, SkuPayload
+from storage import LIST_FIELDS, get_storage
+
+BRANDS = ['Canon', 'Sony', 'Nikon', 'Blackmagic', 'Aputure', 'Rode', 'DJI', 'Godox']
+CATEGORIES = ['cameras', 'lenses', 'lighting', 'audio', 'grip']
+
+
+def seed(storage, count):
+    """Synthetic SKUs with research-sized specifications, and two units each"""
+    for i in range(count):
+        brand = BRANDS[i % len(BRANDS)]
+        sku_id = storage.skus.create({
+            'name': f'{brand} Model {i}', 'brand': brand, 'model': f'M{i}',
+            'category': CATEGORIES[i % len(CATEGORIES)],
+            'description': f'{brand} rental item {i} with accessories and carry case. ' * 4,
+            'price_per_day': 500 + i, 'security_deposit': 5000 + i * 10, 'is_active': True,
+            'image_url': f'https://example.com/images/{i}.jpg',
+            'thumbnails': {size: f'/thumbnails/ab/{i:064d}-{size}.webp' for size in ('96', '240', '480')},
+            'specifications': {f'spec_{n}': f'value {n} for {brand} model {i} ' * 3 for n in range(40)},
+        })
+        for unit in range(2):
+            storage.inventory.create({
+                'sku_id': sku_id, 'serial_number': f'SN{i:05d}{unit}', 'status': 'available',
+                'condition': 'good', 'location': 'Warehouse section A, shelf 3',
+                'purchase_price': 100000, 'current_value': 80000,
+                'notes': 'Checked and cleaned after last rental. ' * 3,
+            })
+
+
+def measure(repository, fields, rounds):
+    query_time = serialize_time = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        items = repository.list(fields=fields)
+        query_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        body = to_json_bytes({'success': True, 'items': items})
+        serialize_time += time.perf_counter() - started
+
+    sizes = {'raw': len(body)}
+    for encoding in ('gzip', 'br'):
+        encoded, used = encode_body(body, encoding)
+        sizes[encoding] = len(encoded) if used == encoding else None
+    return len(items), query_time / rounds * 1000, serialize_time / rounds * 1000, sizes
+
+
+def timed(func, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def compare_encoders(items, rounds):
+    """Plain json.dumps(default=str), as the handlers used, vs the response encoder"""
+    payload = {'success': True, 'items': items}
+    baseline = timed(lambda: json.dumps(payload, default=str).encode(), rounds)
+    fast = timed(lambda: to_json_bytes(payload), rounds)
+    return baseline, fast
+
+
+def camel_case_forms(items):
+    """Listing documents re-shaped the way EquipmentForm and extraction send them"""
+    renames = {'price_per_day': 'pricePerDay', 'security_deposit': 'securityDeposit',
+               'serial_number': 'serialNumber', 'purchase_price': 'purchasePrice'}
+    return [{renames.get(key, key): value for key, value in item.items()} for item in items]
+
+
+def format_size(size):
+    return f"{size / 1024:8.1f} KB" if size is not None else "       n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list payload size and serialization time")
+    parser.add_argument('--count', type=int, default=500, help="synthetic SKUs to seed")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--live', action='store_true', help="measure the configured storage instead")
+    args = parser.parse_args()
+
+    temp_path = None
+    if args.live:
+        storage = get_storage()
+    else:
+        from storage_sqlite import SQLiteStorage
+        handle, temp_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        storage = SQLiteStorage(temp_path)
+        seed(storage, args.count)
+
+    try:
+        print(f"{'listing':<22}{'docs':>6}{'query':>10}{'json':>10}{'raw':>12}{'gzip':>12}{'brotli':>12}")
+        for name in ('skus', 'inventory'):
+            repository = getattr(storage, name)
+            for label, fields in (('full', None), ('slim', LIST_FIELDS[name])):
+                count, query_ms, serialize_ms, sizes = measure(repository, fields, args.rounds)
+                print(f"{name + ' (' + label + ')':<22}{count:>6}{query_ms:>8.1f}ms{serialize_ms:>8.1f}ms"
+                      f"{format_size(sizes['raw'])}{format_size(sizes['gzip'])}{format_size(sizes['br'])}")
+
+        encoder = 'orjson' if orjson is not None else 'json (orjson not installed)'
+        print(f"\n{'full listing':<22}{'json.dumps':>12}{encoder:>12}   validation")
+        for name, schema in (('skus', SkuPayload), ('inventory', InventoryPayload)):
+            items = getattr(storage, name).list()
+            baseline, fast = compare_encoders(items, args.rounds)
+            forms = camel_case_forms(items)
+            validation = timed(lambda: [schema.parse(form, partial=True) for form in forms], args.rounds)
+            print(f"{name:<22}{baseline:>10.1f}ms{fast:>10.1f}ms{validation:>10.1f}ms "
+                  f"({validation * 1000 / max(len(items), 1):.1f} µs/doc)")
+    finally:
+        if temp_path:
+            for suffix in ['', '-wal', '-shm']:
+                if os.path.exists(temp_path + suffix):
+                    os.unlink(temp_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark spec extraction on the saved fixture pages: streaming vs whole document
+Each fixture is padded to a multi-megabyte page (reviews, related products and
+inline scripts, as on real retailer pages) and parsed in a fresh process, so
+peak RSS covers lxml's C allocations as well as Python objects
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the api directory to the path to import spec_extract
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from spec_extract import MAX_PAGE_BYTES, SpecExtractor, extract_specs
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'spec_pages')
+CHUNK_SIZE = 64 * 1024
+
+PADDING_BLOCK = (
+    '<div class="review"><h4>Great for run and gun</h4><p>' + 'Sharp, reliable and light. ' * 20 +
+    '</p><ul class="tags"><li>video</li><li>travel</li><li>low light</li></ul></div>\n'
+    '<script>window.__related = ' + json.dumps([{'id': n, 'title': f'Related item {n}'} for n in range(20)]) +
+    ';</script>\n'
+)
+
+
+def padded_page(path, megabytes):
+    """The fixture with padding after the spec markup, as a multi-megabyte page"""
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    blocks = int(megabytes * 1024 * 1024 / len(PADDING_BLOCK))
+    return html.replace('</body>', PADDING_BLOCK * blocks + '</body>').encode()
+
+
+def full_document_specs(data):
+    """Parse the whole page into one tree first, as a BeautifulSoup-style scraper would"""
+    from lxml import html
+    tree = html.document_fromstring(data)
+    extractor = SpecExtractor()
+    for table in tree.iter('table'):
+        extractor._add_table(table)
+    for dl in tree.iter('dl'):
+        extractor._add_definition_list(dl)
+    for script in tree.iter('script'):
+        if (script.get('type') or '').lower() == 'application/ld+json':
+            extractor._add_json_ld(script.text)
+    return extractor.specs
+
+
+def parse(mode, path, max_bytes):
+    with open(path, 'rb') as f:
+        if mode == 'stream':
+            return extract_specs(iter(lambda: f.read(CHUNK_SIZE), b''), max_bytes)
+        return full_document_specs(f.read())
+
+
+def child(mode, path, max_bytes):
+    """Run one parse and print latency, spec count and peak memory as JSON"""
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    specs = parse(mode, path, max_bytes)
+    seconds = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Second pass under tracemalloc (which slows Python code, so it is not timed)
+    tracemalloc.start()
+    parse(mode, path, max_bytes)
+    _, python_peak = tracemalloc.get_traced_memory()
+    print(json.dumps({'seconds': seconds, 'specs': len(specs), 'rss_growth_kb': peak_kb - baseline_kb,
+                      'python_peak_kb': python_peak // 1024}))
+
+
+def run_child(mode, path, max_bytes):
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', mode, path, '--max-bytes', str(max_bytes)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming spec extraction on fixture pages")
+    parser.add_argument('--megabytes', type=float, default=4.0, help="padded page size")
+    parser.add_argument('--max-bytes', type=int, default=MAX_PAGE_BYTES, help="streaming byte cap")
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child[0], args.child[1], args.max_bytes)
+
+    print(f"🔍 Fixture pages padded to {args.megabytes:.1f} MB, streaming cap {args.max_bytes // 1024} KB")
+    print(f"{'page':<22} {'mode':<7} {'specs':>5} {'latency':>10} {'RSS growth':>11} {'Python peak':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for fixture in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+            name = os.path.splitext(os.path.basename(fixture))[0]
+            path = os.path.join(directory, f'{name}.html')
+            with open(path, 'wb') as f:
+                f.write(padded_page(fixture, args.megabytes))
+            for mode in ('full', 'stream'):
+                result = run_child(mode, path, args.max_bytes)
+                print(f"{name:<22} {mode:<7} {result['specs']:>5} {result['seconds'] * 1000:>8.1f}ms "
+                      f"{result['rss_growth_kb'] / 1024:>9.1f}MB {result['python_peak_kb'] / 1024:>10.1f}MB")
+    print("✅ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Offline build script for api/manufacturers.json
+Validates the registry, optionally adds brands found on SKUs (looked up once
+with WebScraper), and bumps the registry version when the content changes
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add the api directory to the path to import the registry helpers
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from manufacturer_registry import REGISTRY_PATH, normalize_brand
+
+REQUIRED_FIELDS = ['name', 'website', 'spec_sites']
+
+
+def validate(manufacturers):
+    """Return a list of problems (missing fields, aliases claimed twice)"""
+    problems = []
+    seen = {}
+    for key, info in manufacturers.items():
+        for field in REQUIRED_FIELDS:
+            if not info.get(field):
+                problems.append(f"{key}: missing {field}")
+        for name in [key, info.get('name', '')] + info.get('aliases', []):
+            normalized = normalize_brand(name)
+            if seen.get(normalized, key) != key:
+                problems.append(f"{key}: alias '{name}' already used by {seen[normalized]}")
+            seen[normalized] = key
+    return problems
+
+
+def canonicalize(manufacturers):
+    """Sort entries and aliases so rebuilds produce stable diffs"""
+    result = {}
+    for key in sorted(manufacturers):
+        info = dict(manufacturers[key])
+        info['aliases'] = sorted(set(info.get('aliases', [])))
+        result[normalize_brand(key)] = info
+    return result
+
+
+def brands_from_skus():
+    """Distinct brand names used by SKUs in Firestore"""
+    from firebase_config import get_firestore_client
+
+    db = get_firestore_client()
+    brands = set()
+    for doc in db.collection('skus').select(['brand']).stream():
+        brand = (doc.to_dict() or {}).get('brand')
+        if brand:
+            brands.add(brand.strip())
+    return brands
+
+
+def lookup_new_brands(manufacturers, brands):
+    """Look up unregistered brands once with WebScraper and add them"""
+    from web_scraper import WebScraper
+
+    known = set()
+    for key, info in manufacturers.items():
+        known.update(normalize_brand(name) for name in [key, info['name']] + info.get('aliases', []))
+
+    scraper = WebScraper()
+    added = []
+    for brand in sorted(brands):
+        if normalize_brand(brand) in known:
+            continue
+        print(f"🔍 Looking up manufacturer info for {brand}")
+        try:
+            info = scraper.get_manufacturer_info(brand) or {}
+        except Exception as e:
+            print(f"⚠️  Lookup failed for {brand}: {str(e)}")
+            continue
+
+        website = info.get('website') or info.get('url') or ''
+        domain = website.split('://')[-1].split('/')[0].replace('www.', '')
+        manufacturers[normalize_brand(brand)] = {
+            'name': info.get('name') or brand,
+            'country': info.get('country'),
+            'founded': info.get('founded'),
+            'website': website,
+            'aliases': [],
+            'spec_sites': [domain] if domain else [],
+        }
+        added.append(brand)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the manufacturer registry")
+    parser.add_argument('--path', default=REGISTRY_PATH, help="Registry file to rebuild")
+    parser.add_argument('--from-skus', action='store_true',
+                        help="Add brands found on Firestore SKUs that are not registered yet")
+    args = parser.parse_args()
+
+    with open(args.path, encoding='utf-8') as f:
+        registry = json.load(f)
+
+    original = canonicalize(registry['manufacturers'])
+    manufacturers = canonicalize(registry['manufacturers'])
+
+    if args.from_skus:
+        added = lookup_new_brands(manufacturers, brands_from_skus())
+        print(f"Added {len(added)} brands: {', '.join(added) or 'none'}")
+        manufacturers = canonicalize(manufacturers)
+
+    problems = validate(manufacturers)
+    if problems:
+        print("❌ Registry is invalid:")
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1)
+
+    if manufacturers == original and manufacturers == registry['manufacturers']:
+        print(f"✅ Registry v{registry['version']} is up to date ({len(manufacturers)} manufacturers)")
+        return
+
+    registry = {
+        'version': registry['version'] + 1,
+        'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'manufacturers': manufacturers,
+    }
+    with open(args.path, 'w', encoding='utf-8') as f:
+        json.dump(registry, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+    print(f"✅ Wrote registry v{registry['version']} with {len(manufacturers)} manufacturers")
+
+
+if __name__ == "__main__":
+    main()
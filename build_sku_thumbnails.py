@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Download SKU product images once and build WebP thumbnails for list views
+Images are fetched concurrently, resized in a process pool, and the thumbnail
+URLs are written back onto each SKU as "thumbnails": {"96": url, ...}
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# Add the api directory to the path to import storage and sku_images
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from http_pool import get_http_client
+from sku_images import (content_hash, get_image_store, make_thumbnails, needs_thumbnails,
+                        thumbnail_key, thumbnail_urls)
+from storage import get_storage
+
+DOWNLOAD_TIMEOUT = 20
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+
+
+def download(url):
+    # The pooled client reuses connections to image hosts shared by many SKUs
+    response = get_http_client().get(url, timeout=DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    if len(response.content) > MAX_IMAGE_BYTES:
+        raise ValueError(f"image is larger than {MAX_IMAGE_BYTES // (1024 * 1024)} MB")
+    return response.content
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build SKU image thumbnails")
+    parser.add_argument('--force', action='store_true', help="rebuild thumbnails for every SKU with an image")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="resize processes")
+    parser.add_argument('--downloads', type=int, default=8, help="concurrent image downloads")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    storage = get_storage()
+    store = get_image_store()
+
+    skus = storage.skus.list()
+    pending = [sku for sku in skus if sku.get('image_url') and (args.force or needs_thumbnails(sku))]
+    print(f"🔍 {len(pending)} of {len(skus)} SKUs need thumbnails")
+    if not pending:
+        return
+
+    # Each distinct URL is downloaded once, however many SKUs share it
+    skus_by_url = {}
+    for sku in pending:
+        skus_by_url.setdefault(sku['image_url'], []).append(sku)
+
+    images = {}  # url -> content hash
+    blobs = {}   # content hash -> image bytes still to resize
+    with ThreadPoolExecutor(max_workers=args.downloads) as pool:
+        futures = {pool.submit(download, url): url for url in skus_by_url}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"❌ Download failed for {url}: {e}")
+                continue
+            digest = content_hash(data)
+            images[url] = digest
+            if args.force or thumbnail_urls(store, digest) is None:
+                blobs[digest] = data
+    print(f"✅ Downloaded {len(images)} images ({len(blobs)} new to resize)")
+
+    failed = set()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(make_thumbnails, data): digest for digest, data in blobs.items()}
+        for future in as_completed(futures):
+            digest = futures[future]
+            try:
+                thumbnails = future.result()
+            except Exception as e:
+                print(f"❌ Could not resize image {digest[:12]}: {e}")
+                failed.add(digest)
+                continue
+            for size, data in thumbnails.items():
+                store.put(thumbnail_key(digest, size), data)
+
+    updated = 0
+    for url, digest in images.items():
+        urls = None if digest in failed else thumbnail_urls(store, digest)
+        if urls is None:
+            continue
+        for sku in skus_by_url[url]:
+            storage.skus.update(sku['id'], {
+                'thumbnails': urls,
+                'thumbnail_source': url,
+                'image_hash': digest,
+            })
+            updated += 1
+
+    print(f"✅ Updated {updated} SKUs in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
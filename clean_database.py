@@ -6,35 +6,27 @@ Wipes all inventory, SKUs, categories, brands but preserves user authentication
 
 import os
 import sys
-import json
-from firebase_admin import firestore
 
-# Add the api directory to the path to import firebase_config
+# Add the api directory to the path to import the storage backends
 api_dir = os.path.join(os.path.dirname(__file__), 'api')
 sys.path.append(api_dir)
 
-from firebase_config import get_firestore_client
+from storage import get_storage
 
-def clean_collection(db, collection_name):
+def clean_collection(storage, collection_name):
     """Delete all documents in a collection"""
     print(f"Cleaning collection: {collection_name}")
     
-    # Get all documents in the collection
-    docs = db.collection(collection_name).stream()
-    
-    deleted_count = 0
-    for doc in docs:
-        doc.reference.delete()
-        deleted_count += 1
+    deleted_count = storage.clear_collection(collection_name)
     
     print(f"Deleted {deleted_count} documents from {collection_name}")
     return deleted_count
 
 def main():
     try:
-        # Initialize Firestore client
-        db = get_firestore_client()
-        print("Connected to Firestore successfully")
+        # Initialize the configured storage backend (STORAGE_BACKEND, default Firestore)
+        storage = get_storage()
+        print(f"Connected to {storage.backend} storage successfully")
         
         # Collections to clean (preserving users and auth data)
         collections_to_clean = [
@@ -54,7 +46,7 @@ def main():
         
         for collection in collections_to_clean:
             try:
-                deleted = clean_collection(db, collection)
+                deleted = clean_collection(storage, collection)
                 total_deleted += deleted
             except Exception as e:
                 print(f"Error cleaning {collection}: {str(e)}")
@@ -0,0 +1,238 @@
+"""
+Shared test helpers: an in-memory Firestore stand-in for the api modules, and a
+local keep-alive HTTP server for the outbound HTTP modules
+"""
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append('api')
+
+_OPERATORS = {
+    '==': lambda a, b: a == b,
+    '<': lambda a, b: a is not None and a < b,
+    '<=': lambda a, b: a is not None and a <= b,
+    '>': lambda a, b: a is not None and a > b,
+    '>=': lambda a, b: a is not None and a >= b,
+}
+
+
+class FakeSnapshot:
+    def __init__(self, ref, data):
+        self.id = ref.id
+        self.reference = ref
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeRef:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+        self.collection_name, self.id = path.rsplit('/', 1)
+
+    @property
+    def _store(self):
+        return self.db.data.setdefault(self.collection_name, {})
+
+    def get(self, transaction=None):
+        return FakeSnapshot(self, self._store.get(self.id))
+
+    def set(self, data, merge=False):
+        if merge and self.id in self._store:
+            self._store[self.id] = _merged(self._store[self.id], data)
+        else:
+            self._store[self.id] = dict(data)
+
+    def update(self, data):
+        self._store[self.id].update(data)
+
+    def delete(self):
+        self._store.pop(self.id, None)
+
+
+def _merged(current, data):
+    merged = dict(current)
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merged(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class FakeQuery:
+    """Filters, ordering, limits and cursors over one collection; every stream() is recorded"""
+
+    def __init__(self, db, name, conditions=(), order=None, count=None, after=None):
+        self.db = db
+        self.name = name
+        self.conditions = list(conditions)
+        self.order = order
+        self.count = count
+        self.after = after
+
+    def _copy(self, **changes):
+        state = dict(conditions=self.conditions, order=self.order, count=self.count, after=self.after)
+        state.update(changes)
+        return FakeQuery(self.db, self.name, **state)
+
+    def where(self, field, op, value):
+        return self._copy(conditions=self.conditions + [(field, op, value)])
+
+    def order_by(self, field):
+        return self._copy(order=field)
+
+    def limit(self, count):
+        return self._copy(count=count)
+
+    def start_after(self, doc):
+        return self._copy(after=doc.id)
+
+    def select(self, fields):
+        return self
+
+    def document(self, doc_id=None):
+        store = self.db.data.setdefault(self.name, {})
+        return FakeRef(self.db, f"{self.name}/{doc_id or f'doc{len(store) + 1}'}")
+
+    def stream(self):
+        self.db.queries.append((self.name, [(field, value) for field, _, value in self.conditions]))
+        fields = {(self.name, field) for field, _, _ in self.conditions}
+        if self.db.failures or self.name in self.db.failing or fields & self.db.failing:
+            self.db.failures = max(self.db.failures - 1, 0)
+            raise RuntimeError("Firestore unavailable")
+
+        items = [(doc_id, data) for doc_id, data in self.db.data.get(self.name, {}).items()
+                 if all(_OPERATORS[op](data.get(field), value) for field, op, value in self.conditions)]
+        if self.order == '__name__':
+            items.sort(key=lambda item: item[0])
+            if self.after is not None:
+                items = [item for item in items if item[0] > self.after]
+        elif self.order is not None:
+            items.sort(key=lambda item: item[1].get(self.order))
+        items = items[:self.count]
+        self.db.pages.append(len(items))
+        return [FakeSnapshot(FakeRef(self.db, f'{self.name}/{doc_id}'), data) for doc_id, data in items]
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, ref, data):
+        self.writes.append((ref, data))
+
+    def commit(self):
+        self.db.commits.append(len(self.writes))
+        for ref, data in self.writes:
+            ref.set(data)
+
+
+class FakeTransaction:
+    """Applies writes directly; there is no contention to retry"""
+
+    def set(self, ref, data, merge=False):
+        ref.set(data, merge=merge)
+
+    def update(self, ref, data):
+        ref.update(data)
+
+
+class FakeDB:
+    """
+    In-memory Firestore: data is {collection: {doc_id: dict}}. Set failures to
+    fail the next N queries, or add a collection name (or a (collection, field)
+    pair) to failing to fail its queries (or those filtering on that field).
+    """
+
+    def __init__(self, data=None, failures=0):
+        self.data = data if data is not None else {}
+        self.failures = failures
+        self.failing = set()
+        self.queries = []  # (collection, [(field, value), ...]) per stream()
+        self.pages = []    # documents returned per stream()
+        self.commits = []  # writes per batch commit
+
+    def collection(self, name):
+        return FakeQuery(self, name)
+
+    def document(self, path):
+        return FakeRef(self, path)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def transaction(self):
+        return FakeTransaction()
+
+
+class LocalServer:
+    """Serves {path: (status, body, content_type, delay)} and records connections and requests"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.connections = 0
+        self.requests = []  # (path, started monotonic time)
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append((self.path, time.monotonic()))
+                status, body, content_type, delay = server.route(self.path)
+                if delay:
+                    time.sleep(delay)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client stopped reading (byte cap or deadline)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+
+    def route(self, path):
+        entry = self.routes.get(path.split('?')[0], (404, b'not found'))
+        status, body = entry[0], entry[1]
+        content_type = entry[2] if len(entry) > 2 else 'text/html; charset=utf-8'
+        delay = entry[3] if len(entry) > 3 else 0
+        if isinstance(body, str):
+            body = body.encode()
+        return status, body, content_type, delay
+
+    def url(self, path, host='127.0.0.1'):
+        return f"http://{host}:{self.port}{path}"
+
+
+@contextmanager
+def local_server(routes):
+    server = LocalServer(routes)
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.httpd.shutdown()
+        server.httpd.server_close()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Nightly depreciation job for inventory current_value
+Loads the fleet into NumPy arrays, carries each recorded value forward along its
+category's depreciation curve in one vectorized pass, and writes back only units
+whose value moved past a threshold
+Schedule nightly, e.g. cron: 0 2 * * * python depreciate_inventory.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Add the api directory to the path to import storage and depreciation
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from depreciation import (CATEGORY_CURVES, CONDITION_FACTORS, SECONDS_PER_YEAR, changed_mask, depreciate,
+                          depreciate_from, to_epoch_seconds)
+from storage import PAGE_SIZE
+
+INVENTORY_FIELDS = ['sku_id', 'purchase_price', 'current_value', 'condition', 'created_at', 'updated_at',
+                    'depreciated_value', 'depreciated_at']
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _column(chunks):
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float64)
+
+
+def valued_at(unit):
+    """
+    When the unit's current_value was recorded. If it is still the value this job
+    last wrote, that is depreciated_at; otherwise someone entered or edited it,
+    at the latest on the unit's last update (or its creation).
+    """
+    if unit.get('depreciated_at') and unit.get('depreciated_value') == unit.get('current_value'):
+        return unit['depreciated_at']
+    return unit.get('updated_at') or unit.get('created_at')
+
+
+def load_fleet(storage, page_size=PAGE_SIZE):
+    """
+    Inventory ids and NumPy columns for purchase price, value, when the value was
+    recorded, age, category and condition, filled page by page so only one page
+    of documents is held at a time
+    """
+    categories = {sku['id']: sku.get('category') for sku in storage.skus.list(fields=['category'], order_by=())}
+    ids, unit_categories, conditions = [], [], []
+    purchase, current, valued, created = [], [], [], []
+    for page in storage.inventory.iter_pages(page_size, fields=INVENTORY_FIELDS):
+        ids.extend(unit['id'] for unit in page)
+        purchase.append(np.array([_number(unit.get('purchase_price')) for unit in page], dtype=np.float64))
+        current.append(np.array([_number(unit.get('current_value')) for unit in page], dtype=np.float64))
+        valued.append(to_epoch_seconds([valued_at(unit) for unit in page]))
+        created.append(to_epoch_seconds([unit.get('created_at') for unit in page]))
+        unit_categories.extend(categories.get(unit.get('sku_id')) for unit in page)
+        conditions.extend(unit.get('condition') for unit in page)
+    return (ids, _column(purchase), _column(current), _column(valued), _column(created),
+            unit_categories, conditions)
+
+
+def revalue(purchase, current, valued, created, categories, conditions, now=None):
+    """
+    New values: recorded values carried forward from when they were recorded;
+    units with no value yet estimated from purchase price, age and condition
+    """
+    carried = depreciate_from(current, valued, categories, purchase, now)
+    estimated = depreciate(purchase, created, categories, conditions, now)
+    return np.where(current > 0, carried, estimated)
+
+
+def synthetic_fleet(count, seed=0):
+    """
+    Random fleet of the given size for benchmarking, as on a typical night: most
+    units were revalued by the previous run, a few were entered in the last week
+    """
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc).timestamp()
+    categories = np.array(list(CATEGORY_CURVES) + ['misc'], dtype=object)
+    conditions = np.array(list(CONDITION_FACTORS), dtype=object)
+    purchase = rng.integers(5_000, 500_000, count).astype(np.float64)
+    created = now - rng.uniform(0, 6 * SECONDS_PER_YEAR, count)
+    recent = rng.random(count) < 0.05
+    created[recent] = now - rng.uniform(0, 7 * 86400, recent.sum())
+    valued = np.where(recent, created, now - 86400)
+    return (
+        [f'unit-{i:07d}' for i in range(count)],
+        purchase,
+        np.round(purchase * rng.uniform(0.3, 1.0, count)),
+        valued,
+        created,
+        categories[rng.integers(0, len(categories), count)],
+        conditions[rng.integers(0, len(conditions), count)],
+    )
+
+
+def seed_storage(storage, count):
+    """Write a synthetic fleet (one SKU per category) into storage for benchmarking"""
+    ids, purchase, current, valued, created, categories, conditions = synthetic_fleet(count)
+    sku_ids = {category: storage.skus.create({'name': f'{category} sample', 'category': category})
+               for category in set(categories)}
+    for i, unit_id in enumerate(ids):
+        unit = {
+            'sku_id': sku_ids[categories[i]],
+            'purchase_price': int(purchase[i]),
+            'current_value': int(current[i]),
+            'condition': conditions[i],
+            'created_at': datetime.fromtimestamp(created[i], timezone.utc),
+        }
+        if valued[i] != created[i]:
+            unit.update(depreciated_value=int(current[i]),
+                        depreciated_at=datetime.fromtimestamp(valued[i], timezone.utc))
+        storage.inventory.create(unit, doc_id=unit_id)
+
+
+def run(storage, min_change, dry_run=False):
+    """Load, depreciate and write back the fleet, reporting the time of each step"""
+    started = time.perf_counter()
+    ids, purchase, current, valued, created, categories, conditions = load_fleet(storage)
+    loaded = time.perf_counter()
+    print(f"🔍 Loaded {len(ids)} units in {loaded - started:.2f}s")
+
+    now = datetime.now(timezone.utc)
+    values = revalue(purchase, current, valued, created, categories, conditions, now)
+    changed = np.flatnonzero(changed_mask(current, values, min_change))
+    computed = time.perf_counter()
+    print(f"✅ Depreciated {len(ids)} units in {(computed - loaded) * 1000:.1f} ms; {len(changed)} changed")
+
+    fleet_value = np.nansum(values)
+    print(f"Fleet value: ₹{fleet_value:,.0f} (was ₹{np.nansum(current):,.0f})")
+
+    if not dry_run and len(changed):
+        updates = {ids[i]: {'current_value': int(values[i]), 'depreciated_value': int(values[i]),
+                            'depreciated_at': now}
+                   for i in changed}
+        written = storage.inventory.update_many(updates)
+        print(f"✅ Wrote {written} units in {time.perf_counter() - computed:.2f}s")
+    print(f"Total {time.perf_counter() - started:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Depreciate inventory current_value along category curves")
+    parser.add_argument('--min-change', type=float, default=100.0,
+                        help="only write units whose value moves by more than this many rupees")
+    parser.add_argument('--dry-run', action='store_true', help="compute and report without writing")
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help="run the whole job (load, compute, write) on N synthetic units "
+                             "(e.g. 100000) in a temporary SQLite database instead")
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        from storage import get_storage
+        run(get_storage(), args.min_change, args.dry_run)
+        return
+
+    from storage_sqlite import SQLiteStorage
+    handle, temp_path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        storage = SQLiteStorage(temp_path)
+        started = time.perf_counter()
+        seed_storage(storage, args.benchmark)
+        print(f"Seeded {args.benchmark} synthetic units in {time.perf_counter() - started:.1f}s")
+        run(storage, args.min_change, args.dry_run)
+    finally:
+        for suffix in ['', '-wal', '-shm']:
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Generate missing Firestore composite indexes from observed query shapes
+Reads query_shapes.json and/or logs containing QUERY_SHAPE lines (printed by the
+listing query planner) and prints or writes the index definitions still missing
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add the api directory to the path to import the query planner
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from query_planner import INDEXES_PATH, load_indexes, missing_index_definitions
+
+DEFAULT_SHAPES = os.path.join(os.path.dirname(__file__), 'query_shapes.json')
+
+
+def read_shapes(path):
+    """Load shapes from a JSON list, JSON lines, or a log with QUERY_SHAPE lines"""
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+
+    if content.lstrip().startswith('['):
+        return json.loads(content)
+
+    shapes = []
+    for line in content.splitlines():
+        if 'QUERY_SHAPE ' in line:
+            line = line.split('QUERY_SHAPE ', 1)[1]
+        line = line.strip()
+        if line.startswith('{'):
+            try:
+                shapes.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return shapes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate missing Firestore index definitions")
+    parser.add_argument('sources', nargs='*', default=[DEFAULT_SHAPES],
+                        help="Shape files or exported function logs (default: query_shapes.json)")
+    parser.add_argument('--indexes', default=INDEXES_PATH, help="firestore.indexes.json to check against")
+    parser.add_argument('--write', action='store_true', help="Append the missing definitions to the indexes file")
+    args = parser.parse_args()
+
+    shapes = []
+    for source in args.sources:
+        shapes.extend(read_shapes(source))
+
+    # De-duplicate while keeping first-seen order
+    unique = {}
+    for shape in shapes:
+        key = json.dumps(shape, sort_keys=True)
+        unique.setdefault(key, shape)
+    shapes = list(unique.values())
+
+    definitions = missing_index_definitions(shapes, os.path.abspath(args.indexes))
+    print(f"Checked {len(shapes)} query shapes against {args.indexes}")
+
+    if not definitions:
+        print("✅ Every observed query shape is served by a declared index")
+        return
+
+    print(f"⚠️  {len(definitions)} composite indexes missing:")
+    print(json.dumps(definitions, indent=2))
+
+    if args.write:
+        with open(args.indexes, encoding='utf-8') as f:
+            config = json.load(f)
+        config['indexes'].extend(definitions)
+        with open(args.indexes, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2)
+            f.write('\n')
+        load_indexes.cache_clear()
+        print(f"✅ Added {len(definitions)} indexes to {args.indexes} (deploy with: firebase deploy --only firestore:indexes)")
+
+
+if __name__ == "__main__":
+    main()
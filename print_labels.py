@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Print barcode label sheets for inventory units
+Selects units by id or by created_at range and streams Code128 or QR label
+sheets to a PDF, rendering pages in a process pool
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the api directory to the path to import storage and label_sheets
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from dates import to_datetime
+from label_sheets import SYMBOLOGIES, select_units, write_label_sheets
+from storage import get_storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate barcode label sheets as a PDF")
+    parser.add_argument('--ids', help="comma-separated inventory ids")
+    parser.add_argument('--from', dest='created_from', help="first creation date (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='created_to', help="last creation date, inclusive (YYYY-MM-DD)")
+    parser.add_argument('--symbology', choices=SYMBOLOGIES, default='code128')
+    parser.add_argument('--output', default='labels.pdf')
+    parser.add_argument('--workers', type=int, default=None, help="render processes (0 = in-process)")
+    args = parser.parse_args()
+
+    if not args.ids and not (args.created_from or args.created_to):
+        parser.error("pass --ids or a --from/--to creation date range")
+
+    try:
+        created_from = to_datetime(args.created_from)
+        created_to = to_datetime(args.created_to, end=True)
+    except ValueError as e:
+        parser.error(f"invalid date: {e}")
+
+    started = time.perf_counter()
+    storage = get_storage()
+    ids = [doc_id.strip() for doc_id in (args.ids or '').split(',') if doc_id.strip()]
+    labels = select_units(storage, ids=ids or None, created_from=created_from, created_to=created_to,
+                          symbology=args.symbology)
+    if not labels:
+        print("⚠️  No matching inventory units")
+        return
+
+    fallbacks = [code for code, _, symbology in labels if symbology != args.symbology]
+    if fallbacks:
+        print(f"⚠️  {len(fallbacks)} codes cannot be encoded as Code128 and print as QR: {', '.join(fallbacks)}")
+
+    with open(args.output, 'wb') as out:
+        pages = write_label_sheets(labels, out, symbology=args.symbology, workers=args.workers)
+    print(f"✅ Wrote {len(labels)} labels on {pages} sheets to {args.output} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
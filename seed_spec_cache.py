@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Seed the spec_cache collection from specifications already stored on SKUs
+Repeat models are then served from the cache instead of being scraped again
+"""
+
+import os
+import sys
+
+# Add the api directory to the path to import firebase_config and spec_cache
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from firebase_config import get_firestore_client
+from spec_cache import SpecCache
+
+
+def main():
+    try:
+        db = get_firestore_client()
+        print("Connected to Firestore successfully")
+
+        cache = SpecCache(db=db)
+        skus = (
+            doc.to_dict() or {}
+            for doc in db.collection('skus').select(['brand', 'model', 'specifications']).stream()
+        )
+
+        print("\n🌱 Seeding spec cache from SKUs...")
+        seeded = cache.seed_from_skus(skus)
+        print(f"✅ Seeded {seeded} models into spec_cache")
+
+    except Exception as e:
+        print(f"❌ Error while seeding spec cache: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Snapshot and restore Firestore collections for Camorent Inventory
+Copies collections out to gzip NDJSON shards with a manifest, concurrently, and
+restores them with parallel batched writes (e.g. to reseed staging or roll back
+a bad import). Memory stays bounded by the page and batch size.
+
+  python snapshot_database.py snapshot snapshots/2026-10-19
+  python snapshot_database.py restore snapshots/2026-10-19 --clear
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add the api directory to the path to import firebase_config and snapshots
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from snapshots import (DEFAULT_COLLECTIONS, SHARD_SIZE, load_manifest, restore_shard, snapshot_collection,
+                       verify_shard, write_manifest)
+
+
+def report(name, documents, size, seconds):
+    rate = documents / seconds if seconds else 0.0
+    megabytes = size / (1024 * 1024)
+    print(f"✅ {name:<14} {documents:>8} docs  {megabytes:8.2f} MB  {seconds:7.2f}s  {rate:9.0f} docs/s")
+
+
+def snapshot(db, directory, collections, workers, shard_size):
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(os.path.join(directory, 'manifest.json')):
+        raise SystemExit(f"❌ {directory} already holds a snapshot; choose a new directory")
+
+    started = time.perf_counter()
+    entries = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(snapshot_collection, db, name, directory, shard_size): name for name in collections}
+        for future in as_completed(futures):
+            name = futures[future]
+            entries[name] = future.result()
+            report(name, entries[name]['documents'], entries[name]['bytes'], entries[name]['seconds'])
+
+    write_manifest(directory, {name: entries[name] for name in collections})
+    total = sum(entry['documents'] for entry in entries.values())
+    print(f"Snapshot of {total} documents written to {directory} in {time.perf_counter() - started:.1f}s")
+
+
+def restore(db, directory, collections, workers, clear):
+    manifest = load_manifest(directory)
+    selected = [name for name in (collections or manifest['collections']) if name in manifest['collections']]
+    missing = set(collections or []) - set(selected)
+    if missing:
+        print(f"⚠️  Not in snapshot, skipped: {', '.join(sorted(missing))}")
+
+    # Check every selected shard before anything is cleared or written, so a corrupt
+    # or truncated snapshot cannot leave a collection emptied and half restored
+    shards = [shard for name in selected for shard in manifest['collections'][name]['shards']]
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(verify_shard, directory, shard) for shard in shards]):
+            try:
+                future.result()
+            except ValueError as e:
+                errors.append(str(e))
+    if errors:
+        raise SystemExit("❌ Snapshot failed verification; nothing was cleared or restored:\n  " +
+                         "\n  ".join(sorted(errors)))
+    print(f"Verified {len(shards)} shards")
+
+    if clear:
+        from storage_firestore import FirestoreStorage
+        storage = FirestoreStorage(db)
+        for name in selected:
+            print(f"Cleared {storage.clear_collection(name)} documents from {name}")
+
+    started = time.perf_counter()
+    progress = {name: {'documents': 0, 'bytes': 0, 'shards': len(manifest['collections'][name]['shards'])}
+                for name in selected}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for name in selected:
+            for shard in manifest['collections'][name]['shards']:
+                futures[pool.submit(restore_shard, db, name, directory, shard)] = (name, shard)
+
+        for future in as_completed(futures):
+            name, shard = futures[future]
+            entry = progress[name]
+            entry['documents'] += future.result()
+            entry['bytes'] += shard['bytes']
+            entry['shards'] -= 1
+            if entry['shards'] == 0:
+                report(name, entry['documents'], entry['bytes'], time.perf_counter() - started)
+
+    total = sum(entry['documents'] for entry in progress.values())
+    print(f"Restored {total} documents from {directory} in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot or restore Firestore collections")
+    parser.add_argument('command', choices=['snapshot', 'restore'])
+    parser.add_argument('directory', help="snapshot directory")
+    parser.add_argument('--collections', help=f"comma-separated (default: {','.join(DEFAULT_COLLECTIONS)})")
+    parser.add_argument('--workers', type=int, default=8, help="collections or shards processed concurrently")
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE, help="documents per shard file")
+    parser.add_argument('--clear', action='store_true', help="empty each collection before restoring it")
+    args = parser.parse_args()
+
+    collections = [name.strip() for name in (args.collections or '').split(',') if name.strip()]
+
+    from firebase_config import get_firestore_client
+    db = get_firestore_client()
+    print("Connected to Firestore successfully")
+
+    if args.command == 'snapshot':
+        snapshot(db, args.directory, collections or DEFAULT_COLLECTIONS, args.workers, args.shard_size)
+    else:
+        restore(db, args.directory, collections, args.workers, args.clear)
+
+
+if __name__ == "__main__":
+    main()
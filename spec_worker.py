@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Spec-research worker for Camorent Inventory
+Drains the Firestore jobs collection: leases a job, researches specs through the
+spec cache and concurrent web research, and writes the result back to the linked SKU
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+
+# Add the api directory to the path to import firebase_config and job helpers
+api_dir = os.path.join(os.path.dirname(__file__), 'api')
+sys.path.append(api_dir)
+
+from firebase_config import get_firestore_client
+from spec_cache import SpecCache
+from spec_jobs import LeaseHeartbeat, complete_job, fail_job, lease_next_job
+from spec_research import get_spec_researcher
+
+
+def run_job(db, cache, scraper, job):
+    """Research one job and record success or failure"""
+    try:
+        # Keep the lease alive while researching; slow scrapes can outlast it
+        with LeaseHeartbeat(db, job):
+            specs = cache.search_equipment_specs(scraper, job['brand'], job['model'])
+        completed = complete_job(db, job, specs or {})
+    except Exception as e:
+        if fail_job(db, job, e):
+            print(f"❌ {job['brand']} {job['model']} (attempt {job['attempts']}): {str(e)}")
+        else:
+            print(f"⚠️  {job['brand']} {job['model']}: lease lost, failure not recorded")
+        return
+
+    if completed:
+        print(f"✅ {job['brand']} {job['model']}: {len(specs or {})} specs")
+    else:
+        print(f"⚠️  {job['brand']} {job['model']}: lease lost, result discarded")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drain spec-research jobs")
+    parser.add_argument('--once', action='store_true', help="Exit when the queue is empty")
+    parser.add_argument('--max-jobs', type=int, default=0, help="Stop after this many jobs (0 = no limit)")
+    parser.add_argument('--poll-interval', type=float, default=5.0, help="Seconds to wait when idle")
+    args = parser.parse_args()
+
+    db = get_firestore_client()
+    cache = SpecCache(db=db)
+    scraper = get_spec_researcher()
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    print(f"Spec worker {worker_id} connected to Firestore")
+
+    processed = 0
+    while not args.max_jobs or processed < args.max_jobs:
+        job = lease_next_job(db, worker_id)
+        if job is None:
+            if args.once:
+                break
+            time.sleep(args.poll_interval)
+            continue
+
+        run_job(db, cache, scraper, job)
+        processed += 1
+
+    print(f"Processed {processed} jobs (cache hits: {cache.hits}, misses: {cache.misses})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,36 @@
-import React from 'react';
+import React, { useEffect } from 'react';
 import { Outlet, useNavigate } from 'react-router-dom';
 import { SignOut } from 'phosphor-react';
 import BottomTabBar from './BottomTabBar';
 import { useAuth } from '../contexts/AuthContext';
+import { networkUtils, offlineStorage } from '../utils/api';
 
 const Layout: React.FC = () => {
   const { logout } = useAuth();
   const navigate = useNavigate();
 
+  // Replay items added while offline, now and whenever the connection returns
+  useEffect(() => {
+    const syncQueuedForms = () => {
+      offlineStorage.syncQueuedForms()
+        .then(({ synced, remaining }) => {
+          if (synced || remaining) {
+            console.log(`Synced ${synced} offline items, ${remaining} still queued`);
+          }
+        })
+        .catch((error) => console.warn('Offline sync failed:', error));
+    };
+
+    if (networkUtils.isOnline()) {
+      syncQueuedForms();
+    }
+    return networkUtils.onNetworkChange((isOnline) => {
+      if (isOnline) {
+        syncQueuedForms();
+      }
+    });
+  }, []);
+
   const handleLogout = async () => {
     try {
       await logout();
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { X, Check, CircleNotch } from 'phosphor-react';
-import { api } from '../utils/api';
+import { api, RecordingSession } from '../utils/api';
 
 interface ProcessingStep {
   id: string;
@@ -14,13 +14,15 @@ interface ProcessingModalProps {
   onCancel: () => void;
   onComplete: (data: any) => void;
   audioBlob: Blob | null;
+  audioSession?: RecordingSession | null;
 }
 
 const ProcessingModal: React.FC<ProcessingModalProps> = ({
   isOpen,
   onCancel,
   onComplete,
-  audioBlob
+  audioBlob,
+  audioSession
 }) => {
   const [steps, setSteps] = useState<ProcessingStep[]>([
     {
@@ -83,26 +85,24 @@ const ProcessingModal: React.FC<ProcessingModalProps> = ({
       // Check if this is a test/dummy blob
       const isDummyBlob = audioBlob.size <= 20; // Dummy blob is very small
       
+      // Identical in-flight requests (double taps, retries) are coalesced by the api layer
       let response;
       if (isDummyBlob) {
-        // Use sample data for testing
-        response = await fetch('/api/process-audio', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ sample: true }),
-        });
+        response = await api.processSampleAudio(); // Use sample data for testing
       } else {
-        // Send the actual audio blob to the API
-        const formData = new FormData();
-        formData.append('audio', audioBlob, 'recording.webm');
-        
-        response = await fetch('/api/process-audio', {
-          method: 'POST',
-          body: formData,
-        });
+        // Segments were transcribed while recording, so only the tail is left;
+        // if any segment upload failed, the whole recording is processed instead
+        response = audioSession ? await api.finishAudioSession(audioSession) : null;
+        if (!response || !response.success) {
+          response = await api.processAudio(audioBlob);
+        }
       }
-      
-      const result = await response.json();
+
+      if (!response.success) {
+        throw new Error(response.error || 'Processing failed');
+      }
+
+      const result = response.data;
       
       if (result.processing_status === 'error') {
         throw new Error(result.error || 'Processing failed');
@@ -1,13 +1,41 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { Microphone, Stop, Play, X } from 'phosphor-react';
+import { api, RecordingSession } from '../utils/api';
 
 interface VoiceRecorderProps {
-  onRecordingComplete: (audioBlob: Blob) => void;
+  onRecordingComplete: (audioBlob: Blob, session?: RecordingSession) => void;
   onCancel: () => void;
 }
 
 type RecordingState = 'idle' | 'recording' | 'stopped' | 'playing';
 
+interface SegmentRecorder {
+  recorder: MediaRecorder;
+  done: Promise<Blob>;
+}
+
+const SEGMENT_SECONDS = 15;
+
+// Timeslice chunks after the first lack the WebM header, so each segment gets its
+// own recorder on the shared stream and is a complete file the server can transcribe
+const recordSegment = (stream: MediaStream): SegmentRecorder => {
+  const recorder = new MediaRecorder(stream, { mimeType: 'audio/webm;codecs=opus' });
+  const chunks: Blob[] = [];
+  recorder.ondataavailable = (event) => {
+    if (event.data.size > 0) {
+      chunks.push(event.data);
+    }
+  };
+  const done = new Promise<Blob>(resolve => {
+    recorder.onstop = () => resolve(new Blob(chunks, { type: 'audio/webm' }));
+  });
+  recorder.start();
+  return { recorder, done };
+};
+
+const newSessionId = () =>
+  `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+
 const VoiceRecorder: React.FC<VoiceRecorderProps> = ({ onRecordingComplete, onCancel }) => {
   const [recordingState, setRecordingState] = useState<RecordingState>('idle');
   const [duration, setDuration] = useState(0);
@@ -16,6 +44,9 @@ const VoiceRecorder: React.FC<VoiceRecorderProps> = ({ onRecordingComplete, onCa
   const mediaRecorderRef = useRef<MediaRecorder | null>(null);
   const audioChunksRef = useRef<Blob[]>([]);
   const timerRef = useRef<NodeJS.Timeout | null>(null);
+  const sessionRef = useRef<RecordingSession | null>(null);
+  const segmentRef = useRef<SegmentRecorder | null>(null);
+  const segmentTimerRef = useRef<NodeJS.Timeout | null>(null);
   const audioRef = useRef<HTMLAudioElement | null>(null);
 
   const MAX_DURATION = 120; // 2 minutes in seconds
@@ -25,6 +56,9 @@ const VoiceRecorder: React.FC<VoiceRecorderProps> = ({ onRecordingComplete, onCa
       if (timerRef.current) {
         clearInterval(timerRef.current);
       }
+      if (segmentTimerRef.current) {
+        clearInterval(segmentTimerRef.current);
+      }
       if (audioURL) {
         URL.revokeObjectURL(audioURL);
       }
@@ -67,6 +101,21 @@ const VoiceRecorder: React.FC<VoiceRecorderProps> = ({ onRecordingComplete, onCa
       
       mediaRecorderRef.current = mediaRecorder;
       mediaRecorder.start();
+
+      // Upload a segment every SEGMENT_SECONDS so transcription runs while recording;
+      // the full recording above is kept for playback and as a fallback
+      const session: RecordingSession = { id: newSessionId(), uploads: [], tail: null };
+      sessionRef.current = session;
+      segmentRef.current = recordSegment(stream);
+      segmentTimerRef.current = setInterval(() => {
+        const segment = segmentRef.current;
+        if (!segment) return;
+        const seq = session.uploads.length;
+        session.uploads.push(segment.done.then(blob => api.uploadAudioSegment(session.id, seq, blob)));
+        segment.recorder.stop();
+        segmentRef.current = recordSegment(stream);
+      }, SEGMENT_SECONDS * 1000);
+
       setRecordingState('recording');
       setDuration(0);
       
@@ -89,6 +138,15 @@ const VoiceRecorder: React.FC<VoiceRecorderProps> = ({ onRecordingComplete, onCa
 
   const stopRecording = () => {
     if (mediaRecorderRef.current && recordingState === 'recording') {
+      if (segmentTimerRef.current) {
+        clearInterval(segmentTimerRef.current);
+        segmentTimerRef.current = null;
+      }
+      if (segmentRef.current && sessionRef.current) {
+        sessionRef.current.tail = segmentRef.current.done;
+        segmentRef.current.recorder.stop();
+        segmentRef.current = null;
+      }
       mediaRecorderRef.current.stop();
       setRecordingState('stopped');
       
@@ -115,6 +173,8 @@ const VoiceRecorder: React.FC<VoiceRecorderProps> = ({ onRecordingComplete, onCa
       URL.revokeObjectURL(audioURL);
       setAudioURL('');
     }
+    // Segments already uploaded for the discarded take expire on the server
+    sessionRef.current = null;
     setDuration(0);
     setRecordingState('idle');
   };
@@ -122,7 +182,7 @@ const VoiceRecorder: React.FC<VoiceRecorderProps> = ({ onRecordingComplete, onCa
   const handleComplete = () => {
     if (audioChunksRef.current.length > 0) {
       const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/webm' });
-      onRecordingComplete(audioBlob);
+      onRecordingComplete(audioBlob, sessionRef.current || undefined);
     }
   };
 
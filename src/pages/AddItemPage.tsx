@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
-import { api } from '../utils/api';
+import { api, networkUtils, offlineStorage, RecordingSession } from '../utils/api';
 import VoiceRecorder from '../components/VoiceRecorder';
 import ProcessingModal from '../components/ProcessingModal';
 import EquipmentForm from '../components/EquipmentForm';
@@ -11,12 +11,14 @@ type PageState = 'recording' | 'processing' | 'form';
 const AddItemPage: React.FC = () => {
   const [pageState, setPageState] = useState<PageState>('recording');
   const [audioBlob, setAudioBlob] = useState<Blob | null>(null);
+  const [audioSession, setAudioSession] = useState<RecordingSession | null>(null);
   const [extractedData, setExtractedData] = useState<any>(null);
   const [confidenceScores, setConfidenceScores] = useState<any>(null);
   const [saving, setSaving] = useState(false);
   const navigate = useNavigate();
 
-  const handleRecordingComplete = (blob: Blob) => {
+  const handleRecordingComplete = (blob: Blob, session?: RecordingSession) => {
+    setAudioSession(session || null);
     setAudioBlob(blob);
     setPageState('processing');
   };
@@ -31,6 +33,7 @@ const AddItemPage: React.FC = () => {
   const handleProcessingCancel = () => {
     setPageState('recording');
     setAudioBlob(null);
+    setAudioSession(null);
     setExtractedData(null);
     setConfidenceScores(null);
   };
@@ -43,11 +46,21 @@ const AddItemPage: React.FC = () => {
         throw new Error('User not authenticated');
       }
 
-      // Save to Firebase via API endpoint
-      const response = await api.createInventoryItem({
+      const item = {
         ...formData,
         created_by: user.uid
-      });
+      };
+
+      // Offline: keep the item on this device; Layout syncs it when back online
+      if (!networkUtils.isOnline()) {
+        await offlineStorage.queueForm(item);
+        alert('You are offline. The item was saved on this device and will sync when you reconnect.');
+        navigate('/inventory');
+        return;
+      }
+
+      // Save to Firebase via API endpoint
+      const response = await api.createInventoryItem(item);
 
       if (!response.success) {
         throw new Error(response.error || 'Failed to save equipment');
@@ -68,6 +81,7 @@ const AddItemPage: React.FC = () => {
   const handleFormCancel = () => {
     setPageState('recording');
     setAudioBlob(null);
+    setAudioSession(null);
     setExtractedData(null);
     setConfidenceScores(null);
   };
@@ -226,6 +240,7 @@ const AddItemPage: React.FC = () => {
         onCancel={handleProcessingCancel}
         onComplete={handleProcessingComplete}
         audioBlob={audioBlob}
+        audioSession={audioSession}
       />
     </>
   );
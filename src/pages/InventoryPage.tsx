@@ -1,6 +1,7 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { MagnifyingGlass, Funnel, Package } from 'phosphor-react';
 import { api } from '../utils/api';
+import { localCatalog } from '../utils/localCatalog';
 
 interface InventoryItem {
   id: string;
@@ -24,46 +25,120 @@ const InventoryPage: React.FC = () => {
   const [skus, setSkus] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [statusFilter, setStatusFilter] = useState<string | null>(null);
+  const [categoryFilter, setCategoryFilter] = useState<string | null>(null);
+  const [showFilters, setShowFilters] = useState(false);
+  const [stats, setStats] = useState({ total: 0, available: 0, booked: 0 });
+  const [categories, setCategories] = useState<string[]>([]);
+  const [snapshotVersion, setSnapshotVersion] = useState(0);
+
+  // The latest full list, and whether the IndexedDB snapshot holds exactly that list
+  const itemsRef = useRef<any[]>([]);
+  const indexedRef = useRef(false);
 
   useEffect(() => {
     fetchData();
   }, []);
 
+  useEffect(() => {
+    let cancelled = false;
+    loadView(statusFilter, categoryFilter).then((view) => {
+      if (!cancelled) {
+        setInventoryItems(view.items.map(toInventoryItem));
+        setStats(view.stats);
+      }
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [statusFilter, categoryFilter, snapshotVersion]);
+
+  // Transform Firebase data to match component interface
+  const toInventoryItem = (item: any): InventoryItem => ({
+    id: item.id,
+    sku_id: item.sku_id,
+    serial_number: item.serial_number || '',
+    condition: item.condition || 'good',
+    status: item.status || 'available',
+    location: item.location || '',
+    notes: item.notes || '',
+    created_at: item.created_at,
+    // Include SKU data if available
+    name: item.sku?.name || item.name,
+    brand: item.sku?.brand || item.brand,
+    model: item.sku?.model || item.model,
+    category: item.sku?.category || item.category
+  });
+
+  const statusOf = (item: any) => item.status || 'available';
+  const categoryOf = (item: any) => item.sku?.category || item.category;
+
+  // Filtered views and stats come from the snapshot's category and status indexes;
+  // if the snapshot could not be written, the latest list is filtered in memory
+  const loadView = async (status: string | null, category: string | null) => {
+    const items = itemsRef.current;
+    if (!indexedRef.current) {
+      const count = (value: string) => items.filter(item => statusOf(item) === value).length;
+      return {
+        items: items.filter(item =>
+          (!status || statusOf(item) === status) && (!category || categoryOf(item) === category)
+        ),
+        stats: { total: items.length, available: count('available'), booked: count('booked') }
+      };
+    }
+
+    const [matching, [available, booked]] = await Promise.all([
+      category
+        ? localCatalog.getByIndex<any>('inventory', 'category', category)
+        : status
+          ? localCatalog.getByIndex<any>('inventory', 'status', status)
+          : Promise.resolve(items),
+      localCatalog.countByIndex('inventory', 'status', ['available', 'booked'])
+    ]);
+    return {
+      items: category && status ? matching.filter(item => statusOf(item) === status) : matching,
+      stats: { total: items.length, available, booked }
+    };
+  };
+
+  const showSnapshot = (items: any[], indexed: boolean) => {
+    itemsRef.current = items;
+    indexedRef.current = indexed;
+    setCategories(Array.from(new Set(items.map(categoryOf).filter(Boolean))).sort());
+    setSnapshotVersion(version => version + 1);
+  };
+
   const fetchData = async () => {
-    try {
+    setError(null);
+
+    // Get inventory items from Firebase via API, revalidating the local snapshot
+    const request = api.getInventory();
+
+    // Render the local snapshot immediately while the request is in flight
+    const cachedItems = await localCatalog.getAll<any>('inventory');
+    if (cachedItems.length > 0) {
+      showSnapshot(cachedItems, true);
+      setLoading(false);
+    } else {
       setLoading(true);
-      setError(null);
-      
-      // Get inventory items from Firebase via API
-      const response = await api.getInventory();
+    }
+
+    try {
+      const response = await request;
       
       if (!response.success) {
         throw new Error(response.error || 'Failed to load inventory');
       }
       
-      // Transform Firebase data to match component interface
       const items = response.data?.items || [];
-      const transformedItems = items.map((item: any) => ({
-        id: item.id,
-        sku_id: item.sku_id,
-        serial_number: item.serial_number || '',
-        condition: item.condition || 'good',
-        status: item.status || 'available',
-        location: item.location || '',
-        notes: item.notes || '',
-        created_at: item.created_at,
-        // Include SKU data if available
-        name: item.sku?.name || item.name,
-        brand: item.sku?.brand || item.brand,
-        model: item.sku?.model || item.model,
-        category: item.sku?.category || item.category
-      }));
-      
-      setInventoryItems(transformedItems);
+      showSnapshot(items, await localCatalog.replaceAll('inventory', items));
       setLoading(false);
     } catch (error) {
       console.error('Error fetching inventory:', error);
-      setError('Failed to load inventory');
+      // Keep showing the cached snapshot when offline
+      if (cachedItems.length === 0) {
+        setError('Failed to load inventory');
+      }
       setLoading(false);
     }
   };
@@ -109,30 +184,57 @@ const InventoryPage: React.FC = () => {
               className="input-primary w-full pl-10"
             />
           </div>
-          <button className="btn-secondary flex items-center gap-2 px-4">
+          <button
+            onClick={() => setShowFilters(!showFilters)}
+            className="btn-secondary flex items-center gap-2 px-4"
+          >
             <Funnel size={16} />
             Filter
           </button>
         </div>
 
-        {/* Stats */}
+        {/* Category Filter */}
+        {showFilters && (
+          <div className="flex gap-2 overflow-x-auto pb-2 mb-4">
+            {[null, ...categories].map((category) => (
+              <button
+                key={category || 'all'}
+                onClick={() => setCategoryFilter(category)}
+                className={`px-4 py-2 rounded-button whitespace-nowrap transition-colors text-sm font-medium capitalize ${
+                  categoryFilter === category
+                    ? 'bg-accent text-white'
+                    : 'bg-gray-light text-gray-medium hover:bg-gray-200'
+                }`}
+              >
+                {category || 'All'}
+              </button>
+            ))}
+          </div>
+        )}
+
+        {/* Stats (tap Available or Booked to filter by status) */}
         <div className="grid grid-cols-3 gap-3 mb-6">
-          <div className="bg-gray-light rounded-card p-3 text-center">
-            <p className="text-2xl font-bold text-primary">{inventoryItems.length}</p>
+          <button
+            onClick={() => setStatusFilter(null)}
+            className={`bg-gray-light rounded-card p-3 text-center ${statusFilter === null ? 'ring-2 ring-accent' : ''}`}
+          >
+            <p className="text-2xl font-bold text-primary">{stats.total}</p>
             <p className="text-xs text-gray-medium">Total Items</p>
-          </div>
-          <div className="bg-green-50 rounded-card p-3 text-center">
-            <p className="text-2xl font-bold text-green-600">
-              {inventoryItems.filter(item => item.status === 'available').length}
-            </p>
+          </button>
+          <button
+            onClick={() => setStatusFilter(statusFilter === 'available' ? null : 'available')}
+            className={`bg-green-50 rounded-card p-3 text-center ${statusFilter === 'available' ? 'ring-2 ring-green-500' : ''}`}
+          >
+            <p className="text-2xl font-bold text-green-600">{stats.available}</p>
             <p className="text-xs text-gray-medium">Available</p>
-          </div>
-          <div className="bg-yellow-50 rounded-card p-3 text-center">
-            <p className="text-2xl font-bold text-yellow-600">
-              {inventoryItems.filter(item => item.status === 'booked').length}
-            </p>
+          </button>
+          <button
+            onClick={() => setStatusFilter(statusFilter === 'booked' ? null : 'booked')}
+            className={`bg-yellow-50 rounded-card p-3 text-center ${statusFilter === 'booked' ? 'ring-2 ring-yellow-500' : ''}`}
+          >
+            <p className="text-2xl font-bold text-yellow-600">{stats.booked}</p>
             <p className="text-xs text-gray-medium">Booked</p>
-          </div>
+          </button>
         </div>
       </div>
 
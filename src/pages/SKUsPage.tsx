@@ -1,6 +1,7 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { MagnifyingGlass, Package, Camera, Lightbulb, Headphones } from 'phosphor-react';
 import { api } from '../utils/api';
+import { localCatalog } from '../utils/localCatalog';
 
 interface SKU {
   id: string;
@@ -13,19 +14,34 @@ interface SKU {
   price_per_day: number;
   security_deposit: number;
   image_url: string;
+  thumbnails?: Record<string, string>;
   is_active: boolean;
   created_at: any;
   inventoryCount?: number;
 }
 
+// Pre-sized WebP thumbnails; never the full-size image_url in lists. Keys are the
+// longest edge, which is what fills a square object-contain box whatever the
+// orientation, so each thumbnail's density is its key over the box size.
+const THUMBNAIL_BOX = 40;
+
+const thumbnailSrcSet = (thumbnails: Record<string, string>) =>
+  Object.entries(thumbnails)
+    .map(([size, url]) => `${url} ${Number(size) / THUMBNAIL_BOX}x`)
+    .join(', ');
+
 const SKUsPage: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedCategory, setSelectedCategory] = useState('all');
   const [skus, setSkus] = useState<SKU[]>([]);
   const [inventoryItems, setInventoryItems] = useState<any[]>([]);
+  const [visibleSkus, setVisibleSkus] = useState<SKU[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
+  // Whether the IndexedDB snapshot holds exactly the SKUs and units shown
+  const indexedRef = useRef(false);
+
   const categories = [
     { id: 'all', name: 'All', icon: Package },
     { id: 'cameras', name: 'Cameras', icon: Camera },
@@ -38,16 +54,73 @@ const SKUsPage: React.FC = () => {
     fetchData();
   }, []);
 
+  useEffect(() => {
+    let cancelled = false;
+    loadCategory(selectedCategory).then((categorySkus) => {
+      if (!cancelled) {
+        setVisibleSkus(categorySkus);
+      }
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedCategory, skus]);
+
+  // A category's SKUs from the snapshot's category index, with their unit counts
+  // from the inventory sku_id index; in memory if the snapshot could not be written
+  const loadCategory = async (category: string) => {
+    if (category === 'all' || !indexedRef.current) {
+      return category === 'all' ? skus : skus.filter(sku => sku.category === category);
+    }
+    const categorySkus = await localCatalog.getByIndex<SKU>('skus', 'category', category);
+    const counts = await localCatalog.countByIndex('inventory', 'sku_id', categorySkus.map(sku => sku.id));
+    return categorySkus.map((sku, i) => ({ ...sku, inventoryCount: counts[i] }));
+  };
+
+  // Enrich SKUs with the number of inventory units linked to each
+  const showCatalog = (skusData: SKU[], inventoryData: any[], indexed: boolean) => {
+    setInventoryItems(inventoryData);
+    indexedRef.current = indexed;
+    
+    // Calculate inventory count for each SKU
+    const inventoryCountMap = new Map();
+    inventoryData.forEach((item: any) => {
+      const count = inventoryCountMap.get(item.sku_id) || 0;
+      inventoryCountMap.set(item.sku_id, count + 1);
+    });
+
+    const enrichedSkus = skusData.map((sku: SKU) => ({
+      ...sku,
+      inventoryCount: inventoryCountMap.get(sku.id) || 0
+    }));
+
+    setSkus(enrichedSkus);
+  };
+
   const fetchData = async () => {
-    try {
+    setError(null);
+
+    // Fetch SKUs and inventory items in parallel, revalidating the local snapshot
+    const request = Promise.all([
+      api.getSKUs(),
+      api.getInventory()
+    ]);
+
+    // Render the local snapshot immediately while the requests are in flight
+    const [cachedSkus, cachedInventory] = await Promise.all([
+      localCatalog.getAll<SKU>('skus'),
+      localCatalog.getAll<any>('inventory')
+    ]);
+    const hasCache = cachedSkus.length > 0;
+    if (hasCache) {
+      showCatalog(cachedSkus, cachedInventory, true);
+      setLoading(false);
+    } else {
       setLoading(true);
-      setError(null);
-      
-      // Fetch SKUs and inventory items in parallel
-      const [skusResult, inventoryResult] = await Promise.all([
-        api.getSKUs(),
-        api.getInventory()
-      ]);
+    }
+
+    try {
+      const [skusResult, inventoryResult] = await request;
 
       if (!skusResult.success) {
         throw new Error(skusResult.error || 'Failed to fetch SKUs');
@@ -60,37 +133,27 @@ const SKUsPage: React.FC = () => {
       const skusData = skusResult.data?.skus || [];
       const inventoryData = inventoryResult.data?.items || [];
 
-      setInventoryItems(inventoryData);
-      
-      // Calculate inventory count for each SKU
-      const inventoryCountMap = new Map();
-      inventoryData.forEach((item: any) => {
-        const count = inventoryCountMap.get(item.sku_id) || 0;
-        inventoryCountMap.set(item.sku_id, count + 1);
-      });
-
-      // Enrich SKUs with inventory count
-      const enrichedSkus = skusData.map((sku: SKU) => ({
-        ...sku,
-        inventoryCount: inventoryCountMap.get(sku.id) || 0
-      }));
-
-      setSkus(enrichedSkus);
+      const [skusWritten, inventoryWritten] = await Promise.all([
+        localCatalog.replaceAll('skus', skusData),
+        localCatalog.replaceAll('inventory', inventoryData)
+      ]);
+      showCatalog(skusData, inventoryData, skusWritten && inventoryWritten);
       
     } catch (error) {
       console.error('Error fetching data:', error);
-      setError(error instanceof Error ? error.message : 'Failed to load SKU data');
+      // Keep showing the cached snapshot when offline
+      if (!hasCache) {
+        setError(error instanceof Error ? error.message : 'Failed to load SKU data');
+      }
     } finally {
       setLoading(false);
     }
   };
 
-  const filteredSKUs = skus.filter(sku => {
-    const matchesSearch = sku.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         sku.brand.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesCategory = selectedCategory === 'all' || sku.category === selectedCategory;
-    return matchesSearch && matchesCategory;
-  });
+  const filteredSKUs = visibleSkus.filter(sku =>
+    sku.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
+    sku.brand.toLowerCase().includes(searchTerm.toLowerCase())
+  );
 
   const getCategoryIcon = (category: string) => {
     const categoryObj = categories.find(cat => cat.id === category);
@@ -185,8 +248,21 @@ const SKUsPage: React.FC = () => {
             return (
               <div key={sku.id} className="bg-background border border-gray-light rounded-card p-4">
                 <div className="flex items-start gap-3 mb-3">
-                  <div className="w-10 h-10 bg-gray-light rounded-lg flex items-center justify-center">
-                    <Icon size={20} className="text-gray-medium" />
+                  <div className="w-10 h-10 bg-gray-light rounded-lg flex items-center justify-center overflow-hidden">
+                    {sku.thumbnails?.['96'] ? (
+                      <img
+                        src={sku.thumbnails['96']}
+                        srcSet={thumbnailSrcSet(sku.thumbnails)}
+                        alt={sku.name}
+                        width={THUMBNAIL_BOX}
+                        height={THUMBNAIL_BOX}
+                        loading="lazy"
+                        decoding="async"
+                        className="w-full h-full object-contain"
+                      />
+                    ) : (
+                      <Icon size={20} className="text-gray-medium" />
+                    )}
                   </div>
                   <div className="flex-1">
                     <h3 className="font-semibold text-primary">{sku.name}</h3>
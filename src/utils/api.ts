@@ -1,5 +1,7 @@
 // API utility functions with error handling and fallbacks
 
+import { localCatalog } from './localCatalog';
+
 interface ApiResponse<T> {
   data?: T;
   error?: string;
@@ -52,14 +54,85 @@ async function apiCall<T>(url: string, options?: RequestInit): Promise<ApiRespon
 
 const BASE_URL = process.env.NODE_ENV === 'production' ? '' : 'http://localhost:5000';
 
+// Single-flight coalescing for AI processing calls. Identical requests that
+// are already in flight (double taps, modal retries, re-mounted effects) share
+// the pending promise instead of running Whisper/GPT/scraping again.
+const inFlightRequests = new Map<string, Promise<ApiResponse<any>>>();
+
+// A recording uploaded in segments while it was made (see VoiceRecorder). Each
+// upload resolves once its segment is transcribed; the tail is the segment still
+// recording when "stop" was pressed, and its seq is uploads.length.
+export interface RecordingSession {
+  id: string;
+  uploads: Promise<ApiResponse<any>>[];
+  tail: Promise<Blob> | null;
+}
+
+export const singleFlightStats = {
+  calls: 0,
+  coalesced: 0,
+};
+
+function singleFlight<T>(key: string, run: () => Promise<ApiResponse<T>>): Promise<ApiResponse<T>> {
+  singleFlightStats.calls += 1;
+
+  const pending = inFlightRequests.get(key);
+  if (pending) {
+    singleFlightStats.coalesced += 1;
+    return pending;
+  }
+
+  const promise = run().then(
+    (result) => {
+      inFlightRequests.delete(key);
+      return result;
+    },
+    (error) => {
+      inFlightRequests.delete(key);
+      throw error;
+    }
+  );
+  inFlightRequests.set(key, promise);
+  return promise;
+}
+
+// Hash request payloads so keys stay small even for multi-megabyte recordings
+async function hashBytes(buffer: ArrayBuffer): Promise<string> {
+  const bytes = new Uint8Array(buffer);
+
+  if (typeof crypto !== 'undefined' && crypto.subtle) {
+    const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', bytes));
+    let hex = '';
+    for (let i = 0; i < digest.length; i++) {
+      hex += digest[i].toString(16).padStart(2, '0');
+    }
+    return hex;
+  }
+
+  // FNV-1a fallback for insecure contexts where SubtleCrypto is unavailable
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < bytes.length; i++) {
+    hash ^= bytes[i];
+    hash = Math.imul(hash, 0x01000193) >>> 0;
+  }
+  return `${hash.toString(16)}-${bytes.length}`;
+}
+
+async function hashText(text: string): Promise<string> {
+  return hashBytes(new TextEncoder().encode(text).buffer as ArrayBuffer);
+}
+
 // Specific API functions
 export const api = {
   // Inventory API calls
-  async getInventory(filters?: { sku_id?: string; status?: string; condition?: string }) {
+  // fields is sent as a fields= query parameter for the list handlers to project on
+  // (see parse_fields/LIST_FIELDS in api/); handlers that ignore it return whole documents
+  async getInventory(filters?: { sku_id?: string; status?: string; condition?: string }, fields?: string[]) {
     const params = new URLSearchParams();
     if (filters?.sku_id) params.append('sku_id', filters.sku_id);
     if (filters?.status) params.append('status', filters.status);
     if (filters?.condition) params.append('condition', filters.condition);
+    if (fields?.length) params.append('fields', fields.join(','));
     
     const url = `${BASE_URL}/api/inventory${params.toString() ? `?${params.toString()}` : ''}`;
     return apiCall<{ items: any[] }>(url);
@@ -84,8 +157,12 @@ export const api = {
   },
 
   // SKU API calls
-  async getSKUs(category?: string) {
-    const url = category ? `${BASE_URL}/api/skus?category=${category}` : `${BASE_URL}/api/skus`;
+  async getSKUs(category?: string, fields?: string[]) {
+    const params = new URLSearchParams();
+    if (category) params.append('category', category);
+    if (fields?.length) params.append('fields', fields.join(','));
+
+    const url = `${BASE_URL}/api/skus${params.toString() ? `?${params.toString()}` : ''}`;
     return apiCall<{ skus: any[] }>(url);
   },
 
@@ -100,6 +177,15 @@ export const api = {
     return apiCall<{ sku: any }>(`${BASE_URL}/api/skus/${id}`);
   },
 
+  // Availability API call (free units per SKU for a date range)
+  async getAvailability(start: string, end: string, skuId?: string) {
+    const params = new URLSearchParams({ start, end });
+    if (skuId) params.append('sku_id', skuId);
+    return apiCall<{ availability?: Record<string, number>; available_units?: string[]; count?: number }>(
+      `${BASE_URL}/api/availability?${params.toString()}`
+    );
+  },
+
   // Categories API call
   async getCategories() {
     return apiCall<{ categories: string[] }>(`${BASE_URL}/api/categories`);
@@ -107,6 +193,11 @@ export const api = {
 
   // Audio processing API call
   async processAudio(audioBlob: Blob) {
+    const key = `process-audio:${await hashBytes(await audioBlob.arrayBuffer())}`;
+    return singleFlight(key, () => this._processAudio(audioBlob));
+  },
+
+  async _processAudio(audioBlob: Blob): Promise<ApiResponse<any>> {
     const formData = new FormData();
     formData.append('audio', audioBlob, 'recording.webm');
 
@@ -141,8 +232,76 @@ export const api = {
     }
   },
 
+  // Chunked audio upload: one self-contained segment, transcribed while recording continues
+  async uploadAudioSegment(sessionId: string, seq: number, segment: Blob) {
+    return this._postAudioSegment(sessionId, seq, segment, false);
+  },
+
+  // Finish a chunked recording: once every segment is in, only the tail is uploaded.
+  // Fails if a segment upload failed, so the caller can send the whole recording instead
+  async finishAudioSession(session: RecordingSession) {
+    return singleFlight(`upload-chunk:${session.id}`, async (): Promise<ApiResponse<any>> => {
+      const uploads = await Promise.all(session.uploads);
+      if (!session.tail || uploads.some(upload => !upload.success)) {
+        return { error: 'Some recording segments were not uploaded', success: false };
+      }
+      return this._postAudioSegment(session.id, uploads.length, await session.tail, true);
+    });
+  },
+
+  async _postAudioSegment(sessionId: string, seq: number, segment: Blob, final: boolean): Promise<ApiResponse<any>> {
+    const params = new URLSearchParams({ session: sessionId, seq: String(seq) });
+    if (final) params.append('final', '1');
+
+    try {
+      const response = await fetch(`${BASE_URL}/api/upload-chunk?${params.toString()}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'audio/webm' },
+        body: segment,
+      });
+
+      if (!response.ok) {
+        throw new ApiError(`HTTP ${response.status}: ${response.statusText}`, response.status);
+      }
+
+      const data = await response.json();
+
+      if (data.error) {
+        throw new ApiError(data.error);
+      }
+
+      return { data, success: true };
+    } catch (error) {
+      console.error('Audio segment upload failed:', error);
+
+      if (error instanceof ApiError) {
+        return { error: error.message, success: false };
+      }
+
+      return {
+        error: 'Audio segment upload failed. Please try again.',
+        success: false
+      };
+    }
+  },
+
+  // Sample-mode audio processing (server returns canned extraction data)
+  async processSampleAudio() {
+    return singleFlight('process-audio:sample', () =>
+      apiCall<any>(`${BASE_URL}/api/process-audio`, {
+        method: 'POST',
+        body: JSON.stringify({ sample: true }),
+      })
+    );
+  },
+
   // Text processing API call
   async processText(text: string) {
+    const key = `process-text:${await hashText(text)}`;
+    return singleFlight(key, () => this._processText(text));
+  },
+
+  async _processText(text: string): Promise<ApiResponse<any>> {
     try {
       const response = await fetch(`${BASE_URL}/api/process-text`, {
         method: 'POST',
@@ -183,35 +342,86 @@ export const api = {
   }
 };
 
-// Offline support utilities
+// Offline support utilities (IndexedDB-backed, see localCatalog)
+let formSync: Promise<{ synced: number; remaining: number }> | null = null;
+
 export const offlineStorage = {
-  // Save data to localStorage for offline access
-  saveToLocal(key: string, data: any) {
+  // Save data to IndexedDB for offline access
+  async saveToLocal(key: string, data: any) {
     try {
-      localStorage.setItem(key, JSON.stringify(data));
+      await localCatalog.setValue(key, data);
     } catch (error) {
-      console.warn('Failed to save to localStorage:', error);
+      console.warn('Failed to save to IndexedDB:', error);
     }
   },
 
-  // Load data from localStorage
-  loadFromLocal<T>(key: string): T | null {
+  // Load data from IndexedDB, moving any legacy localStorage entry across
+  async loadFromLocal<T>(key: string): Promise<T | null> {
     try {
-      const data = localStorage.getItem(key);
-      return data ? JSON.parse(data) : null;
+      const data = await localCatalog.getValue<T>(key);
+      if (data !== null) {
+        return data;
+      }
+
+      const legacy = localStorage.getItem(key);
+      if (legacy === null) {
+        return null;
+      }
+      const parsed = JSON.parse(legacy) as T;
+      await localCatalog.setValue(key, parsed);
+      localStorage.removeItem(key);
+      return parsed;
     } catch (error) {
-      console.warn('Failed to load from localStorage:', error);
+      console.warn('Failed to load from IndexedDB:', error);
       return null;
     }
   },
 
   // Clear offline data
-  clearLocal(key: string) {
+  async clearLocal(key: string) {
     try {
+      await localCatalog.deleteValue(key);
       localStorage.removeItem(key);
     } catch (error) {
-      console.warn('Failed to clear from localStorage:', error);
+      console.warn('Failed to clear from IndexedDB:', error);
+    }
+  },
+
+  // Queue a form submission made while offline
+  async queueForm(data: any) {
+    return localCatalog.queueForm(data);
+  },
+
+  // Replay queued forms once back online; successfully saved forms leave the queue.
+  // Overlapping calls share one run so a form is never posted twice.
+  syncQueuedForms(): Promise<{ synced: number; remaining: number }> {
+    if (!formSync) {
+      formSync = (async () => {
+        const queued = await localCatalog.getQueuedForms();
+        let synced = 0;
+
+        for (const form of queued) {
+          const response = await api.createInventoryItem(form.data);
+          if (!response.success) {
+            break;
+          }
+          await localCatalog.removeQueuedForm(form.queueId as number);
+          synced += 1;
+        }
+
+        return { synced, remaining: queued.length - synced };
+      })().then(
+        (result) => {
+          formSync = null;
+          return result;
+        },
+        (error) => {
+          formSync = null;
+          throw error;
+        }
+      );
     }
+    return formSync;
   }
 };
 
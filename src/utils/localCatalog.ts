@@ -0,0 +1,189 @@
+// IndexedDB-backed local catalog: SKU and inventory snapshots, the offline
+// form queue and small key/value entries, all in one database
+
+const DB_NAME = 'camorent-inventory';
+const DB_VERSION = 2;
+
+export type CatalogStore = 'skus' | 'inventory';
+
+export interface QueuedForm {
+  queueId?: number;
+  data: any;
+  queuedAt: number;
+}
+
+let dbPromise: Promise<IDBDatabase> | null = null;
+
+function promisify<T>(request: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function transactionDone(transaction: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    transaction.oncomplete = () => resolve();
+    transaction.onerror = () => reject(transaction.error);
+    transaction.onabort = () => reject(transaction.error);
+  });
+}
+
+// Inventory units are stored with their SKU's category, so the category index can find them
+function toRecord(store: CatalogStore, item: any) {
+  if (store === 'inventory' && item.category === undefined && item.sku?.category !== undefined) {
+    return { ...item, category: item.sku.category };
+  }
+  return item;
+}
+
+function openDatabase(): Promise<IDBDatabase> {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      if (typeof indexedDB === 'undefined') {
+        reject(new Error('IndexedDB is not available'));
+        return;
+      }
+
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+
+      request.onupgradeneeded = (event) => {
+        const db = request.result;
+
+        if (event.oldVersion < 1) {
+          const skus = db.createObjectStore('skus', { keyPath: 'id' });
+          skus.createIndex('category', 'category');
+
+          const inventory = db.createObjectStore('inventory', { keyPath: 'id' });
+          inventory.createIndex('sku_id', 'sku_id');
+          inventory.createIndex('status', 'status');
+
+          db.createObjectStore('formQueue', { keyPath: 'queueId', autoIncrement: true });
+          db.createObjectStore('keyValue');
+        }
+        if (event.oldVersion < 2) {
+          // Units carry their SKU's category (see toRecord); add it to the cached ones
+          const inventory = (request.transaction as IDBTransaction).objectStore('inventory');
+          inventory.createIndex('category', 'category');
+          const cursorRequest = inventory.openCursor();
+          cursorRequest.onsuccess = () => {
+            const cursor = cursorRequest.result;
+            if (cursor) {
+              cursor.update(toRecord('inventory', cursor.value));
+              cursor.continue();
+            }
+          };
+        }
+      };
+
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    });
+
+    // Allow a later retry if opening failed (e.g. private browsing)
+    dbPromise.catch(() => {
+      dbPromise = null;
+    });
+  }
+  return dbPromise;
+}
+
+export const localCatalog = {
+  // Everything cached for a store, e.g. to render a list before the network responds
+  async getAll<T>(store: CatalogStore): Promise<T[]> {
+    try {
+      const db = await openDatabase();
+      return await promisify<T[]>(db.transaction(store).objectStore(store).getAll());
+    } catch (error) {
+      console.warn(`Failed to read ${store} from IndexedDB:`, error);
+      return [];
+    }
+  },
+
+  // Lookups by the skus.category and inventory sku_id, status and category indexes
+  async getByIndex<T>(store: CatalogStore, index: string, value: IDBValidKey): Promise<T[]> {
+    try {
+      const db = await openDatabase();
+      return await promisify<T[]>(db.transaction(store).objectStore(store).index(index).getAll(value));
+    } catch (error) {
+      console.warn(`Failed to query ${store}.${index} from IndexedDB:`, error);
+      return [];
+    }
+  },
+
+  // Record counts for each value of an index, read in one transaction without loading the records
+  async countByIndex(store: CatalogStore, index: string, values: IDBValidKey[]): Promise<number[]> {
+    try {
+      const db = await openDatabase();
+      const objectStore = db.transaction(store).objectStore(store).index(index);
+      return await Promise.all(values.map(value => promisify(objectStore.count(value))));
+    } catch (error) {
+      console.warn(`Failed to count ${store}.${index} in IndexedDB:`, error);
+      return values.map(() => 0);
+    }
+  },
+
+  // Replace a store's snapshot with freshly fetched records in one transaction.
+  // Resolves to false if it could not be written, e.g. over the storage quota
+  async replaceAll(store: CatalogStore, items: any[]): Promise<boolean> {
+    try {
+      const db = await openDatabase();
+      const transaction = db.transaction(store, 'readwrite');
+      const objectStore = transaction.objectStore(store);
+      objectStore.clear();
+      items.forEach((item) => {
+        if (item && item.id) {
+          objectStore.put(toRecord(store, item));
+        }
+      });
+      await transactionDone(transaction);
+      return true;
+    } catch (error) {
+      console.warn(`Failed to write ${store} to IndexedDB:`, error);
+      return false;
+    }
+  },
+
+  async getValue<T>(key: string): Promise<T | null> {
+    const db = await openDatabase();
+    const value = await promisify(db.transaction('keyValue').objectStore('keyValue').get(key));
+    return value === undefined ? null : value;
+  },
+
+  async setValue(key: string, value: any) {
+    const db = await openDatabase();
+    const transaction = db.transaction('keyValue', 'readwrite');
+    transaction.objectStore('keyValue').put(value, key);
+    await transactionDone(transaction);
+  },
+
+  async deleteValue(key: string) {
+    const db = await openDatabase();
+    const transaction = db.transaction('keyValue', 'readwrite');
+    transaction.objectStore('keyValue').delete(key);
+    await transactionDone(transaction);
+  },
+
+  // Offline form queue: forms saved while offline, synced when back online
+  async queueForm(data: any): Promise<number> {
+    const db = await openDatabase();
+    const transaction = db.transaction('formQueue', 'readwrite');
+    const queueId = await promisify(
+      transaction.objectStore('formQueue').add({ data, queuedAt: Date.now() } as QueuedForm)
+    );
+    await transactionDone(transaction);
+    return queueId as number;
+  },
+
+  async getQueuedForms(): Promise<QueuedForm[]> {
+    const db = await openDatabase();
+    return promisify<QueuedForm[]>(db.transaction('formQueue').objectStore('formQueue').getAll());
+  },
+
+  async removeQueuedForm(queueId: number) {
+    const db = await openDatabase();
+    const transaction = db.transaction('formQueue', 'readwrite');
+    transaction.objectStore('formQueue').delete(queueId);
+    await transactionDone(transaction);
+  }
+};
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test session-scoped segment transcription and the /api/upload-chunk handler
+against an in-memory Firestore fake and a fake OpenAI client
+"""
+import importlib.util
+import json
+import sys
+import threading
+from http.server import HTTPServer
+sys.path.append('api')
+
+import httpx
+import pytest
+
+import audio_sessions
+from audio_sessions import AudioSessions, MissingSegments, validate_segment
+from conftest import FakeDB
+
+
+class FakeClient:
+    """Transcribes b'say X' to 'X' and records every call"""
+
+    def __init__(self):
+        self.transcribed = []
+        self.extracted = []
+
+    def transcribe_audio(self, audio_file):
+        self.transcribed.append(audio_file.name)
+        return audio_file.getvalue().decode().replace('say ', '') + ' '
+
+    def extract_equipment_data(self, transcription):
+        self.extracted.append(transcription)
+        return {'name': 'Sony FX3', 'brand': 'Sony', 'model': 'FX3', 'category': 'cameras'}
+
+
+def test_segments_assemble_in_order():
+    """Segments arriving out of order are joined by seq; the tail is the only work left at finish"""
+    client = FakeClient()
+    sessions = AudioSessions(db=FakeDB(), client=client)
+    sessions.add_segment('session-1', 1, b'say full frame')
+    sessions.add_segment('session-1', 0, b'say Sony FX3')
+    assert len(client.transcribed) == 2
+
+    transcript = sessions.finish('session-1', 2, b'say good condition')
+    assert transcript == 'Sony FX3 full frame good condition'
+    assert client.transcribed[-1] == 'segment-2.webm'
+
+    # A retried finish reuses the stored tail instead of transcribing it again
+    assert sessions.finish('session-1', 2, b'say good condition') == transcript
+    assert len(client.transcribed) == 3
+    print("✅ Segments assembled in order")
+
+
+def test_missing_segments():
+    """Finishing before every earlier segment is stored reports which are missing"""
+    sessions = AudioSessions(db=FakeDB(), client=FakeClient())
+    sessions.add_segment('session-2', 0, b'say Canon')
+    with pytest.raises(MissingSegments) as error:
+        sessions.finish('session-2', 3, b'say R5')
+    assert error.value.missing == [1, 2]
+    print("✅ Missing segments reported")
+
+
+def test_validate_segment():
+    validate_segment('session-3', 0, b'audio')
+    validate_segment('session-3', 4, b'', final=True)
+    for session_id, seq, audio in [('../x', 0, b'a'), ('session-3', -1, b'a'),
+                                   ('session-3', audio_sessions.MAX_SEGMENTS, b'a'), ('session-3', 1, b'')]:
+        with pytest.raises(ValueError):
+            validate_segment(session_id, seq, audio)
+    print("✅ Segment validation")
+
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    """The upload-chunk handler on a local port, backed by the fakes"""
+    client = FakeClient()
+    monkeypatch.setattr(audio_sessions, '_sessions', AudioSessions(db=FakeDB(), client=client))
+    spec = importlib.util.spec_from_file_location('upload_chunk', 'api/upload-chunk.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module.handler, '_research_specs', lambda self, form: 'skipped')
+    module.handler.log_message = lambda *args: None
+
+    server = HTTPServer(('127.0.0.1', 0), module.handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/api/upload-chunk", client
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_upload_chunk_endpoint(endpoint):
+    """Segments upload while recording; the final call returns the process-audio form shape"""
+    url, client = endpoint
+    for seq, words in enumerate([b'say Sony FX3', b'say with cage']):
+        response = httpx.post(url, params={'session': 'session-4', 'seq': seq}, content=words)
+        assert response.status_code == 200 and response.json()['seq'] == seq
+
+    response = httpx.post(url, params={'session': 'session-4', 'seq': 2, 'final': 1}, content=b'say and two batteries')
+    data = response.json()
+    assert response.status_code == 200
+    assert data['processing_status'] == 'success'
+    assert data['transcription'] == 'Sony FX3 with cage and two batteries'
+    assert (data['brand'], data['model']) == ('Sony', 'FX3')
+    assert client.extracted == [data['transcription']]
+
+    missing = httpx.post(url, params={'session': 'session-5', 'seq': 1, 'final': 1}, content=b'say tail')
+    assert missing.status_code == 409 and missing.json()['missing'] == [0]
+    invalid = httpx.post(url, params={'session': 'session-5', 'seq': 'x'}, content=b'say one')
+    assert invalid.status_code == 400
+    print("✅ Upload chunk endpoint: " + json.dumps(data['transcription']))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-s', '-q']))
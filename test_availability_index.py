@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the in-memory availability index (overlaps, cancellations, unit status)
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+sys.path.append('api')
+
+import pytest
+
+import availability_index
+from availability_index import AvailabilityIndex, get_availability_index
+from conftest import FakeDB
+from warm_cache import WarmInstance
+
+
+def make_index():
+    index = AvailabilityIndex()
+    for unit in ['r5-1', 'r5-2', 'r5-3']:
+        index.upsert_unit(unit, 'sku-r5')
+    index.upsert_unit('fx6-1', 'sku-fx6')
+    return index
+
+
+def test_overlapping_bookings():
+    """Date-only bookings hold their unit through the end date, inclusive"""
+    index = make_index()
+    index.upsert_booking('b1', {'inventory_id': 'r5-1', 'start_date': '2026-03-01', 'end_date': '2026-03-05'})
+    index.upsert_booking('b2', {'inventory_id': 'r5-1', 'start_date': '2026-03-10', 'end_date': '2026-03-12'})
+    index.upsert_booking('b3', {'inventory_id': 'r5-2', 'start_date': '2026-02-20', 'end_date': '2026-03-20'})
+
+    assert index.free_units('sku-r5', '2026-03-05', '2026-03-06') == ['r5-3']
+    assert index.free_units('sku-r5', '2026-03-06', '2026-03-09') == ['r5-1', 'r5-3']
+    assert index.free_units('sku-r5', '2026-03-21', '2026-03-22') == ['r5-1', 'r5-2', 'r5-3']
+    assert index.free_counts('2026-03-01', '2026-03-01') == {'sku-r5': 1, 'sku-fx6': 1}
+    print("✅ Overlapping bookings")
+
+
+def test_status_changes_free_and_block_units():
+    """Cancelled bookings free a unit; maintenance units are never offered"""
+    index = make_index()
+    index.upsert_booking('b1', {'inventory_id': 'r5-1', 'start_date': '2026-03-01', 'end_date': '2026-03-05'})
+    index.upsert_unit('r5-3', 'sku-r5', 'maintenance')
+    assert index.free_units('sku-r5', '2026-03-02', '2026-03-03') == ['r5-2']
+
+    index.upsert_booking('b1', {'inventory_id': 'r5-1', 'status': 'cancelled',
+                                'start_date': '2026-03-01', 'end_date': '2026-03-05'})
+    assert index.free_units('sku-r5', '2026-03-02', '2026-03-03') == ['r5-1', 'r5-2']
+    assert 'b1' not in index.booking_units
+    print("✅ Booking and unit status changes")
+
+
+def test_moved_booking_and_removed_unit():
+    """Updating a booking moves it; removed units drop out of the SKU"""
+    index = make_index()
+    index.upsert_booking('b1', {'inventory_id': 'fx6-1', 'start_date': '2026-04-01', 'end_date': '2026-04-03'})
+    index.upsert_booking('b1', {'inventory_id': 'fx6-1', 'start_date': '2026-04-10T09:00:00Z',
+                                'end_date': '2026-04-10T18:00:00Z'})
+    assert index.free_units('sku-fx6', '2026-04-01', '2026-04-03') == ['fx6-1']
+    assert index.free_units('sku-fx6', '2026-04-10', '2026-04-10') == []
+
+    index.remove_unit('r5-2')
+    assert index.free_units('sku-r5', '2026-04-01', '2026-04-02') == ['r5-1', 'r5-3']
+    print("✅ Moved bookings and removed units")
+
+
+def test_failed_cold_load_is_retried(monkeypatch):
+    """A failed first load is not cached; the next call loads the index"""
+    monkeypatch.setattr(availability_index, '_index', WarmInstance(AvailabilityIndex))
+    db = FakeDB({
+        'inventory': {'r5-1': {'sku_id': 'sku-r5'}},
+        'bookings': {'b1': {'inventory_id': 'r5-1', 'start_date': '2026-03-01', 'end_date': '2026-03-05'}},
+    }, failures=1)
+
+    try:
+        get_availability_index(db)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Expected the first load to fail")
+
+    index = get_availability_index(db)
+    assert index.free_units('sku-r5', '2026-03-02', '2026-03-03') == []
+    assert index.free_units('sku-r5', '2026-03-06', '2026-03-07') == ['r5-1']
+    assert get_availability_index(db) is index
+    print("✅ Failed cold load retried on the next call")
+
+
+def test_failed_refresh_keeps_watermark():
+    """A booking missed by a failed refresh is still picked up by the next one"""
+    t0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    db = FakeDB({
+        'inventory': {'r5-1': {'sku_id': 'sku-r5', 'created_at': t0},
+                      'r5-2': {'sku_id': 'sku-r5', 'created_at': t0}},
+        'bookings': {},
+    })
+    index = AvailabilityIndex()
+    index.load(db)
+
+    # A booking lands, then a unit is edited later, while bookings queries fail
+    db.data['bookings']['b1'] = {'inventory_id': 'r5-1', 'start_date': '2026-03-10', 'end_date': '2026-03-12',
+                                 'created_at': t0 + timedelta(minutes=1)}
+    db.data['inventory']['r5-2'] = dict(db.data['inventory']['r5-2'], updated_at=t0 + timedelta(minutes=2))
+    db.failing.add('bookings')
+    with pytest.raises(RuntimeError):
+        index.refresh(db)
+    assert index.watermark == t0
+
+    db.failing.clear()
+    index.refresh(db)
+    assert index.free_units('sku-r5', '2026-03-11', '2026-03-11') == ['r5-2']
+    assert index.watermark == t0 + timedelta(minutes=2)
+    print("✅ Failed refresh left the watermark for the next refresh")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test batch onboarding discovery, NDJSON output and checkpoint resume
+"""
+import json
+import os
+import shutil
+import tempfile
+
+from batch_onboard import SkuIndex, discover_items, run_batch, save_form
+
+
+def test_discover_items():
+    """Audio folders yield one item per recording; transcript files one per description"""
+    folder = tempfile.mkdtemp()
+    try:
+        for name in ['b.webm', 'a.m4a', 'notes.md']:
+            open(os.path.join(folder, name), 'wb').close()
+        assert [item['id'] for item in discover_items(folder)] == ['a.m4a', 'b.webm']
+
+        transcript = os.path.join(folder, 'intake.txt')
+        with open(transcript, 'w') as f:
+            f.write("Canon EOS R5, serial CAN123456789\n\nSony FX6, serial FX6789012\n")
+        items = discover_items(transcript)
+        assert [item['id'] for item in items] == ['intake.txt#1', 'intake.txt#3']
+        assert items[1]['transcription'] == 'Sony FX6, serial FX6789012'
+        print("✅ Item discovery")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_resume_from_checkpoint():
+    """Successful items are checkpointed and skipped on rerun; failures are retried"""
+    folder = tempfile.mkdtemp()
+    output = os.path.join(folder, 'out.ndjson')
+    checkpoint = output + '.checkpoint'
+    items = [{'id': f'item-{i}', 'transcription': f'description {i}'} for i in range(6)]
+    calls = []
+
+    def flaky_worker(item):
+        calls.append(item['id'])
+        if item['id'] == 'item-3' and calls.count('item-3') == 1:
+            raise RuntimeError('rate limited')
+        return {'form': {'brand': 'Canon', 'model': item['id']}}
+
+    try:
+        assert run_batch(items, flaky_worker, output, checkpoint, workers=2) == (5, 1)
+        assert run_batch(items, flaky_worker, output, checkpoint, workers=2) == (1, 0)
+        assert sorted(calls) == sorted([item['id'] for item in items] + ['item-3'])
+
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+        assert [record['status'] for record in records].count('error') == 1
+        assert records[-1] == dict(records[-1], id='item-3', status='ok')
+        print("✅ Checkpoint resume")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_save_is_idempotent_per_item():
+    """Saving the same item again (a resume after a crash) overwrites its unit"""
+    from storage_sqlite import SQLiteStorage
+
+    folder = tempfile.mkdtemp()
+    try:
+        storage = SQLiteStorage(os.path.join(folder, 'onboard.db'))
+        form = {'brand': 'Sony', 'model': 'FX6', 'category': 'cameras', 'price_per_day': 3500,
+                'serial_number': 'FX6789012', 'condition': 'new'}
+
+        sku_id, first = save_form(storage, SkuIndex(storage), form, 'intake.txt#1')
+        _, again = save_form(storage, SkuIndex(storage), dict(form, condition='good'), 'intake.txt#1')
+        _, other = save_form(storage, SkuIndex(storage), form, 'intake.txt#2')
+
+        assert first == again != other
+        units = storage.inventory.list()
+        assert len(units) == 2 and {unit['sku_id'] for unit in units} == {sku_id}
+        assert storage.inventory.get(first)['condition'] == 'good'
+        print("✅ Re-saving an item overwrites its inventory unit")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    test_discover_items()
+    test_resume_from_checkpoint()
+    test_save_is_idempotent_per_item()
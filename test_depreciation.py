@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized depreciation curves, change threshold and nightly job
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+sys.path.append('api')
+
+import numpy as np
+
+from depreciate_inventory import run
+from depreciation import SECONDS_PER_YEAR, changed_mask, depreciate, depreciate_from
+from storage_sqlite import SQLiteStorage
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def years_ago(years):
+    return NOW.timestamp() - years * SECONDS_PER_YEAR
+
+
+def test_category_curves_and_conditions():
+    """Declining balance per category, floored, scaled by condition"""
+    values = depreciate(
+        [250000, 100000, 100000, 100000, 50000, 0],
+        [years_ago(1), years_ago(2), years_ago(20), years_ago(1), np.nan, years_ago(1)],
+        ['cameras', 'lenses', 'cameras', 'unknown', 'audio', 'cameras'],
+        ['new', 'good', 'new', 'fair', None, 'new'],
+        now=NOW,
+    )
+    assert values[0] == 200000            # 250000 * 0.80
+    assert values[1] == 72900             # 100000 * 0.90^2 * 0.9 (good)
+    assert values[2] == 15000             # cameras floor at 15% of purchase
+    assert values[3] == 63750             # default 15% curve, fair condition
+    assert values[4] == 45000             # no created_at: age 0, default condition
+    assert np.isnan(values[5])            # no purchase price: left alone
+    print("✅ Depreciation curves")
+
+
+def test_depreciate_from_recorded_values():
+    """Recorded values move along the curve from when they were recorded, not from purchase price"""
+    values = depreciate_from(
+        [230000, 230000, 40000, 20000, np.nan],
+        [NOW.timestamp(), years_ago(1), years_ago(10), years_ago(1), years_ago(1)],
+        ['cameras', 'cameras', 'cameras', 'cameras', 'lenses'],
+        [250000, 250000, 250000, 250000, 100000],
+        now=NOW,
+    )
+    assert values[0] == 230000            # entered today: kept as entered
+    assert values[1] == 184000            # 230000 * 0.80
+    assert values[2] == 37500             # stops at the 15% floor
+    assert values[3] == 20000             # entered below the floor: left as entered
+    assert np.isnan(values[4])            # no value recorded
+    print("✅ Depreciation from recorded values")
+
+
+def test_changed_mask():
+    """Only units that moved past the threshold (or have no value yet) are written"""
+    mask = changed_mask([200000, 200050, np.nan, 100], [200000, 200000, 150000, np.nan], min_change=100)
+    assert mask.tolist() == [False, False, True, False]
+    print("✅ Change threshold")
+
+
+def test_job_keeps_entered_values():
+    """A value entered today survives the nightly run; a second run the same night changes nothing"""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        storage = SQLiteStorage(path)
+        now = datetime.now(timezone.utc)
+        sku_id = storage.skus.create({'name': 'FX3', 'category': 'cameras'})
+        storage.inventory.create({'sku_id': sku_id, 'purchase_price': 250000, 'current_value': 230000,
+                                  'condition': 'good'}, doc_id='entered')
+        storage.inventory.create({'sku_id': sku_id, 'purchase_price': 250000, 'current_value': 200000,
+                                  'condition': 'good', 'created_at': now - timedelta(days=800),
+                                  'depreciated_value': 200000,
+                                  'depreciated_at': now - timedelta(days=365.25)}, doc_id='carried')
+        storage.inventory.create({'sku_id': sku_id, 'purchase_price': 250000, 'condition': 'new',
+                                  'created_at': now - timedelta(days=365.25)}, doc_id='unvalued')
+
+        run(storage, min_change=100)
+        units = {unit['id']: unit for unit in storage.inventory.list()}
+        assert units['entered']['current_value'] == 230000
+        assert units['carried']['current_value'] == 160000    # 200000 * 0.80 over the year since
+        assert units['unvalued']['current_value'] == 200000   # estimated from purchase price
+        assert units['carried']['depreciated_value'] == 160000
+
+        run(storage, min_change=100)
+        again = {unit['id']: unit for unit in storage.inventory.list()}
+        assert [again[key]['current_value'] for key in units] == [units[key]['current_value'] for key in units]
+        assert again['carried']['depreciated_at'] == units['carried']['depreciated_at']
+        print("✅ Nightly job keeps entered values")
+    finally:
+        for suffix in ['', '-wal', '-shm']:
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    test_category_curves_and_conditions()
+    test_depreciate_from_recorded_values()
+    test_changed_mask()
+    test_job_keeps_entered_values()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test that the shared HTTP clients reuse connections across calls (local server, no network)
+"""
+import sys
+sys.path.append('api')
+
+import http_pool
+from conftest import local_server
+
+
+def test_shared_client_reuses_one_connection():
+    with local_server({'/ping': (200, 'pong')}) as server:
+        for _ in range(5):
+            response = http_pool.get_http_client().get(server.url('/ping'))
+            assert response.text == 'pong'
+        assert http_pool.get_http_client() is http_pool.get_http_client()
+        assert server.connections == 1, server.connections
+    print("✅ Shared client reuses one connection for repeated calls")
+
+
+def test_fresh_clients_open_a_connection_each():
+    with local_server({'/ping': (200, 'pong')}) as server:
+        for _ in range(3):
+            with http_pool.new_client() as client:
+                client.get(server.url('/ping'))
+        assert server.connections == 3, server.connections
+    print("✅ Fresh clients pay a new connection per call")
+
+
+def test_async_pool_reuses_connections_across_calls():
+    async def fetch(client, url):
+        response = await client.get(url)
+        return response.text
+
+    with local_server({'/ping': (200, 'pong')}) as server:
+        for _ in range(4):
+            text = http_pool.run_async(lambda client: fetch(client, server.url('/ping')), timeout=10)
+            assert text == 'pong'
+        assert server.connections == 1, server.connections
+    print("✅ Async pool keeps its client (and connections) across calls")
+
+
+if __name__ == "__main__":
+    test_shared_client_reuses_one_connection()
+    test_fresh_clients_open_a_connection_each()
+    test_async_pool_reuses_connections_across_calls()
+    print("\n🎉 HTTP pool tests passed!")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test streamed barcode label sheets (PDF structure, paging, selection)
+"""
+import io
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+sys.path.append('api')
+
+from label_sheets import LABELS_PER_PAGE, select_units, write_label_sheets
+from storage_sqlite import SQLiteStorage
+
+
+def check_pdf(data, pages):
+    """Every xref entry points at its object and the page tree has the expected count"""
+    assert data.startswith(b'%PDF-1.4') and data.rstrip().endswith(b'%%EOF')
+    xref_position = int(re.search(rb'startxref\n(\d+)', data).group(1))
+    assert data[xref_position:].startswith(b'xref')
+    entries = re.findall(rb'(\d{10}) 00000 n ', data[xref_position:])
+    for object_id, offset in enumerate(entries, 1):
+        assert data[int(offset):].startswith(f'{object_id} 0 obj'.encode())
+    assert f'/Count {pages}'.encode() in data
+
+
+def test_code128_and_qr_sheets():
+    """Labels fill sheets in order, in a process pool or in-process"""
+    labels = [(f'CAN{i:09d}', 'Canon EOS R5 (body)') for i in range(LABELS_PER_PAGE * 2 + 5)]
+    for symbology, workers in (('code128', 2), ('qr', 0)):
+        out = io.BytesIO()
+        assert write_label_sheets(iter(labels), out, symbology=symbology, workers=workers) == 3
+        check_pdf(out.getvalue(), 3)
+    print("✅ Code128 and QR sheets")
+
+
+def test_select_units():
+    """Units are selected by id or creation range and titled with their SKU name"""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        storage = SQLiteStorage(path)
+        sku_id = storage.skus.create({'name': 'Sony FX6', 'brand': 'Sony', 'model': 'FX6'})
+        now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+        ids = [
+            storage.inventory.create({'sku_id': sku_id, 'serial_number': f'FX{i}', 'created_at': now + timedelta(days=i)})
+            for i in range(4)
+        ]
+        storage.inventory.update(ids[0], {'barcode': 'BC-0'})
+
+        assert select_units(storage, ids=[ids[2], 'missing', ids[0]]) == [
+            ('FX2', 'Sony FX6', 'code128'), ('BC-0', 'Sony FX6', 'code128'),
+        ]
+        assert select_units(storage, created_from=now + timedelta(days=1), created_to=now + timedelta(days=3)) == [
+            ('FX1', 'Sony FX6', 'code128'), ('FX2', 'Sony FX6', 'code128'),
+        ]
+
+        # A serial Code128 cannot encode is printed as QR instead of breaking the sheet
+        storage.inventory.update(ids[3], {'serial_number': 'CAFÉ-é'})
+        labels = select_units(storage, ids=ids)
+        assert [symbology for _, _, symbology in labels] == ['code128', 'code128', 'code128', 'qr']
+        out = io.BytesIO()
+        assert write_label_sheets(labels, out, workers=0) == 1
+        check_pdf(out.getvalue(), 1)
+        print("✅ Unit selection and QR fallback")
+    finally:
+        for suffix in ['', '-wal', '-shm']:
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    test_code128_and_qr_sheets()
+    test_select_units()
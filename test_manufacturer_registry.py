@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test manufacturer registry lookups against the shipped manufacturers.json
+"""
+import sys
+sys.path.append('api')
+
+from manufacturer_registry import get_manufacturer_info, load_registry, resolve_brand, spec_site_patterns
+
+
+def test_lookup_by_name_and_alias():
+    """Brands resolve by name, alias and casing"""
+    assert resolve_brand("Canon") == "canon"
+    assert resolve_brand("  SONY  electronics ") == "sony"
+    assert resolve_brand("Blackmagic") == "blackmagic design"
+    assert resolve_brand("Unknown Brand") is None
+    print("✅ Brands resolved")
+
+
+def test_manufacturer_info():
+    """Manufacturer info is returned without scraping and cannot mutate the registry"""
+    manufacturer = get_manufacturer_info("Canon")
+    assert manufacturer['name'] == "Canon"
+    assert manufacturer['registry_version'] >= 1
+    assert "canon.com" in spec_site_patterns("canon")
+
+    manufacturer['spec_sites'].append("example.com")
+    assert "example.com" not in spec_site_patterns("Canon")
+    assert get_manufacturer_info("Unknown Brand") is None
+    print("✅ Manufacturer info served from registry")
+
+
+def test_registry_loaded_once():
+    """The registry file is parsed once per process"""
+    load_registry.cache_clear()
+    for brand in ["Canon", "Sony", "Rode", "Nikon", "Aputure"]:
+        get_manufacturer_info(brand)
+    assert load_registry.cache_info().misses == 1
+    print("✅ Registry memoized")
+
+
+if __name__ == "__main__":
+    test_lookup_by_name_and_alias()
+    test_manufacturer_info()
+    test_registry_loaded_once()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test the OpenAI rate-limit governor with a fake client (no API calls)
+"""
+import sys
+import threading
+import time
+sys.path.append('api')
+
+from openai_governor import GovernedOpenAIClient, GovernorTimeout, OpenAIGovernor, RateBudget
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeRateLimitError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("Rate limit reached")
+        headers = {'retry-after': str(retry_after)} if retry_after is not None else {}
+        self.response = FakeResponse(429, headers)
+        self.status_code = 429
+
+
+class FakeOpenAIClient:
+    def __init__(self, failures=0, retry_after=None, delay=0.0):
+        self.failures = failures
+        self.retry_after = retry_after
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def transcribe_audio(self, audio_file):
+        with self.lock:
+            self.calls += 1
+            should_fail = self.failures > 0
+            if should_fail:
+                self.failures -= 1
+        if should_fail:
+            raise FakeRateLimitError(self.retry_after)
+        time.sleep(self.delay)
+        return f"transcript of {audio_file}"
+
+    def extract_equipment_data(self, transcription):
+        with self.lock:
+            self.calls += 1
+        return {"name": transcription}
+
+    def process_audio_to_form_data(self, audio_file):
+        return self.extract_equipment_data(self.transcribe_audio(audio_file))
+
+
+def make_governor(rpm=600, tpm=None, max_concurrency=4):
+    return OpenAIGovernor(
+        budgets={'transcription': RateBudget(rpm), 'chat': RateBudget(rpm, tpm)},
+        max_concurrency=max_concurrency,
+        base_backoff=0.01,
+        max_backoff=0.05,
+    )
+
+
+def test_retries_429_with_retry_after():
+    """A 429 is retried after Retry-After and the call eventually succeeds"""
+    governor = make_governor()
+    client = GovernedOpenAIClient(FakeOpenAIClient(failures=2, retry_after=0.05), governor, timeout=5)
+
+    started = time.monotonic()
+    result = client.transcribe_audio("a.webm")
+    elapsed = time.monotonic() - started
+
+    stats = governor.stats()
+    assert result == "transcript of a.webm"
+    assert stats['rate_limited'] == 2
+    assert stats['retries'] == 2
+    assert elapsed >= 0.1
+    assert stats['concurrency_limit'] < 4
+    print(f"✅ Retried through 429s in {elapsed:.2f}s: {stats}")
+
+
+def test_gives_up_at_deadline():
+    """Calls that keep hitting 429 fail once the deadline would be exceeded"""
+    governor = make_governor()
+    client = GovernedOpenAIClient(FakeOpenAIClient(failures=100, retry_after=1), governor, timeout=0.5)
+
+    try:
+        client.transcribe_audio("b.webm")
+    except FakeRateLimitError:
+        print("✅ Gave up on persistent 429 before the deadline")
+    else:
+        raise AssertionError("Expected the rate limit error to propagate")
+
+
+def test_requests_per_minute_budget_queues_calls():
+    """An exhausted request budget queues calls and reports the wait"""
+    governor = make_governor(rpm=60)  # one request per second once the bucket is empty
+    governor.budgets['transcription'].request_tokens = 0
+    client = GovernedOpenAIClient(FakeOpenAIClient(), governor, timeout=5)
+
+    client.transcribe_audio("c.webm")
+    stats = governor.stats()
+    assert stats['queue_wait_max'] >= 0.9
+    print(f"✅ Queued for {stats['queue_wait_max']:.2f}s under the RPM budget")
+
+
+def test_queue_deadline():
+    """A call that cannot be admitted in time raises GovernorTimeout"""
+    governor = make_governor(rpm=1)
+    governor.budgets['transcription'].request_tokens = 0
+    client = GovernedOpenAIClient(FakeOpenAIClient(), governor, timeout=0.2)
+
+    try:
+        client.transcribe_audio("d.webm")
+    except GovernorTimeout:
+        assert governor.stats()['timeouts'] == 1
+        print("✅ Deadline enforced while queued")
+    else:
+        raise AssertionError("Expected GovernorTimeout")
+
+
+def test_concurrency_limit():
+    """No more than max_concurrency calls run at once"""
+    governor = make_governor(max_concurrency=2)
+    fake = FakeOpenAIClient(delay=0.05)
+    client = GovernedOpenAIClient(fake, governor, timeout=5)
+
+    peak = [0]
+    original = governor._acquire
+
+    def tracking_acquire(*args, **kwargs):
+        wait = original(*args, **kwargs)
+        peak[0] = max(peak[0], governor._active)
+        return wait
+
+    governor._acquire = tracking_acquire
+    threads = [threading.Thread(target=client.transcribe_audio, args=(f"{i}.webm",)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert fake.calls == 8
+    assert peak[0] <= 2
+    print(f"✅ Peak concurrency {peak[0]} with limit 2")
+
+
+def test_audio_pipeline_charges_both_budgets():
+    """process_audio_to_form_data is admitted against the Whisper and chat budgets"""
+    governor = make_governor(rpm=60, tpm=100000)
+    client = GovernedOpenAIClient(FakeOpenAIClient(), governor, timeout=5)
+
+    client.process_audio_to_form_data("e.webm")
+    transcription = governor.budgets['transcription']
+    chat = governor.budgets['chat']
+    assert transcription.request_tokens < 60 and chat.request_tokens < 60
+    assert chat.token_tokens <= 100000 - 1000
+
+    # An empty chat bucket holds the audio pipeline back as well
+    chat.request_tokens = 0
+    client.timeout = 0.2
+    try:
+        client.process_audio_to_form_data("f.webm")
+    except GovernorTimeout:
+        print("✅ Audio pipeline charged against transcription and chat budgets")
+    else:
+        raise AssertionError("Expected GovernorTimeout while the chat budget is empty")
+
+
+if __name__ == "__main__":
+    test_retries_429_with_retry_after()
+    test_gives_up_at_deadline()
+    test_requests_per_minute_budget_queues_calls()
+    test_queue_deadline()
+    test_concurrency_limit()
+    test_audio_pipeline_charges_both_budgets()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test the listing query planner against firestore.indexes.json
+"""
+import json
+import os
+import sys
+import tempfile
+sys.path.append('api')
+
+from query_planner import UnindexedQueryError, missing_index_definitions, plan_query
+
+ORDER = [('created_at', 'DESCENDING')]
+
+
+class FakeQuery:
+    def __init__(self, calls=None):
+        self.calls = calls or []
+
+    def where(self, field, op, value):
+        return FakeQuery(self.calls + [('where', field, op, value)])
+
+    def order_by(self, field, direction):
+        return FakeQuery(self.calls + [('order_by', field, direction)])
+
+
+def write_indexes(indexes):
+    handle = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+    json.dump({'indexes': indexes, 'fieldOverrides': []}, handle)
+    handle.close()
+    return handle.name
+
+
+def index(collection, *fields):
+    return {
+        'collectionGroup': collection,
+        'queryScope': 'COLLECTION',
+        'fields': [{'fieldPath': name, 'order': order} for name, order in fields],
+    }
+
+
+def test_inventory_filter_combinations_are_indexed():
+    """Every filter combination api.getInventory can send runs server-side"""
+    for filters in [{}, {'sku_id': 'a'}, {'status': 'available'}, {'condition': 'good'},
+                    {'sku_id': 'a', 'status': 'booked'}, {'status': 'available', 'condition': 'good'},
+                    {'sku_id': 'a', 'status': 'available', 'condition': 'fair'}]:
+        plan = plan_query('inventory', filters, ORDER)
+        assert plan.status == 'indexed', filters
+        assert plan.server_filters == filters
+    print("✅ Inventory listing plans are indexed")
+
+
+def test_apply_builds_server_query():
+    """Indexed plans become where/order_by calls on the Firestore query"""
+    plan = plan_query('skus', {'category': 'cameras'}, ORDER)
+    query = plan.apply(FakeQuery())
+    assert query.calls == [('where', 'category', '==', 'cameras'), ('order_by', 'created_at', 'DESCENDING')]
+    print("✅ Plan applied to query")
+
+
+def test_unindexed_plan_is_rewritten_or_rejected():
+    """Unindexed shapes fall back to an indexed subset plus residual filters"""
+    path = write_indexes([index('inventory', ('status', 'ASCENDING'), ('created_at', 'DESCENDING'))])
+    try:
+        plan = plan_query('inventory', {'status': 'available', 'location': 'A3'}, ORDER, indexes_path=path)
+        assert plan.status == 'rewritten'
+        assert plan.server_filters == {'status': 'available'}
+        assert plan.client_filters == {'location': 'A3'}
+
+        items = [{'location': 'A3', 'created_at': 1}, {'location': 'B1', 'created_at': 2}]
+        assert plan.filter_results(items) == [{'location': 'A3', 'created_at': 1}]
+
+        plan = plan_query('inventory', {'location': 'A3'}, ORDER, indexes_path=path)
+        assert plan.order_by == () and plan.client_order == tuple(map(tuple, ORDER))
+        sorted_items = plan.filter_results([{'created_at': 1}, {'created_at': 3}, {'created_at': 2}])
+        assert [item['created_at'] for item in sorted_items] == [3, 2, 1]
+
+        try:
+            plan_query('inventory', {'location': 'A3'}, ORDER, strict=True, indexes_path=path)
+        except UnindexedQueryError:
+            pass
+        else:
+            raise AssertionError("Expected strict mode to reject the plan")
+    finally:
+        os.unlink(path)
+    print("✅ Unindexed plans rewritten or rejected")
+
+
+def test_missing_index_generation_uses_merging():
+    """One index per equality field is generated so merged indexes cover combinations"""
+    path = write_indexes([])
+    try:
+        shapes = [{'collection': 'inventory', 'filters': ['sku_id', 'status'], 'order_by': [['created_at', 'DESCENDING']]},
+                  {'collection': 'inventory', 'filters': ['status'], 'order_by': [['created_at', 'DESCENDING']]}]
+        definitions = missing_index_definitions(shapes, path)
+        assert [d['fields'][0]['fieldPath'] for d in definitions] == ['sku_id', 'status']
+    finally:
+        os.unlink(path)
+    print("✅ Missing index definitions generated")
+
+
+if __name__ == "__main__":
+    test_inventory_filter_combinations_are_indexed()
+    test_apply_builds_server_query()
+    test_unindexed_plan_is_rewritten_or_rejected()
+    test_missing_index_generation_uses_merging()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test JSON response encoding and the fields= projection parameter
+"""
+import gzip
+import json
+import sys
+from datetime import datetime, timezone
+sys.path.append('api')
+
+from responses import encode_body, parse_accept_encoding, parse_fields, to_json_bytes
+
+
+def test_compression_negotiation():
+    """Large bodies are gzipped when accepted; small ones and q=0 are left alone"""
+    body = to_json_bytes({'items': [{'name': 'Canon EOS R5', 'created_at': datetime(2026, 1, 1, tzinfo=timezone.utc)}] * 100})
+    encoded, encoding = encode_body(body, 'gzip, deflate')
+    assert encoding == 'gzip'
+    assert json.loads(gzip.decompress(encoded))['items'][0]['created_at'] == '2026-01-01T00:00:00+00:00'
+
+    assert encode_body(body, 'gzip;q=0') == (body, None)
+    assert encode_body(b'{"success":true}', 'gzip') == (b'{"success":true}', None)
+    assert parse_accept_encoding('br;q=1.0, gzip;q=0') == {'br'}
+    print("✅ Compression negotiation")
+
+
+def test_parse_fields():
+    """Missing fields mean the slim default; * means whole documents"""
+    default = ['name', 'brand']
+    assert parse_fields(None, default) == ['name', 'brand']
+    assert parse_fields('*', default) is None
+    assert parse_fields('name, specifications,', default) == ['name', 'specifications']
+    print("✅ fields= parsing")
+
+
+if __name__ == "__main__":
+    test_compression_negotiation()
+    test_parse_fields()
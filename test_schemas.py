@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test payload models (casing, coercion, validation) and the response encoder
+"""
+import json
+import sys
+from datetime import datetime, timezone
+sys.path.append('api')
+
+from responses import to_json_bytes
+from schemas import InventoryPayload, SkuPayload, ValidationError, parse_equipment_form
+
+
+def test_camel_and_snake_case_forms():
+    """EquipmentForm and extraction payloads normalize to the stored snake_case shape"""
+    sku, unit = parse_equipment_form({
+        'name': 'Sony FX6', 'brand': 'Sony', 'model': 'FX6', 'category': 'Cameras',
+        'pricePerDay': '3,500', 'security_deposit': 50000,
+        'serialNumber': 'FX6789012', 'purchasePrice': '₹450000', 'condition': 'Good',
+        'confidence': 0.9,
+    })
+    assert sku.to_dict() == {
+        'name': 'Sony FX6', 'brand': 'Sony', 'model': 'FX6', 'category': 'cameras',
+        'price_per_day': 3500, 'security_deposit': 50000, 'is_active': True,
+    }
+    assert unit.to_dict() == {
+        'serial_number': 'FX6789012', 'condition': 'good', 'status': 'available', 'purchase_price': 450000,
+    }
+    print("✅ camelCase and snake_case normalization")
+
+
+def test_validation_errors():
+    """Bad enums, prices and missing required fields are reported together"""
+    try:
+        InventoryPayload.parse({'condition': 'broken', 'currentValue': -1, 'status': 'booked'})
+    except ValidationError as e:
+        assert set(e.errors) == {'sku_id', 'condition', 'current_value'}
+    else:
+        raise AssertionError("Expected ValidationError")
+
+    update = SkuPayload.parse({'pricePerDay': 2500}, partial=True)
+    assert update.to_dict() == {'price_per_day': 2500}
+    print("✅ Validation errors")
+
+
+def test_encoder_handles_firestore_types():
+    """Timestamp subclasses, sets and GeoPoint-like values encode without a custom caller"""
+    class DatetimeWithNanoseconds(datetime):
+        pass
+
+    class GeoPoint:
+        latitude, longitude = 12.97, 77.59
+
+    body = to_json_bytes({
+        'created_at': DatetimeWithNanoseconds(2026, 1, 1, tzinfo=timezone.utc),
+        'tags': {'rental'},
+        'warehouse': GeoPoint(),
+        'name': 'Rode VideoMic Pro+ ₹',
+    })
+    assert json.loads(body) == {
+        'created_at': '2026-01-01T00:00:00+00:00',
+        'tags': ['rental'],
+        'warehouse': {'latitude': 12.97, 'longitude': 77.59},
+        'name': 'Rode VideoMic Pro+ ₹',
+    }
+    print("✅ Firestore types encoded")
+
+
+if __name__ == "__main__":
+    test_camel_and_snake_case_forms()
+    test_validation_errors()
+    test_encoder_handles_firestore_types()
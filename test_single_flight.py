@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test single-flight coalescing of identical OpenAI calls with a fake client (no API calls)
+"""
+import sys
+import threading
+import time
+sys.path.append('api')
+
+from single_flight import SingleFlight, SingleFlightOpenAIClient, request_key
+
+
+class SlowClient:
+    def __init__(self, delay=0.1, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def transcribe_audio(self, audio):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("Whisper unavailable")
+        return f"transcript of {len(audio)} bytes"
+
+    def extract_equipment_data(self, transcription):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"name": transcription}
+
+
+def run_concurrently(func, count):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(func())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_identical_calls_share_one_execution():
+    """Concurrent identical requests run once and every caller gets the result"""
+    fake = SlowClient()
+    flight = SingleFlight()
+    client = SingleFlightOpenAIClient(fake, flight)
+
+    results, errors = run_concurrently(lambda: client.transcribe_audio(b'audio-bytes'), 5)
+
+    assert not errors
+    assert fake.calls == 1
+    assert results == ["transcript of 11 bytes"] * 5
+    assert flight.stats() == {'calls': 5, 'coalesced': 4, 'in_flight': 0}
+    print(f"✅ 5 identical calls ran once: {flight.stats()}")
+
+
+def test_different_inputs_and_later_calls_run():
+    """Different inputs are not coalesced, and a finished call is not cached"""
+    fake = SlowClient(delay=0.0)
+    client = SingleFlightOpenAIClient(fake, SingleFlight())
+
+    client.extract_equipment_data("Canon R5")
+    client.extract_equipment_data("Sony FX3")
+    client.extract_equipment_data("Canon R5")
+
+    assert fake.calls == 3
+    assert request_key('transcribe_audio', b'a') != request_key('extract_equipment_data', b'a')
+    print("✅ Distinct and sequential calls each executed")
+
+
+def test_errors_reach_every_waiter():
+    """A failing call raises for all coalesced callers and clears the key"""
+    fake = SlowClient(fail=True)
+    flight = SingleFlight()
+    client = SingleFlightOpenAIClient(fake, flight)
+
+    results, errors = run_concurrently(lambda: client.transcribe_audio(b'x'), 3)
+
+    assert not results
+    assert len(errors) == 3 and all(isinstance(e, RuntimeError) for e in errors)
+    assert fake.calls == 1
+    assert flight.stats()['in_flight'] == 0
+    print("✅ Error shared by all coalesced callers")
+
+
+if __name__ == "__main__":
+    test_identical_calls_share_one_execution()
+    test_different_inputs_and_later_calls_run()
+    test_errors_reach_every_waiter()
+    print("\n🎉 Single-flight tests passed!")
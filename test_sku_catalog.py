@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the warm-instance SKU catalog (lookups, ordering, watermark refresh)
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+sys.path.append('api')
+
+import pytest
+
+import sku_catalog
+from sku_catalog import SkuCatalog, get_sku_catalog
+from conftest import FakeDB
+from warm_cache import WarmInstance
+
+NOW = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+
+def sku(name, brand, model, category, minutes):
+    return {'name': name, 'brand': brand, 'model': model, 'category': category,
+            'specifications': {'sensor': 'Full-frame'}, 'created_at': NOW + timedelta(minutes=minutes)}
+
+
+def test_lookups_and_ordering():
+    """Listings are newest first; brand+model lookups ignore case, brand prefixes and aliases"""
+    db = FakeDB({'skus': {
+        'r5': sku('Canon EOS R5', 'Canon', 'Canon EOS R5', 'cameras', 1),
+        'fx6': sku('Sony FX6', 'Sony', 'FX6', 'cameras', 2),
+        'mic': sku('Rode VideoMic', 'Rode', 'VideoMic Pro+', 'audio', 3),
+    }})
+    catalog = SkuCatalog()
+    catalog.load(db)
+
+    assert [item['id'] for item in catalog.list()] == ['mic', 'fx6', 'r5']
+    assert [item['id'] for item in catalog.list(category='cameras')] == ['fx6', 'r5']
+    assert catalog.categories() == ['audio', 'cameras']
+    assert catalog.find('canon', 'eos r5')['id'] == 'r5'
+    assert catalog.find('Sony', 'Sony  FX6')['id'] == 'fx6'
+    assert catalog.get('fx6', fields=['name']) == {'name': 'Sony FX6', 'id': 'fx6'}
+    assert catalog.get('missing') is None
+    print("✅ Catalog lookups and ordering")
+
+
+def test_watermark_refresh():
+    """Refresh queries only changed SKUs and re-indexes moved categories and models"""
+    docs = {
+        'r5': sku('Canon EOS R5', 'Canon', 'EOS R5', 'cameras', 1),
+        'fx6': sku('Sony FX6', 'Sony', 'FX6', 'cameras', 2),
+    }
+    db = FakeDB({'skus': docs})
+    catalog = SkuCatalog()
+    catalog.load(db)
+    assert catalog.watermark == NOW + timedelta(minutes=2)
+
+    docs['r5'] = dict(docs['r5'], model='EOS R5 C', category='cinema', updated_at=NOW + timedelta(minutes=5))
+    docs['light'] = sku('Aputure 600d', 'Aputure', 'LS 600d', 'lighting', 6)
+    db.queries.clear()
+    catalog.refresh(db)
+
+    assert db.queries == [('skus', [('updated_at', NOW + timedelta(minutes=2))]),
+                          ('skus', [('created_at', NOW + timedelta(minutes=2))])]
+    assert catalog.categories() == ['cameras', 'cinema', 'lighting']
+    assert catalog.find('Canon', 'EOS R5') is None
+    assert catalog.find('Canon', 'EOS R5 C')['category'] == 'cinema'
+    assert len(catalog) == 3
+    print("✅ Watermark refresh")
+
+
+def test_failed_refresh_keeps_watermark():
+    """A SKU created while the created_at query fails is applied on the next refresh"""
+    docs = {'fx6': sku('Sony FX6', 'Sony', 'FX6', 'cameras', 2)}
+    db = FakeDB({'skus': docs})
+    catalog = SkuCatalog()
+    catalog.load(db)
+
+    docs['light'] = sku('Aputure 600d', 'Aputure', 'LS 600d', 'lighting', 3)
+    docs['fx6'] = dict(docs['fx6'], updated_at=NOW + timedelta(minutes=4))
+    db.failing.add(('skus', 'created_at'))
+    with pytest.raises(RuntimeError):
+        catalog.refresh(db)
+    assert catalog.watermark == NOW + timedelta(minutes=2)
+
+    db.failing.clear()
+    catalog.refresh(db)
+    assert catalog.find('Aputure', 'LS 600d')['id'] == 'light'
+    assert catalog.watermark == NOW + timedelta(minutes=4)
+    print("✅ Failed refresh left the watermark for the next refresh")
+
+
+def test_failed_cold_load_is_retried(monkeypatch):
+    """A failed first load is not cached; the next call loads the catalog"""
+    monkeypatch.setattr(sku_catalog, '_catalog', WarmInstance(SkuCatalog))
+    db = FakeDB({'skus': {'fx6': sku('Sony FX6', 'Sony', 'FX6', 'cameras', 2)}}, failures=1)
+
+    try:
+        get_sku_catalog(db)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Expected the first load to fail")
+
+    catalog = get_sku_catalog(db)
+    assert catalog.find('Sony', 'FX6')['id'] == 'fx6'
+    assert get_sku_catalog(db) is catalog
+    print("✅ Failed cold load retried on the next call")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-s', '-q']))
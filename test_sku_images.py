@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test SKU thumbnail keys, the local image store and staleness checks
+"""
+import shutil
+import sys
+import tempfile
+sys.path.append('api')
+
+from sku_images import (THUMBNAIL_SIZES, LocalImageStore, content_hash, needs_thumbnails,
+                        thumbnail_key, thumbnail_urls)
+
+
+def test_store_and_urls():
+    """Thumbnail URLs are only returned once every size is in the store"""
+    root = tempfile.mkdtemp()
+    try:
+        store = LocalImageStore(root, '/thumbnails/')
+        digest = content_hash(b'fake image bytes')
+        assert thumbnail_key(digest, 96) == f"{digest[:2]}/{digest}-96.webp"
+
+        for size in THUMBNAIL_SIZES[:-1]:
+            store.put(thumbnail_key(digest, size), b'webp')
+        assert thumbnail_urls(store, digest) is None
+
+        url = store.put(thumbnail_key(digest, THUMBNAIL_SIZES[-1]), b'webp')
+        assert url == f"/thumbnails/{digest[:2]}/{digest}-{THUMBNAIL_SIZES[-1]}.webp"
+        assert set(thumbnail_urls(store, digest)) == {str(size) for size in THUMBNAIL_SIZES}
+        print("✅ Local store and thumbnail URLs")
+    finally:
+        shutil.rmtree(root)
+
+
+def test_needs_thumbnails():
+    """SKUs are reprocessed only when the image is new or changed"""
+    sizes = {str(size): f'/thumbnails/{size}.webp' for size in THUMBNAIL_SIZES}
+    assert not needs_thumbnails({'image_url': ''})
+    assert needs_thumbnails({'image_url': 'https://example.com/r5.jpg'})
+    assert not needs_thumbnails({'image_url': 'https://example.com/r5.jpg', 'thumbnails': sizes,
+                                 'thumbnail_source': 'https://example.com/r5.jpg'})
+    assert needs_thumbnails({'image_url': 'https://example.com/r5-new.jpg', 'thumbnails': sizes,
+                             'thumbnail_source': 'https://example.com/r5.jpg'})
+    print("✅ Staleness checks")
+
+
+if __name__ == "__main__":
+    test_store_and_urls()
+    test_needs_thumbnails()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test collection snapshots (sharding, manifest, type round-trip) and restore
+"""
+import gzip
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+sys.path.append('api')
+
+from conftest import FakeDB, FakeRef
+import snapshot_database
+from snapshots import load_manifest, restore_shard, snapshot_collection, verify_shard, write_manifest
+
+
+def test_snapshot_and_restore_round_trip():
+    """Documents come back identical, including timestamps, bytes and references"""
+    source = FakeDB()
+    created = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+    source.data['inventory'] = {
+        f'unit{i:03d}': {
+            'serial_number': f'SN{i}', 'created_at': created, 'photo': b'\x89PNG',
+            'sku': FakeRef(source, 'skus/r5'), 'specs': {'sensor': 'Full-frame', 'weights': [1, 2.5]},
+        }
+        for i in range(25)
+    }
+
+    directory = tempfile.mkdtemp()
+    try:
+        entry = snapshot_collection(source, 'inventory', directory, shard_size=10, page_size=4)
+        assert entry['documents'] == 25
+        assert [shard['documents'] for shard in entry['shards']] == [10, 10, 5]
+        assert max(source.pages) == 4
+        write_manifest(directory, {'inventory': entry})
+
+        target = FakeDB()
+        manifest = load_manifest(directory)
+        for shard in manifest['collections']['inventory']['shards']:
+            restore_shard(target, 'inventory', directory, shard, batch_size=4)
+        assert max(target.commits) == 4
+
+        restored = target.data['inventory']
+        assert set(restored) == set(source.data['inventory'])
+        unit = restored['unit007']
+        assert unit['created_at'] == created
+        assert unit['photo'] == b'\x89PNG'
+        assert unit['sku'].path == 'skus/r5'
+        assert unit['specs'] == {'sensor': 'Full-frame', 'weights': [1, 2.5]}
+        print("✅ Snapshot round-trip")
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_restore_rejects_corrupt_shard():
+    """A shard that no longer matches its checksum is not restored"""
+    source = FakeDB({'skus': {'r5': {'name': 'Canon EOS R5'}}})
+    directory = tempfile.mkdtemp()
+    try:
+        entry = snapshot_collection(source, 'skus', directory)
+        shard = entry['shards'][0]
+        with open(os.path.join(directory, shard['file']), 'ab') as f:
+            f.write(b'garbage')
+        try:
+            restore_shard(FakeDB(), 'skus', directory, shard)
+        except ValueError:
+            print("✅ Corrupt shard rejected")
+        else:
+            raise AssertionError("Expected ValueError")
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_verify_rejects_truncated_shards():
+    """Shards whose document count or gzip stream is short fail verification"""
+    source = FakeDB({'skus': {f'sku{i}': {'name': f'SKU {i}'} for i in range(5)}})
+    directory = tempfile.mkdtemp()
+    try:
+        shard = snapshot_collection(source, 'skus', directory)['shards'][0]
+        path = os.path.join(directory, shard['file'])
+        assert verify_shard(directory, shard) == 5
+
+        # A shard rewritten with a line missing, checksum updated to match
+        with gzip.open(path, 'rb') as f:
+            lines = f.readlines()
+        with gzip.open(path, 'wb') as f:
+            f.writelines(lines[:-1])
+        with open(path, 'rb') as f:
+            short = dict(shard, sha256=hashlib.sha256(f.read()).hexdigest())
+        try:
+            verify_shard(directory, short)
+        except ValueError as e:
+            assert 'has 4 documents' in str(e)
+        else:
+            raise AssertionError("Expected a document count mismatch")
+
+        # A gzip stream cut off part way, in a manifest without checksums
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        try:
+            verify_shard(directory, dict(shard, sha256=None))
+        except ValueError as e:
+            assert 'cannot be read' in str(e)
+        else:
+            raise AssertionError("Expected an unreadable shard")
+        print("✅ Truncated shards fail verification")
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_restore_verifies_every_shard_before_clearing():
+    """restore --clear stops before clearing or writing anything when one shard is corrupt"""
+    source = FakeDB({
+        'skus': {'r5': {'name': 'Canon EOS R5'}},
+        'inventory': {f'unit{i}': {'sku_id': 'r5'} for i in range(3)},
+    })
+    directory = tempfile.mkdtemp()
+    try:
+        entries = {name: snapshot_collection(source, name, directory) for name in ('skus', 'inventory')}
+        write_manifest(directory, entries)
+        with open(os.path.join(directory, entries['inventory']['shards'][0]['file']), 'ab') as f:
+            f.write(b'garbage')
+
+        target = FakeDB({'skus': {'live': {'name': 'Live SKU'}}})
+        try:
+            snapshot_database.restore(target, directory, None, workers=2, clear=True)
+        except SystemExit as e:
+            assert 'inventory-00000' in str(e)
+        else:
+            raise AssertionError("Expected the restore to stop")
+        assert target.commits == []
+        assert target.data['skus'] == {'live': {'name': 'Live SKU'}}  # not cleared
+        print("✅ Corrupt shard found before anything was cleared or written")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    test_snapshot_and_restore_round_trip()
+    test_restore_rejects_corrupt_shard()
+    test_verify_rejects_truncated_shards()
+    test_restore_verifies_every_shard_before_clearing()
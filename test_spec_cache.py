@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test spec cache key normalization, source freshness and LRU behaviour (in-memory Firestore fake)
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+sys.path.append('api')
+
+from conftest import FakeDB
+from spec_cache import SPEC_CACHE_COLLECTION, SpecCache, cache_document_id, merge_sources, normalize_key
+
+
+class CountingScraper:
+    def __init__(self, specs):
+        self.specs = specs
+        self.queries = []
+
+    def search_equipment_specs(self, query):
+        self.queries.append(query)
+        return self.specs
+
+
+def test_normalize_key():
+    """Brand prefixes, casing and punctuation do not change the key"""
+    assert normalize_key("Canon", "EOS R5") == ("canon", "eos r5")
+    assert normalize_key("canon", "Canon EOS-R5") == ("canon", "eos r5")
+    assert normalize_key(" CANON ", "eos  r5 ") == ("canon", "eos r5")
+    assert cache_document_id("Canon", "70-200mm f/2.8L") == "canon__70-200mm-f_2.8l"
+    print("✅ Keys normalized")
+
+
+def test_merge_sources_respects_freshness_and_priority():
+    """Stale sources are ignored and reviewed SKU specs beat scraped ones"""
+    now = datetime.now(timezone.utc)
+    sources = {
+        'web': {'specifications': {'resolution': '45MP', 'weight': '738g'}, 'fetched_at': now},
+        'skus': {'specifications': {'resolution': '45 megapixels'}, 'fetched_at': now},
+    }
+    assert merge_sources(sources) == {'resolution': '45 megapixels', 'weight': '738g'}
+
+    sources['web']['fetched_at'] = now - timedelta(days=60)
+    assert merge_sources(sources) == {'resolution': '45 megapixels'}
+
+    sources['skus']['fetched_at'] = now - timedelta(days=400)
+    assert merge_sources(sources) is None
+    print("✅ Freshness and priority applied")
+
+
+def test_cache_skips_scraper_on_repeat_models():
+    """Only the first lookup of a model reaches the scraper"""
+    cache = SpecCache(use_firestore=False)
+    scraper = CountingScraper({'sensor': 'Full frame'})
+
+    cache.search_equipment_specs(scraper, "Canon", "EOS R5")
+    cache.search_equipment_specs(scraper, "Canon", "Canon EOS R5")
+    cache.search_equipment_specs(scraper, "canon", "eos-r5")
+
+    assert scraper.queries == ["Canon EOS R5 specifications"]
+    assert cache.hits == 2
+    print("✅ Repeat models served from cache")
+
+
+def test_seed_and_lru_eviction():
+    """Seeded SKUs are cache hits and the LRU stays bounded"""
+    cache = SpecCache(max_entries=2, use_firestore=False)
+    seeded = cache.seed_from_skus([
+        {'brand': 'Sony', 'model': 'FX6', 'specifications': {'iso': 'Dual base'}},
+        {'brand': 'Rode', 'model': 'VideoMic Pro+', 'specifications': {'battery': 'Built-in'}},
+        {'brand': 'Aputure', 'model': '600d', 'specifications': {}},
+        {'brand': 'Canon', 'model': 'EOS R5', 'specifications': {'sensor': 'Full frame'}},
+    ])
+
+    assert seeded == 3
+    assert cache.get("Sony", "FX6") is None  # evicted
+    assert cache.get("Canon", "EOS R5") == {'sensor': 'Full frame'}
+    print("✅ Seeded entries cached with bounded LRU")
+
+
+def test_stale_local_entry_checks_firestore():
+    """A stale LRU entry does not hide fresh specs another instance wrote to Firestore"""
+    db = FakeDB()
+    cache = SpecCache(db=db)
+    scraper = CountingScraper({'sensor': 'Full frame (scraped)'})
+    cache.put("Canon", "EOS R5", {'sensor': 'Full frame'}, source='web')
+    stale = datetime.now(timezone.utc) - timedelta(days=60)
+    cache._entries[normalize_key("Canon", "EOS R5")]['web']['fetched_at'] = stale
+
+    # Meanwhile the spec worker refreshed the shared document
+    doc_id = cache_document_id("Canon", "EOS R5")
+    db.data[SPEC_CACHE_COLLECTION][doc_id]['sources'] = {
+        'web': {'specifications': {'sensor': 'Full frame', 'ibis': '8 stops'}, 'fetched_at': datetime.now(timezone.utc)},
+    }
+
+    assert cache.search_equipment_specs(scraper, "Canon", "EOS R5") == {'sensor': 'Full frame', 'ibis': '8 stops'}
+    assert scraper.queries == []
+    print("✅ Stale local entry refreshed from Firestore instead of scraping")
+
+
+def test_stale_everywhere_scrapes_again():
+    """When Firestore is stale too, the model is scraped and stored again"""
+    db = FakeDB()
+    cache = SpecCache(db=db)
+    stale = datetime.now(timezone.utc) - timedelta(days=60)
+    db.collection(SPEC_CACHE_COLLECTION).document(cache_document_id("Sony", "FX3")).set({
+        'sources': {'web': {'specifications': {'sensor': 'old'}, 'fetched_at': stale}},
+    })
+    scraper = CountingScraper({'sensor': 'Full frame'})
+
+    assert cache.search_equipment_specs(scraper, "Sony", "FX3") == {'sensor': 'Full frame'}
+    assert scraper.queries == ["Sony FX3 specifications"]
+    stored = db.data[SPEC_CACHE_COLLECTION][cache_document_id("Sony", "FX3")]
+    assert stored['sources']['web']['specifications'] == {'sensor': 'Full frame'}
+    print("✅ Stale everywhere: scraped again and stored")
+
+
+if __name__ == "__main__":
+    test_normalize_key()
+    test_merge_sources_respects_freshness_and_priority()
+    test_cache_skips_scraper_on_repeat_models()
+    test_seed_and_lru_eviction()
+    test_stale_local_entry_checks_firestore()
+    test_stale_everywhere_scrapes_again()
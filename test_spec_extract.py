@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test streaming spec extraction on the saved fixture pages (no network)
+"""
+import os
+import sys
+sys.path.append('api')
+
+from conftest import local_server
+from spec_extract import SpecExtractor, extract_specs, fetch_specs
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'spec_pages')
+PADDING = '<div class="review"><p>Great camera, would rent again.</p><ul><li>video</li></ul></div>\n'
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def chunked(data, size=97):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def test_spec_table_rows():
+    specs = extract_specs(chunked(fixture('manufacturer_table.html')))
+    assert specs['Sensor Type'] == 'Full-frame CMOS'
+    assert specs['Image Stabilization'] == '5-axis in-body, up to 8 stops'  # trailing colon dropped
+    assert specs['Weight'] == 'Approx. 738 g (body only)'
+    assert 'Kit' not in specs and 'Body only' not in specs  # three-column pricing grid skipped
+    print("✅ Two-cell table rows extracted, pricing grids skipped")
+
+
+def test_definition_list_and_json_ld():
+    specs = extract_specs(chunked(fixture('retailer_dl_jsonld.html')))
+    assert specs['Brand'] == 'Sony'
+    assert specs['Weight'] == '640 g'
+    assert specs['Max Frame Rate'] == '120 fps'
+    assert specs['Sensor Size'] == 'Full Frame'  # JSON-LD came first, the dl duplicate is ignored
+    assert specs['Audio Inputs'] == '2x XLR via top handle'
+    print("✅ Definition lists and JSON-LD Product properties extracted")
+
+
+def test_json_ld_graph_and_invalid_json():
+    specs = extract_specs(chunked(fixture('jsonld_graph.html')))
+    assert specs['Brand'] == 'RODE'
+    assert specs['Power Options'] == 'LB-1 battery, 2x AA, Micro USB'
+    assert specs['Output Connection'] == '3.5mm TRS'
+    assert 'name' not in specs
+    print("✅ Product found inside @graph; invalid JSON-LD ignored")
+
+
+def test_tree_is_discarded_while_parsing():
+    page = fixture('manufacturer_table.html').replace(b'</body>', PADDING.encode() * 5000 + b'</body>')
+    extractor = SpecExtractor(max_bytes=len(page))
+    for chunk in chunked(page, 4096):
+        extractor.feed(chunk)
+    specs = extractor.close()
+    assert len(specs) == 10
+    assert sum(1 for _ in extractor.root.iter()) < 50
+    print("✅ Parsed elements are discarded as the page streams")
+
+
+def test_byte_cap_stops_reading():
+    page = fixture('manufacturer_table.html').replace(b'<main>', PADDING.encode() * 2000 + b'<main>')
+    extractor = SpecExtractor(max_bytes=64 * 1024)
+    for chunk in chunked(page, 4096):
+        extractor.feed(chunk)
+        if extractor.full:
+            break
+    assert extractor.bytes_read == 64 * 1024
+    assert extractor.close() == {}  # the spec table sits past the cap
+    print("✅ Reading stops at the byte cap")
+
+
+def test_fetch_specs_streams_from_server():
+    with local_server({'/fx3': (200, fixture('retailer_dl_jsonld.html'))}) as server:
+        specs = fetch_specs(server.url('/fx3'))
+    assert specs['Model'] == 'ILME-FX3'
+    print("✅ fetch_specs streams a page through the extractor")
+
+
+if __name__ == "__main__":
+    test_spec_table_rows()
+    test_definition_list_and_json_ld()
+    test_json_ld_graph_and_invalid_json()
+    test_tree_is_discarded_while_parsing()
+    test_byte_cap_stops_reading()
+    test_fetch_specs_streams_from_server()
+    print("\n🎉 Spec extraction tests passed!")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test the spec-research job queue (leases, retries, lost leases, SKU linking)
+against an in-memory Firestore fake
+"""
+import sys
+import time
+from datetime import timedelta
+sys.path.append('api')
+
+import pytest
+
+import spec_jobs
+from conftest import FakeDB
+from spec_jobs import (LeaseHeartbeat, attach_sku, complete_job, enqueue_spec_job, fail_job,
+                       get_spec_job, lease_next_job, renew_lease)
+
+
+
+@pytest.fixture(autouse=True)
+def transactions(monkeypatch):
+    """The fake transaction applies writes directly (no contention to retry); returns the names run"""
+    names = []
+
+    def run(db, func, *args):
+        names.append(func.__name__)
+        return func(db.transaction(), *args)
+
+    monkeypatch.setattr(spec_jobs, '_transactional', run)
+    return names
+
+
+def expire_lease(db, job_id):
+    job = db.data['jobs'][job_id]
+    job['lease_expires_at'] = job['lease_expires_at'] - timedelta(hours=1)
+
+
+def test_lease_complete_and_merge(transactions):
+    """A leased job completes and merges specs into the SKU without overwriting reviewer values"""
+    db = FakeDB()
+    db.collection('skus').document('sku1').set({'specifications': {'mount': 'RF (reviewed)'}})
+    job_id = enqueue_spec_job(db, 'Canon', 'EOS R5', sku_id='sku1')
+
+    job = lease_next_job(db, 'worker-a')
+    assert job['id'] == job_id and job['attempts'] == 1
+    assert lease_next_job(db, 'worker-b') is None  # leased, not expired
+
+    assert complete_job(db, job, {'mount': 'RF', 'sensor': 'Full-frame'})
+    assert db.data['skus']['sku1']['specifications'] == {'mount': 'RF (reviewed)', 'sensor': 'Full-frame'}
+    assert get_spec_job(db, job_id)['status'] == 'done'
+    assert transactions[-2:] == ['complete', 'merge']  # the SKU read-modify-write is transactional
+    print("✅ Job leased, completed and merged into the SKU")
+
+
+def test_attach_after_completion_merges():
+    """Linking a SKU to a finished job merges its specs immediately"""
+    db = FakeDB()
+    db.collection('skus').document('sku2').set({'specifications': {}})
+    job_id = enqueue_spec_job(db, 'Sony', 'FX3')
+    job = lease_next_job(db, 'worker-a')
+    complete_job(db, job, {'sensor': 'Full-frame'})
+
+    merged = attach_sku(db, job_id, 'sku2')
+    assert merged == {'sensor': 'Full-frame'}
+    assert db.data['jobs'][job_id]['sku_id'] == 'sku2'
+    assert attach_sku(db, 'missing', 'sku2') is None
+    print("✅ attach_sku merged the finished job's specs")
+
+
+def test_stale_worker_cannot_overwrite():
+    """After a lease expires and is re-leased, the old worker's writes are rejected"""
+    db = FakeDB()
+    job_id = enqueue_spec_job(db, 'DJI', 'Ronin 4D')
+    stale = lease_next_job(db, 'worker-a')
+    expire_lease(db, job_id)
+    current = lease_next_job(db, 'worker-b')
+    assert current['attempts'] == 2
+
+    assert not complete_job(db, stale, {'weight': 'wrong'})
+    assert not fail_job(db, stale, RuntimeError("timed out"))
+    assert db.data['jobs'][job_id]['status'] == 'running'
+    assert db.data['jobs'][job_id]['lease_owner'] == 'worker-b'
+
+    assert complete_job(db, current, {'weight': '4.6 kg'})
+    assert db.data['jobs'][job_id]['result'] == {'weight': '4.6 kg'}
+    print("✅ Stale worker's result and failure were discarded")
+
+
+def test_crashing_job_fails_after_max_attempts():
+    """A job whose worker keeps dying is marked failed once attempts run out"""
+    db = FakeDB()
+    job_id = enqueue_spec_job(db, 'Aputure', '600d')
+    for attempt in range(1, spec_jobs.MAX_ATTEMPTS + 1):
+        job = lease_next_job(db, f'worker-{attempt}')
+        assert job['attempts'] == attempt
+        expire_lease(db, job_id)
+
+    assert lease_next_job(db, 'worker-last') is None
+    job = db.data['jobs'][job_id]
+    assert job['status'] == 'failed' and job['attempts'] == spec_jobs.MAX_ATTEMPTS
+    assert job['lease_owner'] is None
+    print(f"✅ Crashing job failed after {job['attempts']} attempts: {job['error']}")
+
+
+def test_failures_requeue_then_fail():
+    """Reported failures requeue with backoff until max_attempts"""
+    db = FakeDB()
+    job_id = enqueue_spec_job(db, 'Rode', 'NTG5')
+    job = lease_next_job(db, 'worker-a')
+    assert fail_job(db, job, RuntimeError("scrape failed"))
+    stored = db.data['jobs'][job_id]
+    assert stored['status'] == 'queued' and stored['available_at'] > stored['updated_at']
+
+    stored['attempts'] = spec_jobs.MAX_ATTEMPTS
+    stored['status'], stored['lease_token'] = 'running', job['lease_token']
+    assert fail_job(db, job, RuntimeError("scrape failed"))
+    assert db.data['jobs'][job_id]['status'] == 'failed'
+    print("✅ Failures requeued with backoff, then failed")
+
+
+def test_same_worker_id_releases_are_told_apart():
+    """A worker that re-leases its own expired job cannot complete it with the old lease"""
+    db = FakeDB()
+    job_id = enqueue_spec_job(db, 'Canon', 'C70')
+    first = lease_next_job(db, 'host-123')
+    expire_lease(db, job_id)
+    second = lease_next_job(db, 'host-123')
+    assert first['lease_token'] != second['lease_token']
+
+    assert not complete_job(db, first, {'mount': 'stale'})
+    assert complete_job(db, second, {'mount': 'RF'})
+    assert db.data['jobs'][job_id]['result'] == {'mount': 'RF'}
+    print("✅ Leases are told apart by token, not worker id")
+
+
+def test_renew_lease():
+    """Renewal extends a held lease and is refused once the lease is lost"""
+    db = FakeDB()
+    job_id = enqueue_spec_job(db, 'Sony', 'FX6')
+    job = lease_next_job(db, 'worker-a')
+    before = db.data['jobs'][job_id]['lease_expires_at']
+    assert renew_lease(db, job)
+    assert db.data['jobs'][job_id]['lease_expires_at'] >= before
+
+    expire_lease(db, job_id)
+    lease_next_job(db, 'worker-b')
+    assert not renew_lease(db, job)
+    print("✅ Lease renewed while held, refused after it was lost")
+
+
+def test_heartbeat_keeps_a_slow_job_leased():
+    """A job that outlasts LEASE_DURATION keeps its lease while the heartbeat runs"""
+    db = FakeDB()
+    job_id = enqueue_spec_job(db, 'DJI', 'Inspire 3')
+    job = lease_next_job(db, 'worker-a')
+    expire_lease(db, job_id)  # the scrape has already run past the lease
+
+    with LeaseHeartbeat(db, job, interval=0.01) as heartbeat:
+        for _ in range(100):
+            if db.data['jobs'][job_id]['lease_expires_at'] > spec_jobs._now():
+                break
+            time.sleep(0.01)
+    assert not heartbeat.lost
+    assert lease_next_job(db, 'worker-b') is None
+    assert complete_job(db, job, {'sensor': '8K'})
+    print("✅ Heartbeat renewed the lease of a slow job")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test concurrent spec research against a local server (no network)
+"""
+import os
+import sys
+import time
+from urllib.parse import quote
+sys.path.append('api')
+
+from conftest import local_server
+from spec_research import SpecResearcher, parse_search_results
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'spec_pages')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def page(rows):
+    cells = ''.join(f'<tr><th>{key}</th><td>{value}</td></tr>' for key, value in rows.items())
+    return f'<html><body><table>{cells}</table></body></html>'
+
+
+def test_parse_search_results():
+    urls = parse_search_results(fixture('search_results.html'))
+    assert urls == [
+        'https://www.usa.canon.com/shop/p/eos-r5#specifications',
+        'https://www.bhphotovideo.com/c/product/1547009-REG/canon_eos_r5_mirrorless_digital.html/specs',
+        'https://www.dpreview.com/products/canon/slrs/canon_eosr5/specifications',
+    ]
+    print("✅ Search results unwrapped, ads and duplicates skipped")
+
+
+def test_pages_fetched_concurrently_with_per_host_spacing():
+    routes = {
+        '/a': (200, page({'Sensor': 'Full frame', 'Mount': 'RF'}), 'text/html', 0.3),
+        '/b': (200, page({'Sensor': 'APS-C', 'Weight': '738 g'}), 'text/html', 0.3),
+        '/c': (200, page({'Battery': 'LP-E6NH'}), 'text/html', 0.3),
+    }
+    with local_server(routes) as server:
+        researcher = SpecResearcher(deadline=5, host_interval=0.5)
+        urls = [server.url('/a'), server.url('/b'), server.url('/c', host='localhost')]
+        started = time.monotonic()
+        specs = researcher.research_urls(urls)
+        elapsed = time.monotonic() - started
+
+    assert specs == {'Sensor': 'Full frame', 'Mount': 'RF', 'Weight': '738 g', 'Battery': 'LP-E6NH'}
+    starts = {path: at for path, at in server.requests}
+    assert starts['/b'] - starts['/a'] >= 0.45  # same host waits its interval
+    assert abs(starts['/c'] - starts['/a']) < 0.25  # another host does not
+    assert elapsed < 2, elapsed
+    print(f"✅ Three pages researched concurrently in {elapsed:.2f}s with per-host spacing")
+
+
+def test_deadline_returns_partial_results():
+    routes = {
+        '/fast': (200, page({'Sensor': 'Full frame'})),
+        '/slow': (200, page({'Weight': '738 g'}), 'text/html', 3),
+    }
+    with local_server(routes) as server:
+        researcher = SpecResearcher(deadline=0.6, host_interval=0)
+        started = time.monotonic()
+        specs = researcher.research_urls([server.url('/slow'), server.url('/fast')])
+        elapsed = time.monotonic() - started
+    assert specs == {'Sensor': 'Full frame'}
+    assert elapsed < 1.5, elapsed
+    print(f"✅ Deadline returned the merged specs after {elapsed:.2f}s")
+
+
+def test_failed_page_adds_nothing():
+    routes = {'/ok': (200, page({'Mount': 'E'})), '/gone': (404, 'not found')}
+    with local_server(routes) as server:
+        specs = SpecResearcher(deadline=5, host_interval=0).research_urls(
+            [server.url('/gone'), server.url('/ok')])
+    assert specs == {'Mount': 'E'}
+    print("✅ A failing page does not fail the research")
+
+
+def test_search_then_research():
+    with local_server({}) as server:
+        links = ''.join(
+            f'<a class="result__a" href="//duckduckgo.com/l/?uddg={quote(server.url(path), safe="")}">{path}</a>'
+            for path in ('/r1', '/r2')
+        )
+        server.routes.update({
+            '/html/': (200, f'<html><body>{links}</body></html>'),
+            '/r1': (200, fixture('manufacturer_table.html')),
+            '/r2': (200, fixture('retailer_dl_jsonld.html')),
+        })
+        researcher = SpecResearcher(deadline=5, host_interval=0, search_url=server.url('/html/'))
+        specs = researcher.search_equipment_specs('Canon EOS R5 specifications')
+
+    assert specs['Sensor Type'] == 'Full-frame CMOS'
+    assert specs['Weight'] == 'Approx. 738 g (body only)'  # first result wins
+    assert specs['Audio Inputs'] == '2x XLR via top handle'
+    assert server.requests[0][0].startswith('/html/?q=Canon%20EOS%20R5')
+    print("✅ search_equipment_specs researches the top search results")
+
+
+if __name__ == "__main__":
+    test_parse_search_results()
+    test_pages_fetched_concurrently_with_per_host_spacing()
+    test_deadline_returns_partial_results()
+    test_failed_page_adds_nothing()
+    test_search_then_research()
+    print("\n🎉 Spec research tests passed!")
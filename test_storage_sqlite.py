@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Test the SQLite storage backend (CRUD, indexed listings, FTS5 search, WAL)
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+sys.path.append('api')
+
+from storage_sqlite import SQLiteStorage
+
+
+def make_storage():
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    return SQLiteStorage(path), path
+
+
+def cleanup(path):
+    for suffix in ['', '-wal', '-shm']:
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def test_sku_and_inventory_crud():
+    """Documents round-trip with extra fields, timestamps and booleans intact"""
+    storage, path = make_storage()
+    try:
+        sku_id = storage.skus.create({
+            'name': 'Canon EOS R5', 'brand': 'Canon', 'model': 'EOS R5', 'category': 'cameras',
+            'is_active': True, 'price_per_day': 2000,
+            'specifications': {'resolution': '45 megapixels', 'video': '8K recording'},
+        })
+        item_id = storage.inventory.create({
+            'sku_id': sku_id, 'serial_number': 'CAN123456789', 'status': 'available',
+            'condition': 'good', 'location': 'Warehouse section A, shelf 3',
+        })
+
+        sku = storage.skus.get(sku_id)
+        assert sku['specifications']['video'] == '8K recording'
+        assert sku['is_active'] is True
+        assert isinstance(sku['created_at'], datetime)
+
+        storage.inventory.update(item_id, {'status': 'booked'})
+        item = storage.inventory.get(item_id)
+        assert item['status'] == 'booked'
+        assert item['serial_number'] == 'CAN123456789'
+        assert 'updated_at' in item
+
+        storage.inventory.delete(item_id)
+        assert storage.inventory.get(item_id) is None
+        print("✅ CRUD round-trip")
+    finally:
+        cleanup(path)
+
+
+def test_filtered_listing_uses_indexes():
+    """Listings filter and order in SQL, backed by indexes from firestore.indexes.json"""
+    storage, path = make_storage()
+    try:
+        now = datetime.now(timezone.utc)
+        for i in range(6):
+            storage.inventory.create({
+                'sku_id': 'sku-a' if i % 2 else 'sku-b',
+                'serial_number': f'SN{i}',
+                'status': 'available' if i < 4 else 'booked',
+                'condition': 'good',
+                'created_at': now - timedelta(minutes=i),
+            })
+
+        items = storage.inventory.list({'sku_id': 'sku-a', 'status': 'available'})
+        assert [item['serial_number'] for item in items] == ['SN1', 'SN3']
+        assert len(storage.inventory.list({'status': 'booked'}, limit=1)) == 1
+
+        plan = storage.database.connection().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM inventory WHERE sku_id = ? AND status = ? ORDER BY created_at DESC",
+            ('sku-a', 'available')
+        ).fetchall()
+        assert any('USING INDEX' in row[3] for row in plan)
+
+        mode = storage.database.connection().execute('PRAGMA journal_mode').fetchone()[0]
+        assert mode == 'wal'
+        print("✅ Indexed listings in WAL mode")
+    finally:
+        cleanup(path)
+
+
+def test_full_text_search():
+    """FTS5 search matches prefixes and follows updates and deletes"""
+    storage, path = make_storage()
+    try:
+        r5 = storage.skus.create({'name': 'Canon EOS R5', 'brand': 'Canon', 'model': 'EOS R5'})
+        storage.skus.create({'name': 'Sony FX6 Cinema Camera', 'brand': 'Sony', 'model': 'FX6'})
+        storage.skus.create({'name': 'Rode VideoMic Pro Plus', 'brand': 'Rode', 'model': 'VideoMic Pro+'})
+
+        assert [sku['model'] for sku in storage.skus.search('canon')] == ['EOS R5']
+        assert [sku['brand'] for sku in storage.skus.search('video')] == ['Rode']
+        assert storage.skus.search('"; DROP TABLE skus; --') == []
+
+        storage.skus.update(r5, {'name': 'Canon EOS R5 Body'})
+        assert len(storage.skus.search('body')) == 1
+        storage.skus.delete(r5)
+        assert storage.skus.search('canon') == []
+        print("✅ Full-text search")
+    finally:
+        cleanup(path)
+
+
+def test_search_after_saving_again():
+    """Saving a document again replaces its search terms; none linger for a reused rowid"""
+    storage, path = make_storage()
+    try:
+        storage.skus.create({'name': 'Canon EOS R5', 'brand': 'Canon', 'model': 'EOS R5',
+                             'category': 'cameras', 'notes': 'demo unit'}, doc_id='a')
+        storage.skus.create({'name': 'Nikon Z8', 'brand': 'Nikon', 'model': 'Z8'}, doc_id='a')
+        assert storage.skus.search('canon') == []
+        assert [sku['id'] for sku in storage.skus.search('nikon')] == ['a']
+        saved = storage.skus.get('a')
+        assert saved['model'] == 'Z8' and 'category' not in saved and 'notes' not in saved  # fully overwritten
+
+        storage.skus.clear()
+        storage.skus.create({'name': 'Sony FX3', 'brand': 'Sony', 'model': 'FX3'}, doc_id='z')
+        assert storage.skus.search('canon') == []
+        assert storage.skus.search('nikon') == []
+        assert [sku['id'] for sku in storage.skus.search('sony')] == ['z']
+        print("✅ Search after a document is saved again")
+    finally:
+        cleanup(path)
+
+
+def test_field_projection():
+    """Listings with fields return only those fields, reading the JSON column only when needed"""
+    storage, path = make_storage()
+    try:
+        storage.skus.create({
+            'name': 'Sony FX6', 'brand': 'Sony', 'model': 'FX6', 'category': 'cameras',
+            'specifications': {'sensor': 'Full-frame'}, 'thumbnails': {'96': '/thumbnails/fx6-96.webp'},
+        })
+        slim = storage.skus.list(fields=['name', 'brand'])
+        assert set(slim[0]) == {'id', 'name', 'brand'}
+        assert storage.skus._select_list(['name', 'brand']) == 'id, name, brand'
+
+        with_extra = storage.skus.list(fields=['name', 'thumbnails'])
+        assert with_extra[0]['thumbnails'] == {'96': '/thumbnails/fx6-96.webp'}
+        assert 'specifications' not in with_extra[0]
+        assert 'specifications' in storage.skus.list()[0]
+        print("✅ Field projection")
+    finally:
+        cleanup(path)
+
+
+def test_update_many():
+    """Batched updates write column fields in one transaction and fall back for extra fields"""
+    storage, path = make_storage()
+    try:
+        ids = [storage.inventory.create({'serial_number': f'SN{i}', 'current_value': 1000}) for i in range(3)]
+        written = storage.inventory.update_many({
+            ids[0]: {'current_value': 900},
+            ids[1]: {'current_value': 800},
+            ids[2]: {'current_value': 700, 'depreciation_run': '2026-01-01'},
+        })
+        assert written == 3
+        items = {item['id']: item for item in storage.inventory.list()}
+        assert [items[doc_id]['current_value'] for doc_id in ids] == [900, 800, 700]
+        assert items[ids[2]]['depreciation_run'] == '2026-01-01'
+        assert all('updated_at' in item for item in items.values())
+        print("✅ Batched updates")
+    finally:
+        cleanup(path)
+
+
+def test_rejects_unknown_fields():
+    """Filters on unknown fields raise instead of building arbitrary SQL"""
+    storage, path = make_storage()
+    try:
+        try:
+            storage.inventory.list({'status = 1 OR 1': 'x'})
+        except ValueError:
+            print("✅ Unknown filter fields rejected")
+        else:
+            raise AssertionError("Expected ValueError")
+    finally:
+        cleanup(path)
+
+
+def test_iter_pages():
+    """Paging by id cursor visits every document once, a page at a time, with projection"""
+    storage, path = make_storage()
+    try:
+        for i in range(7):
+            storage.inventory.create({'serial_number': f'SN{i}', 'condition': 'good', 'notes': 'x'},
+                                     doc_id=f'unit-{i}')
+
+        pages = list(storage.inventory.iter_pages(page_size=3, fields=['serial_number']))
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [unit['id'] for page in pages for unit in page] == [f'unit-{i}' for i in range(7)]
+        assert pages[0][0] == {'serial_number': 'SN0', 'id': 'unit-0'}
+        assert [len(page) for page in storage.inventory.iter_pages(page_size=7)] == [7]
+        print("✅ Cursor paging")
+    finally:
+        cleanup(path)
+
+
+if __name__ == "__main__":
+    test_sku_and_inventory_crud()
+    test_filtered_listing_uses_indexes()
+    test_full_text_search()
+    test_search_after_saving_again()
+    test_field_projection()
+    test_update_many()
+    test_rejects_unknown_fields()
+    test_iter_pages()